@@ -0,0 +1,221 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import inspect
+
+from oslo_serialization import jsonutils
+
+from mistralclient.api import base
+from mistralclient.api import json_stream
+
+
+class AsyncResourceManager(object):
+    """Mixin turning a resource manager into its asyncio counterpart.
+
+    The public methods of the resource managers build the URL and return
+    the result of one of the request primitives (_get, _get_json, _list,
+    _create, _update, _delete). This mixin replaces the primitives with
+    coroutines so the very same public methods return awaitables, e.g.::
+
+        execution = await client.executions.get(id)
+
+    It has to be combined with a ResourceManager subclass using an
+    AsyncHTTPClient, see make_async_manager().
+    """
+
+    _returns_coroutines = True
+
+    async def _create(self, url, data, response_key=None, dump_json=True,
+                      headers=None, is_iter_resp=False, resp_status_ok=201,
+                      as_class=True, invalidate_cache=True):
+        if dump_json:
+            data = jsonutils.dumps(data)
+
+        try:
+            resp = await self.http_client.post(url, data, headers)
+        finally:
+            if invalidate_cache:
+                self._invalidate_cache()
+
+        return self._process_response(
+            resp,
+            resp_status_ok,
+            response_key,
+            is_iter_resp=is_iter_resp,
+            as_class=as_class
+        )
+
+    async def _update(self, url, data, response_key=None, dump_json=True,
+                      headers=None, is_iter_resp=False):
+        if dump_json:
+            data = jsonutils.dumps(data)
+
+        try:
+            resp = await self.http_client.put(url, data, headers)
+        finally:
+            self._invalidate_cache()
+
+        return self._process_response(
+            resp,
+            200,
+            response_key,
+            is_iter_resp=is_iter_resp
+        )
+
+    async def _list(self, url, response_key=None, headers=None,
+                    returned_res_cls=None, stream=False):
+        resource_class = returned_res_cls or self.resource_class
+
+        cache_key = None
+
+        if not stream:
+            cache_key, resources = self._get_cached(url, response_key,
+                                                    headers)
+
+            if resources is not None:
+                return self._build_resources(resources, resource_class)
+
+        resp = await self.http_client.get(url, headers, stream=stream)
+
+        if stream:
+            if resp.status_code != 200:
+                await resp.aread()
+
+                self._raise_api_exception(resp)
+
+            return self._aiter_resources(resp, response_key, resource_class)
+
+        resources = self._process_response(
+            resp,
+            200,
+            response_key,
+            as_class=False
+        )
+
+        self._set_cached(cache_key, resources)
+
+        return self._build_resources(resources, resource_class)
+
+    async def _get(self, url, response_key=None, headers=None,
+                   as_class=True):
+        cache_key, resource = self._get_cached(url, response_key, headers)
+
+        if resource is None:
+            headers, validated = self._add_validators(url, headers)
+
+            resp = await self.http_client.get(url, headers)
+
+            resource = self._process_get_response(
+                resp,
+                url,
+                validated,
+                response_key,
+                as_class=False
+            )
+
+            self._set_cached(cache_key, resource)
+
+        return self._build_resource(resource) if as_class else resource
+
+    async def _get_json(self, url):
+        resp = await self.http_client.get(url)
+
+        return resp.json()
+
+    async def _delete(self, url, headers=None):
+        try:
+            resp = await self.http_client.delete(url, headers)
+        finally:
+            self._invalidate_cache()
+
+        if resp.status_code != 204:
+            self._raise_api_exception(resp)
+
+    async def _aiter_resources(self, resp, response_key, resource_class):
+        parser = json_stream.JSONArrayParser(response_key)
+
+        try:
+            async for chunk in resp.aiter_bytes(base.STREAM_CHUNK_SIZE):
+                for resource_data in parser.feed(chunk):
+                    yield resource_class(self, resource_data)
+
+            for resource_data in parser.close():
+                yield resource_class(self, resource_data)
+        finally:
+            await resp.aclose()
+
+    async def find(self, **kwargs):
+        return [
+            i for i in await self.list()
+            if base._check_items(i, kwargs.items())
+        ]
+
+
+class AsyncPagingMixin(object):
+    """Adds iter_list() to the asyncio managers supporting paging."""
+
+    async def iter_list(self, *args, page_size=100, **kwargs):
+        """Iterates over all resources, fetching them page by page.
+
+        Takes the same arguments as the list() method of the manager
+        except for ``marker`` and ``limit`` which are used for paging::
+
+            async for ex in client.executions.iter_list(state='ERROR'):
+                ...
+
+        :param page_size: Number of resources requested at once.
+        """
+        marker = kwargs.pop('marker', '')
+        kwargs.pop('limit', None)
+
+        while True:
+            page = await self.list(
+                *args,
+                marker=marker,
+                limit=page_size,
+                **kwargs
+            )
+
+            for resource in page:
+                yield resource
+
+            if len(page) < page_size:
+                return
+
+            marker = page[-1].id
+
+
+def _supports_paging(manager_class):
+    params = inspect.signature(manager_class.list).parameters
+
+    return 'marker' in params and 'limit' in params
+
+
+def make_async_manager(manager_class):
+    """Creates the asyncio counterpart of a resource manager class.
+
+    Managers whose list() takes a marker and a limit get iter_list().
+    """
+    bases = (AsyncResourceManager, manager_class)
+
+    if _supports_paging(manager_class):
+        bases = (AsyncPagingMixin,) + bases
+
+    return type(
+        'Async%s' % manager_class.__name__,
+        bases,
+        {
+            '__module__': __name__,
+            # Same cache settings as the synchronous manager.
+            '_manager_name': manager_class._manager_name
+        }
+    )
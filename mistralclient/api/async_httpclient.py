@@ -0,0 +1,405 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import asyncio
+import datetime
+import functools
+import logging
+import time
+
+from oslo_utils import importutils
+
+from mistralclient.api import httpclient
+from mistralclient.api import timeouts
+from mistralclient.api import transports
+from mistralclient.api import unix_socket
+
+httpx = importutils.try_import('httpx')
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+LOG = logging.getLogger(__name__)
+
+
+def instrument_request(func):
+    """Reports the request sent by an HTTP client method to the hooks."""
+    @functools.wraps(func)
+    async def decorator(self, url, *args, **kwargs):
+        if not self.request_hooks:
+            resp = await func(self, url, *args, **kwargs)
+            LOG.debug("HTTP %s %s %d", resp.request.method, resp.url,
+                      resp.status_code)
+            return resp
+
+        event, token = self._start_request_event(func.__name__, url)
+
+        try:
+            resp = await func(self, url, *args, **kwargs)
+        except Exception as e:
+            self._finish_request_event(event, token, error=e)
+            raise
+
+        self._finish_request_event(event, token, resp=resp)
+
+        return resp
+    return decorator
+
+
+class AsyncHTTPClient(httpclient.HTTPClient):
+    """HTTP client for use within an asyncio event loop.
+
+    It takes the same options as HTTPClient and builds the request
+    headers the same way, but sends the requests with httpx. At most
+    ``max_concurrency`` requests are in flight at any time, the others
+    wait for a free slot.
+
+    The ``transport`` option isn't supported, a keystone session given
+    with ``session`` only provides the authentication headers.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        if httpx is None:
+            raise RuntimeError(
+                'The asyncio client requires the "httpx" package.'
+            )
+
+        super(AsyncHTTPClient, self).__init__(base_url, **kwargs)
+
+        self.max_concurrency = (kwargs.get(httpclient.MAX_CONCURRENCY) or
+                                DEFAULT_MAX_CONCURRENCY)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        options = {
+            'verify': self._get_ssl_context(),
+            'limits': httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=kwargs.get(
+                    httpclient.POOL_MAXSIZE
+                ),
+                keepalive_expiry=kwargs.get(httpclient.POOL_IDLE_TIMEOUT, 5.0)
+            )
+        }
+
+        endpoints = self.get_endpoints()
+        socket_paths = {
+            unix_socket.split_url(url)[0] for url in endpoints
+            if unix_socket.is_unix_socket_url(url)
+        }
+
+        # All requests are sent over the socket of the transport.
+        if socket_paths and (len(socket_paths) > 1 or
+                             len(socket_paths) < len(set(endpoints))):
+            raise ValueError('The asyncio client can only use a single '
+                             'Unix socket for all endpoints.')
+
+        if socket_paths:
+            options['transport'] = httpx.AsyncHTTPTransport(
+                uds=socket_paths.pop(),
+                **options
+            )
+
+        self.async_session = httpx.AsyncClient(timeout=None, **options)
+
+        # Makes _update_headers() add the keystone session headers.
+        self.transport = self.async_session
+
+    def _init_session(self, kwargs):
+        # The requests are not sent through a requests session.
+        pass
+
+    def _create_transport(self, transport, kwargs):
+        if transport is not None:
+            raise ValueError('The asyncio client does not support the '
+                             '"transport" option.')
+
+        # Set once the httpx client is created.
+        return None
+
+    def _get_ssl_context(self):
+        return transports.get_ssl_context(
+            self.ssl_options.get('verify', True),
+            self.ssl_options.get('cert')
+        )
+
+    async def close(self):
+        await self.async_session.aclose()
+
+    @instrument_request
+    async def get(self, url, headers=None, stream=False):
+        options = self._get_request_options('get', headers)
+
+        if stream:
+            options['stream'] = True
+
+        return await self._request('get', url, **options)
+
+    @instrument_request
+    async def post(self, url, body, headers=None):
+        options = self._get_request_options('post', headers)
+
+        return await self._request('post', url, data=body, **options)
+
+    @instrument_request
+    async def put(self, url, body, headers=None):
+        options = self._get_request_options('put', headers)
+
+        return await self._request('put', url, data=body, **options)
+
+    @instrument_request
+    async def delete(self, url, headers=None):
+        options = self._get_request_options('delete', headers)
+
+        return await self._request('delete', url, **options)
+
+    async def _request(self, method, url, data=None, **options):
+        data, raw_size = self._encode_body(data, options['headers'])
+
+        if data is not None:
+            options['data'] = data
+
+        resp = await self._send_with_retries(method, url, **options)
+
+        # The body of a streamed response hasn't been read yet.
+        self._record_transfer(
+            raw_size,
+            data,
+            None if options.get('stream') else resp
+        )
+
+        return resp
+
+    async def _send_with_retries(self, method, url, **options):
+        if self.retry_policy is None:
+            return await self._send_within_deadline(method, url, **options)
+
+        start = time.monotonic()
+        attempt = 0
+
+        while True:
+            error = None
+            resp = None
+
+            try:
+                resp = await self._send_within_deadline(method, url,
+                                                        **options)
+            except httpx.HTTPError as e:
+                error = e
+
+            delay = self._get_retry_delay(method, attempt, start, resp, error)
+
+            if delay is None:
+                if error is not None:
+                    raise error
+
+                return resp
+
+            LOG.debug("Retrying HTTP %s %s in %.2f seconds [attempt=%s, "
+                      "reason=%s]", method.upper(), url, delay, attempt + 1,
+                      error or resp.status_code)
+
+            self._record_retry(delay)
+
+            await asyncio.sleep(delay)
+
+            attempt += 1
+
+    @staticmethod
+    def _get_response_sizes(resp):
+        size = len(resp.content)
+
+        return size, resp.num_bytes_downloaded or size
+
+    async def _send_within_deadline(self, method, url, **options):
+        delay = self._get_rate_limit_delay(method)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        options['timeout'] = timeouts.get_timeout(self.connect_timeout,
+                                                  self.read_timeout)
+
+        try:
+            return await self._send(method, url, **options)
+        except httpx.TimeoutException as e:
+            timeouts.check_deadline(e)
+            raise
+
+    async def _send(self, method, url, **options):
+        if self.hedging is not None and method == 'get':
+            return await self._send_hedged(method, url, **options)
+
+        return await self._send_balanced(method, url, **options)
+
+    async def _send_hedged(self, method, url, **options):
+        op = httpclient.get_operation() or 'unknown'
+        delay = self.hedging.start(op)
+        used_endpoints = []
+
+        primary = asyncio.ensure_future(
+            self._send_attempt(op, method, url, used_endpoints, options)
+        )
+
+        done, _ = await asyncio.wait([primary], timeout=delay)
+
+        if done or not self.hedging.should_hedge(op):
+            return await primary
+
+        LOG.debug("Hedging HTTP %s %s after %.3f seconds", method.upper(),
+                  url, delay)
+
+        hedge = asyncio.ensure_future(
+            self._send_attempt(op, method, url, used_endpoints, options)
+        )
+        attempts = [primary, hedge]
+        pending = attempts
+        winner = None
+
+        try:
+            while winner is None and pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                winner = next(
+                    (t for t in done if t.exception() is None),
+                    None
+                )
+        finally:
+            for attempt in attempts:
+                if attempt is not winner:
+                    await self._discard_attempt(attempt)
+
+        if winner is None:
+            return await primary
+
+        if winner is hedge:
+            self.hedging.record_hedge_win(op)
+
+        return winner.result()
+
+    async def _send_attempt(self, op, method, url, used_endpoints, options):
+        start = time.monotonic()
+
+        resp = await self._send_balanced(method, url, used_endpoints,
+                                         **options)
+
+        self.hedging.record_latency(op, time.monotonic() - start)
+
+        return resp
+
+    @staticmethod
+    async def _discard_attempt(attempt):
+        if not attempt.done():
+            attempt.cancel()
+        elif not attempt.cancelled() and attempt.exception() is None:
+            await attempt.result().aclose()
+
+    async def _send_balanced(self, method, url, used_endpoints=None,
+                             **options):
+        if self.balancer is None:
+            return await self._send_to(self.base_url, method, url, **options)
+
+        failed_endpoints = []
+
+        while True:
+            endpoint = self._choose_endpoint(failed_endpoints, used_endpoints)
+            start = time.monotonic()
+
+            try:
+                resp = await self._send_to(endpoint, method, url, **options)
+            except Exception as e:
+                failed = self._is_endpoint_failure(error=e)
+
+                self.balancer.record(endpoint, failed=failed)
+
+                if not (failed and self._can_fail_over(method,
+                                                       failed_endpoints,
+                                                       e)):
+                    raise
+
+                self._log_fail_over(method, url, endpoint, e)
+                failed_endpoints.append(endpoint)
+
+                continue
+
+            failed = self._is_endpoint_failure(resp=resp)
+
+            self.balancer.record(endpoint, time.monotonic() - start, failed)
+
+            if not (failed and self._can_fail_over(method,
+                                                   failed_endpoints)):
+                return resp
+
+            self._log_fail_over(method, url, endpoint, resp.status_code)
+            failed_endpoints.append(endpoint)
+
+            await resp.aclose()
+
+    async def _send_to(self, endpoint, method, url, **options):
+        breaker = self.circuit_breaker
+
+        if breaker is None:
+            return await self._send_request(endpoint + url, method,
+                                            **options)
+
+        breaker.before_request(endpoint)
+
+        try:
+            resp = await self._send_request(endpoint + url, method,
+                                            **options)
+        except Exception as e:
+            breaker.record_error(endpoint, e)
+            raise
+
+        breaker.record_response(endpoint, resp.status_code)
+
+        return resp
+
+    async def _send_request(self, full_url, method, data=None, headers=None,
+                            stream=False, timeout=None, **options):
+        kwargs = {
+            'headers': headers,
+            'timeout': transports.get_httpx_timeout(timeout)
+        }
+
+        if unix_socket.is_unix_socket_url(full_url):
+            # The socket is set on the transport.
+            full_url = unix_socket.split_url(full_url)[1]
+
+        if isinstance(data, dict):
+            kwargs['data'] = data
+        elif data is not None:
+            kwargs['content'] = data
+
+        request = self.async_session.build_request(
+            method.upper(),
+            full_url,
+            **kwargs
+        )
+
+        async with self._semaphore:
+            start = time.monotonic()
+            resp = await self.async_session.send(request, stream=True)
+            elapsed = time.monotonic() - start
+
+            if not stream:
+                try:
+                    await resp.aread()
+                finally:
+                    await resp.aclose()
+
+        # Time until the headers were received, like for requests. httpx
+        # would set the time until the body was read.
+        resp.elapsed = datetime.timedelta(seconds=elapsed)
+
+        return resp
@@ -0,0 +1,196 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import logging
+import threading
+import time
+
+
+ROUND_ROBIN = 'round-robin'
+LEAST_LATENCY = 'least-latency'
+
+STRATEGIES = (ROUND_ROBIN, LEAST_LATENCY)
+
+# Weight of the last request in the average latency of an endpoint.
+LATENCY_SMOOTHING = 0.3
+
+LOG = logging.getLogger(__name__)
+
+
+class _Endpoint(object):
+    def __init__(self, url):
+        self.url = url
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.in_flight = 0
+        self.latency = None
+        self.ejected_until = None
+
+
+class EndpointBalancer(object):
+    """Spreads requests over several replicas of the Mistral API.
+
+    With the "round-robin" strategy the endpoints are used in turn, with
+    "least-latency" the endpoint with the lowest average response time,
+    weighted by the number of requests in progress, is used. Endpoints
+    not used yet are tried first.
+
+    An endpoint is ejected after ``max_failures`` consecutive failures
+    and not used for ``ejection_time`` seconds, unless all endpoints are
+    ejected.
+
+    :param endpoints: List of base URLs.
+    :param strategy: "round-robin" or "least-latency".
+    :param max_failures: Consecutive failures ejecting an endpoint.
+    :param ejection_time: Time in seconds an endpoint stays ejected.
+    """
+
+    def __init__(self, endpoints, strategy=ROUND_ROBIN, max_failures=3,
+                 ejection_time=30.0):
+        if not endpoints:
+            raise ValueError('At least one endpoint is required.')
+
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                'Unknown load balancing strategy: %s, expected one of %s' %
+                (strategy, ', '.join(STRATEGIES))
+            )
+
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+
+        self._lock = threading.Lock()
+        self._endpoints = [_Endpoint(url) for url in endpoints]
+        self._next = 0
+
+    @property
+    def endpoints(self):
+        return [e.url for e in self._endpoints]
+
+    def choose(self, exclude=()):
+        """Returns the endpoint the next request is to be sent to.
+
+        The request must be reported with record() once it completed.
+
+        :param exclude: Endpoints not to be used, e.g. the ones a request
+            failed on already.
+        :return: Base URL of the endpoint, None if all are excluded.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            candidates = [
+                e for e in self._endpoints if e.url not in exclude
+            ]
+
+            if not candidates:
+                return None
+
+            available = [
+                e for e in candidates
+                if e.ejected_until is None or e.ejected_until <= now
+            ]
+
+            if available:
+                endpoint = self._pick(available)
+            else:
+                # All ejected, the one to be put back first is used.
+                endpoint = min(candidates, key=lambda e: e.ejected_until)
+
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+
+            return endpoint.url
+
+    def _pick(self, endpoints):
+        if self.strategy == LEAST_LATENCY:
+            def _score(e):
+                if e.latency is None:
+                    return -1.0
+
+                return e.latency * (e.in_flight + 1)
+
+            return min(endpoints, key=_score)
+
+        endpoint = endpoints[self._next % len(endpoints)]
+
+        self._next += 1
+
+        return endpoint
+
+    def record(self, url, latency=None, failed=False):
+        """Reports the outcome of a request sent to an endpoint.
+
+        :param latency: Response time in seconds, if a response was
+            received.
+        :param failed: Whether the endpoint failed to handle the request.
+        """
+        with self._lock:
+            endpoint = self._get(url)
+
+            endpoint.in_flight -= 1
+
+            if latency is not None:
+                if endpoint.latency is None:
+                    endpoint.latency = latency
+                else:
+                    endpoint.latency += LATENCY_SMOOTHING * (
+                        latency - endpoint.latency
+                    )
+
+            if not failed:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = None
+                return
+
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+
+            if endpoint.consecutive_failures >= self.max_failures:
+                if endpoint.ejected_until is None:
+                    LOG.warning("Ejecting endpoint %s for %s seconds after "
+                                "%s consecutive failures", url,
+                                self.ejection_time,
+                                endpoint.consecutive_failures)
+
+                endpoint.ejected_until = time.monotonic() + self.ejection_time
+
+    def _get(self, url):
+        for endpoint in self._endpoints:
+            if endpoint.url == url:
+                return endpoint
+
+        raise KeyError(url)
+
+    def get_stats(self):
+        """Returns request statistics of each endpoint.
+
+        :return: dict mapping base URLs to the number of requests sent, of
+            failures and of requests in progress, the average latency in
+            seconds (None if unknown) and whether the endpoint is ejected.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            return {
+                e.url: {
+                    'requests': e.requests,
+                    'failures': e.failures,
+                    'in_flight': e.in_flight,
+                    'latency': e.latency,
+                    'ejected': (e.ejected_until is not None and
+                                e.ejected_until > now)
+                }
+                for e in self._endpoints
+            }
@@ -12,43 +12,113 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import collections
 import copy
+import functools
+import inspect
+import threading
+import types
 import urllib
 
 from oslo_serialization import jsonutils
 
 from keystoneauth1 import exceptions
 
+from mistralclient.api import httpclient
+from mistralclient.api import json_stream
+from mistralclient.api import tracing
 from mistralclient import utils
 
 urlparse = urllib.parse
 
+# Size of the chunks streamed responses are read in.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Maximum number of resources a manager keeps to revalidate them.
+CONDITIONAL_GET_MAX_ENTRIES = 1000
+
 
 class Resource(object):
+    """A resource returned by the API.
+
+    The data the resource is created with is the dict of attributes of
+    the instance, its fields are read as attributes without being copied.
+    Setting an attribute sets the field.
+    """
+
+    __slots__ = ('manager', '_decoded', '__dict__', '__weakref__')
+
     resource_name = 'Something'
     defaults = {}
 
     def __init__(self, manager, data):
         self.manager = manager
-        self._data = data
+        self.__dict__ = data
         self._set_defaults()
         self._set_attributes()
 
+    @property
+    def _data(self):
+        return self.__dict__
+
     def _set_defaults(self):
         for k, v in self.defaults.items():
             if k not in self._data:
                 self._data[k] = v
 
     def _set_attributes(self):
-        for k, v in self._data.items():
-            try:
-                setattr(self, k, v)
-            except AttributeError:
-                # In this case we already defined the attribute on the class
-                pass
+        """Sets the attributes computed from the fields, if any."""
+
+    def get_decoded(self, name):
+        """Returns the decoded value of a field holding a JSON string.
+
+        The field is decoded on the first call and the result is cached,
+        the field keeps the JSON string. Values that aren't strings are
+        returned as is.
+
+        :raises AttributeError: If the resource has no such field.
+        :raises ValueError: If the field isn't valid JSON.
+        """
+        try:
+            raw = self._data[name]
+        except KeyError:
+            raise AttributeError(
+                "'%s' object has no field '%s'" % (type(self).__name__, name)
+            ) from None
+
+        if not isinstance(raw, str):
+            return raw
+
+        decoded = getattr(self, '_decoded', None)
+
+        if decoded is None:
+            decoded = self._decoded = {}
+
+        cached = decoded.get(name)
+
+        # The field may have been set since it was decoded.
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
+        value = jsonutils.loads(raw)
+        decoded[name] = (raw, value)
+
+        return value
 
     def to_dict(self):
-        return copy.deepcopy(self._data)
+        """Returns a copy of the fields.
+
+        Only lists and dicts are deep copied, the other values of the
+        fields are immutable.
+        """
+        return {
+            k: copy.deepcopy(v) if isinstance(v, (dict, list)) else v
+            for k, v in self._data.items()
+        }
+
+    def to_mapping(self):
+        """Returns a read-only view of the fields, nothing is copied."""
+        return types.MappingProxyType(self._data)
 
     def __str__(self):
         values = ", ".join(
@@ -66,19 +136,89 @@ def _check_items(obj, searches):
 
 
 def extract_json(response, response_key):
-    if response_key is not None:
-        return get_json(response)[response_key]
-    else:
-        return get_json(response)
+    with tracing.span('decode', tracing.JSON):
+        if response_key is not None:
+            return get_json(response)[response_key]
+        else:
+            return get_json(response)
+
+
+async def _await_in_operation(name, coro, tracer=None):
+    with httpclient.operation(name):
+        if tracer is None:
+            return await coro
+
+        with tracer.span(name):
+            return await coro
+
+
+def _api_operation(name, func):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        tracer = getattr(self.http_client, 'tracer', None)
+
+        with httpclient.operation(name):
+            # The coroutines of asyncio managers are traced when awaited.
+            if tracer is None or self._returns_coroutines:
+                result = func(self, *args, **kwargs)
+            else:
+                with tracer.span(name):
+                    result = func(self, *args, **kwargs)
+
+        # Managers of the asyncio client return coroutines, the requests
+        # are only made once they are awaited.
+        if inspect.iscoroutine(result):
+            return _await_in_operation(name, result, tracer)
+
+        return result
+
+    return wrapper
 
 
 class ResourceManager(object):
     resource_class = None
 
+    # If True, _get() keeps the last version of the resources fetched with
+    # an ETag or Last-Modified header and makes conditional requests, the
+    # kept version is returned if the server answers "304 Not Modified".
+    conditional_get = False
+
+    # Whether responses are cached if the client has a response cache.
+    cacheable = False
+
+    # Names of the other managers whose cached responses are invalidated
+    # by the changes made with this one.
+    cache_invalidates = ()
+
+    # Whether the public methods return coroutines.
+    _returns_coroutines = False
+
+    def __init_subclass__(cls, **kwargs):
+        super(ResourceManager, cls).__init_subclass__(**kwargs)
+
+        # Public methods are API operations, HTTP requests made by them are
+        # accounted to "<ManagerClass>.<method>".
+        if '_manager_name' not in cls.__dict__:
+            cls._manager_name = cls.__name__
+
+        for name, attr in list(cls.__dict__.items()):
+            if not isinstance(attr, types.FunctionType):
+                continue
+
+            if name.startswith('_'):
+                continue
+
+            op_name = '%s.%s' % (cls.__name__, name)
+
+            setattr(cls, name, _api_operation(op_name, attr))
+
     def __init__(self, http_client, enforce_raw_definitions=False):
         self.http_client = http_client
         self.enforce_raw_definitions = enforce_raw_definitions
 
+        self._validated = collections.OrderedDict()
+        self._validated_lock = threading.Lock()
+
     def get_contents_if_file(self, contents_or_file_name):
         if self.enforce_raw_definitions:
             return contents_or_file_name
@@ -149,12 +289,13 @@ class ResourceManager(object):
             headers,
             is_iter_resp,
             resp_status_ok=200,
-            as_class=False
+            as_class=False,
+            invalidate_cache=False
         )
 
     def _create(self, url, data, response_key=None, dump_json=True,
                 headers=None, is_iter_resp=False, resp_status_ok=201,
-                as_class=True):
+                as_class=True, invalidate_cache=True):
         if dump_json:
             data = jsonutils.dumps(data)
 
@@ -162,19 +303,17 @@ class ResourceManager(object):
             resp = self.http_client.post(url, data, headers)
         except exceptions.HttpError as ex:
             self._raise_api_exception(ex.response)
+        finally:
+            if invalidate_cache:
+                self._invalidate_cache()
 
-        if resp.status_code != resp_status_ok:
-            self._raise_api_exception(resp)
-
-        resource = extract_json(resp, response_key)
-
-        if is_iter_resp:
-            return [
-                self.resource_class(self, resource_data)
-                for resource_data in resource
-            ]
-
-        return self.resource_class(self, resource) if as_class else resource
+        return self._process_response(
+            resp,
+            resp_status_ok,
+            response_key,
+            is_iter_resp=is_iter_resp,
+            as_class=as_class
+        )
 
     def _update(self, url, data, response_key=None, dump_json=True,
                 headers=None, is_iter_resp=False):
@@ -185,58 +324,243 @@ class ResourceManager(object):
             resp = self.http_client.put(url, data, headers)
         except exceptions.HttpError as ex:
             self._raise_api_exception(ex.response)
+        finally:
+            self._invalidate_cache()
 
-        if resp.status_code != 200:
-            self._raise_api_exception(resp)
+        return self._process_response(
+            resp,
+            200,
+            response_key,
+            is_iter_resp=is_iter_resp
+        )
 
-        resource = extract_json(resp, response_key)
+    def _list(self, url, response_key=None, headers=None,
+              returned_res_cls=None, stream=False):
+        """Lists resources.
 
-        if is_iter_resp:
-            return [
-                self.resource_class(self, resource_data)
-                for resource_data in resource
-            ]
+        :param stream: If True, the response is parsed while it's being
+            received and an iterator yielding the resources as soon as
+            they are decoded is returned instead of a list.
+        """
+        resource_class = returned_res_cls or self.resource_class
 
-        return self.resource_class(self, resource)
+        cache_key = None
 
-    def _list(self, url, response_key=None, headers=None,
-              returned_res_cls=None):
+        if not stream:
+            cache_key, resources = self._get_cached(url, response_key,
+                                                    headers)
+
+            if resources is not None:
+                return self._build_resources(resources, resource_class)
 
         try:
-            resp = self.http_client.get(url, headers)
+            resp = self.http_client.get(url, headers, stream=stream)
         except exceptions.HttpError as ex:
             self._raise_api_exception(ex.response)
 
-        if resp.status_code != 200:
-            self._raise_api_exception(resp)
+        if stream:
+            if resp.status_code != 200:
+                self._raise_api_exception(resp)
 
-        resource_class = returned_res_cls or self.resource_class
+            return self._iter_resources(
+                resp.iter_content(STREAM_CHUNK_SIZE),
+                response_key,
+                resource_class=returned_res_cls,
+                close=resp.close
+            )
+
+        resources = self._process_response(
+            resp,
+            200,
+            response_key,
+            as_class=False
+        )
 
-        return [
-            resource_class(self, resource_data)
-            for resource_data in extract_json(resp, response_key)
-        ]
+        self._set_cached(cache_key, resources)
 
-    def _get(self, url, response_key=None, headers=None):
-        try:
-            resp = self.http_client.get(url, headers)
-        except exceptions.HttpError as ex:
-            self._raise_api_exception(ex.response)
+        return self._build_resources(resources, resource_class)
 
-        if resp.status_code == 200:
-            return self.resource_class(self, extract_json(resp, response_key))
-        else:
-            self._raise_api_exception(resp)
+    def _get(self, url, response_key=None, headers=None, as_class=True):
+        cache_key, resource = self._get_cached(url, response_key, headers)
+
+        if resource is None:
+            headers, validated = self._add_validators(url, headers)
+
+            try:
+                resp = self.http_client.get(url, headers)
+            except exceptions.HttpError as ex:
+                self._raise_api_exception(ex.response)
+
+            resource = self._process_get_response(
+                resp,
+                url,
+                validated,
+                response_key,
+                as_class=False
+            )
+
+            self._set_cached(cache_key, resource)
+
+        return self._build_resource(resource) if as_class else resource
+
+    def _get_json(self, url):
+        """Returns the decoded body of the response, whatever its status.
+
+        The response isn't cached.
+        """
+        return self.http_client.get(url).json()
 
     def _delete(self, url, headers=None):
         try:
             resp = self.http_client.delete(url, headers)
         except exceptions.HttpError as ex:
             self._raise_api_exception(ex.response)
+        finally:
+            self._invalidate_cache()
 
         if resp.status_code != 204:
             self._raise_api_exception(resp)
 
+    def _process_response(self, resp, resp_status_ok, response_key=None,
+                          is_iter_resp=False, as_class=True,
+                          resource_class=None):
+        if resp.status_code != resp_status_ok:
+            self._raise_api_exception(resp)
+
+        resource = extract_json(resp, response_key)
+        resource_class = resource_class or self.resource_class
+
+        if is_iter_resp:
+            return self._build_resources(resource, resource_class)
+
+        return (
+            self._build_resource(resource, resource_class) if as_class
+            else resource
+        )
+
+    def _process_get_response(self, resp, url, validated, response_key=None,
+                              as_class=True):
+        if validated is not None and resp.status_code == 304:
+            resource = copy.deepcopy(validated[1])
+        else:
+            if resp.status_code != 200:
+                self._raise_api_exception(resp)
+
+            resource = extract_json(resp, response_key)
+
+            if self.conditional_get:
+                self._store_validators(url, resp, resource)
+
+        return self._build_resource(resource) if as_class else resource
+
+    def _build_resource(self, data, resource_class=None):
+        resource_class = resource_class or self.resource_class
+
+        with tracing.span(resource_class.__name__, tracing.RESOURCE):
+            return resource_class(self, data)
+
+    def _build_resources(self, data, resource_class=None):
+        resource_class = resource_class or self.resource_class
+
+        with tracing.span(resource_class.__name__, tracing.RESOURCE,
+                          count=len(data)):
+            return [resource_class(self, d) for d in data]
+
+    def _get_cached(self, url, response_key, headers):
+        """Looks up the response to a GET request in the client's cache.
+
+        :return: Tuple of the cache key, None if the response isn't to be
+            cached, and the decoded response, None if it isn't cached.
+        """
+        response_cache = getattr(self.http_client, 'cache', None)
+
+        if response_cache is None or headers:
+            return None, None
+
+        ttl = response_cache.get_ttl(self._manager_name, self.cacheable)
+
+        if ttl is None:
+            return None, None
+
+        key = (
+            self._manager_name,
+            self.http_client.get_cache_scope(),
+            url,
+            response_key
+        )
+
+        return key, response_cache.get(key)
+
+    def _set_cached(self, key, resource):
+        if key is None:
+            return
+
+        response_cache = self.http_client.cache
+
+        response_cache.set(
+            key,
+            resource,
+            response_cache.get_ttl(self._manager_name, self.cacheable)
+        )
+
+    def _invalidate_cache(self):
+        response_cache = getattr(self.http_client, 'cache', None)
+
+        if response_cache is not None:
+            response_cache.invalidate(
+                (self._manager_name,) + tuple(self.cache_invalidates)
+            )
+
+    def _add_validators(self, url, headers):
+        """Makes the request conditional if the resource was fetched before.
+
+        :return: Tuple of the request headers and the kept (validators,
+            resource) pair, None if there is none.
+        """
+        if not self.conditional_get:
+            return headers, None
+
+        with self._validated_lock:
+            validated = self._validated.get(url)
+
+            if validated is None:
+                return headers, None
+
+            self._validated.move_to_end(url)
+
+        headers = dict(headers) if headers else {}
+        headers.update(validated[0])
+
+        return headers, validated
+
+    def _store_validators(self, url, resp, resource):
+        validators = _get_validators(resp)
+
+        with self._validated_lock:
+            if not validators:
+                self._validated.pop(url, None)
+                return
+
+            # Resource objects add their defaults to the data they are
+            # created with, the kept version must not change.
+            self._validated[url] = (validators, copy.deepcopy(resource))
+            self._validated.move_to_end(url)
+
+            while len(self._validated) > CONDITIONAL_GET_MAX_ENTRIES:
+                self._validated.popitem(last=False)
+
+    def _iter_resources(self, chunks, response_key=None, resource_class=None,
+                        close=None):
+        resource_class = resource_class or self.resource_class
+
+        try:
+            for resource_data in json_stream.iter_json_array(chunks,
+                                                             response_key):
+                yield resource_class(self, resource_data)
+        finally:
+            if close:
+                close()
+
     @staticmethod
     def _raise_api_exception(resp):
         try:
@@ -253,6 +577,21 @@ class ResourceManager(object):
         )
 
 
+def _get_validators(resp):
+    """Returns the headers of a request revalidating the given response.
+
+    None if the response has neither an ETag nor a Last-Modified header,
+    the stock Mistral API sends none of them.
+    """
+    if resp.headers.get('ETag'):
+        return {'If-None-Match': resp.headers['ETag']}
+
+    if resp.headers.get('Last-Modified'):
+        return {'If-Modified-Since': resp.headers['Last-Modified']}
+
+    return None
+
+
 def get_json(response):
     """Gets JSON representation of response.
 
@@ -0,0 +1,122 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import collections
+import copy
+import threading
+import time
+
+
+DEFAULT_MAX_SIZE = 1000
+DEFAULT_TTL = 60.0
+
+
+class ResponseCache(object):
+    """Size-bounded cache of decoded responses with per-manager TTLs.
+
+    Entries belong to the resource manager that fetched them. Managers
+    are identified by their class name, e.g. "WorkflowManager". Only the
+    managers of resources rarely changed by others (workflows, actions,
+    environments, ...) are cached by default, others can be enabled by
+    giving them a TTL. Once ``max_size`` entries are cached the least
+    recently used one is evicted.
+
+    :param max_size: Maximum number of cached responses.
+    :param ttl: Time in seconds responses are cached for by default.
+    :param ttls: dict mapping manager names to the time in seconds their
+        responses are cached for, 0 disables caching for a manager.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL,
+                 ttls=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def get_ttl(self, manager_name, cacheable=False):
+        """Returns the TTL of a manager's responses, None if not cached."""
+        ttl = self.ttls.get(manager_name, self.ttl if cacheable else None)
+
+        return ttl or None
+
+    def get(self, key):
+        """Returns a copy of the cached value, None if there is none."""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            if entry[0] <= now:
+                del self._entries[key]
+
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+
+            value = entry[1]
+
+        return copy.deepcopy(value)
+
+    def set(self, key, value, ttl):
+        """Caches a copy of the value for ``ttl`` seconds.
+
+        :param key: Tuple whose first item is the name of the manager.
+        """
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+                self._stats['evictions'] += 1
+
+    def invalidate(self, manager_names):
+        """Drops the responses cached by the given managers."""
+        with self._lock:
+            keys = [k for k in self._entries if k[0] in manager_names]
+
+            for key in keys:
+                del self._entries[key]
+
+            self._stats['invalidations'] += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """Returns the cache counters and the current number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+
+        return stats
@@ -0,0 +1,299 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Transports recording API exchanges to a file and replaying them.
+
+A recording is made against a real API::
+
+    recorder = cassettes.RecordingTransport('executions.json')
+    mistral = client.Client(mistral_url=url, auth_token=token,
+                            transport=recorder)
+    mistral.executions.list(limit=1000)
+    recorder.save()
+
+and replayed without network access, with the recorded response times
+if ``latency`` is set::
+
+    mistral = client.Client(
+        mistral_url=url,
+        transport=cassettes.ReplayTransport('executions.json', latency=1.0)
+    )
+
+Tokens, service catalogs and cookies are not recorded.
+"""
+
+import base64
+import collections
+import datetime
+import threading
+import time
+import urllib.parse
+
+from oslo_serialization import jsonutils
+import requests
+from requests import structures
+
+VERSION = 1
+
+# Headers whose values are replaced by SCRUBBED.
+SCRUBBED_HEADERS = frozenset([
+    'authorization',
+    'cookie',
+    'proxy-authorization',
+    'set-cookie',
+    'x-auth-token',
+    'x-subject-token',
+    'x-target-auth-token',
+    'x-target-service-catalog',
+])
+
+SCRUBBED = '<scrubbed>'
+
+# Response headers describing the body as sent, the recorded body is
+# decoded.
+_DROPPED_HEADERS = frozenset([
+    'content-encoding',
+    'content-length',
+    'transfer-encoding',
+])
+
+
+class UnknownRequestError(LookupError):
+    """Raised when replaying a request that wasn't recorded."""
+
+
+def _scrub(headers):
+    return {
+        k: SCRUBBED if k.lower() in SCRUBBED_HEADERS else v
+        for k, v in headers.items()
+    }
+
+
+def _encode_body(body):
+    if body is None:
+        return None
+
+    if isinstance(body, dict):
+        body = urllib.parse.urlencode(list(body.items()), doseq=True)
+
+    if isinstance(body, str):
+        return {'text': body}
+
+    try:
+        return {'text': body.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'base64': base64.b64encode(body).decode('ascii')}
+
+
+def _decode_body(body):
+    if body is None:
+        return b''
+
+    if 'text' in body:
+        return body['text'].encode('utf-8')
+
+    return base64.b64decode(body['base64'])
+
+
+def _get_key(method, url):
+    """Returns what recorded requests are matched by.
+
+    The scheme and host are left out so that a recording can be replayed
+    with any base URL.
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = sorted(urllib.parse.parse_qsl(parts.query,
+                                          keep_blank_values=True))
+
+    return method.upper(), parts.path, tuple(query)
+
+
+class RecordingTransport(object):
+    """Sends the requests with another transport and records them.
+
+    :param path: Path of the file the exchanges are saved to by save().
+    :param transport: Transport the requests are sent with, a new
+        requests.Session by default.
+    """
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or requests.Session()
+
+        self._lock = threading.Lock()
+        self._interactions = []
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        start = time.monotonic()
+
+        resp = getattr(self.transport, method.lower())(
+            url,
+            data=data,
+            headers=headers,
+            **kwargs
+        )
+
+        # Streamed responses are read as well, requests serves the body
+        # from memory afterwards.
+        content = resp.content
+
+        interaction = {
+            'request': {
+                'method': method.upper(),
+                'url': url,
+                'headers': _scrub(headers or {}),
+                'body': _encode_body(data)
+            },
+            'response': {
+                'status_code': resp.status_code,
+                'reason': resp.reason,
+                'headers': {
+                    k: v for k, v in _scrub(resp.headers).items()
+                    if k.lower() not in _DROPPED_HEADERS
+                },
+                'body': _encode_body(content)
+            },
+            'ttfb': resp.elapsed.total_seconds(),
+            'duration': time.monotonic() - start
+        }
+
+        with self._lock:
+            self._interactions.append(interaction)
+
+        return resp
+
+    def get_interactions(self):
+        with self._lock:
+            return list(self._interactions)
+
+    def save(self):
+        """Writes the exchanges recorded so far to the file."""
+        cassette = {
+            'version': VERSION,
+            'interactions': self.get_interactions()
+        }
+
+        with open(self.path, 'w') as f:
+            jsonutils.dump(cassette, f)
+
+    def close(self):
+        self.save()
+
+        close = getattr(self.transport, 'close', None)
+
+        if close is not None:
+            close()
+
+
+class ReplayTransport(object):
+    """Answers the requests with the responses of a recording.
+
+    Requests are matched by method, path and query parameters. Identical
+    requests get the responses recorded for them in turn, starting over
+    after the last one.
+
+    :param path: Path of the recording.
+    :param latency: Factor the recorded response times are multiplied by
+        to delay the responses, e.g. 1.0 to reproduce them or 0.5 for
+        twice faster responses. None not to delay them.
+    """
+
+    def __init__(self, path, latency=None):
+        with open(path, 'rb') as f:
+            cassette = jsonutils.load(f)
+
+        if cassette.get('version') != VERSION:
+            raise ValueError('Unsupported recording version: %s' %
+                             cassette.get('version'))
+
+        self.latency = latency
+
+        self._lock = threading.Lock()
+        self._responses = collections.defaultdict(collections.deque)
+
+        for interaction in cassette['interactions']:
+            req = interaction['request']
+
+            self._responses[_get_key(req['method'], req['url'])].append(
+                interaction
+            )
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        key = _get_key(method, url)
+
+        with self._lock:
+            interactions = self._responses.get(key)
+
+            if not interactions:
+                raise UnknownRequestError(
+                    'No recorded response to %s %s' % (method.upper(), url)
+                )
+
+            interaction = interactions[0]
+            interactions.rotate(-1)
+
+        if self.latency:
+            time.sleep(interaction['duration'] * self.latency)
+
+        return self._build_response(method, url, headers, interaction)
+
+    def _build_response(self, method, url, headers, interaction):
+        recorded = interaction['response']
+
+        resp = requests.Response()
+        resp.status_code = recorded['status_code']
+        resp.reason = recorded['reason']
+        resp.headers = structures.CaseInsensitiveDict(recorded['headers'])
+        resp.url = url
+        resp.encoding = requests.utils.get_encoding_from_headers(
+            resp.headers
+        )
+        resp._content = _decode_body(recorded['body'])
+        resp._content_consumed = True
+        resp.elapsed = datetime.timedelta(
+            seconds=interaction['ttfb'] * (self.latency or 0)
+        )
+
+        request = requests.PreparedRequest()
+        request.method = method.upper()
+        request.url = url
+        request.headers = structures.CaseInsensitiveDict(headers or {})
+        resp.request = request
+
+        return resp
+
+    def close(self):
+        pass
@@ -0,0 +1,228 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import collections
+import logging
+import threading
+import time
+
+from keystoneauth1 import exceptions as ks_exceptions
+
+from mistralclient.api import retry
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+FAILURE_STATUS_CODES = frozenset([500, 502, 503, 504])
+
+# Number of state transitions kept for monitoring.
+MAX_TRANSITIONS = 100
+
+LOG = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to an endpoint deemed down."""
+
+    def __init__(self, endpoint, retry_after):
+        super(CircuitOpenError, self).__init__(
+            'Circuit breaker for %s is open, retry in %.1f seconds' %
+            (endpoint, retry_after)
+        )
+
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class _Circuit(object):
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.successes = 0
+        self.opened_at = None
+        self.trials = 0
+        self.rejected = 0
+
+
+class CircuitBreaker(object):
+    """Stops sending requests to endpoints that keep failing.
+
+    Every endpoint (base URL) has its own circuit. A circuit is closed
+    while requests succeed. After ``failure_threshold`` consecutive
+    failures, i.e. connection errors, timeouts or responses with a status
+    code in ``failure_status_codes``, it opens: requests fail right away
+    with CircuitOpenError for ``recovery_timeout`` seconds. The circuit is
+    then half-open, up to ``half_open_max_calls`` requests at a time are
+    sent as trials. It closes after ``success_threshold`` successful
+    trials and opens again as soon as one fails.
+
+    :param failure_threshold: Consecutive failures opening the circuit.
+    :param recovery_timeout: Time in seconds the circuit stays open.
+    :param half_open_max_calls: Number of concurrent trial requests.
+    :param success_threshold: Successful trials closing the circuit.
+    :param failure_status_codes: Response status codes counted as failures.
+    :param on_state_change: Function called with the endpoint, the old
+        and the new state on every transition.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0,
+                 half_open_max_calls=1, success_threshold=1,
+                 failure_status_codes=FAILURE_STATUS_CODES,
+                 on_state_change=None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.failure_status_codes = frozenset(failure_status_codes)
+        self.on_state_change = on_state_change
+
+        # Reentrant so that on_state_change can get the state.
+        self._lock = threading.RLock()
+        self._circuits = collections.defaultdict(_Circuit)
+        self._transitions = collections.deque(maxlen=MAX_TRANSITIONS)
+
+    def get_state(self, endpoint):
+        """Returns the current state of the circuit of an endpoint."""
+        with self._lock:
+            return self._get_circuit(endpoint).state
+
+    def get_stats(self):
+        """Returns the state and counters of the circuit of each endpoint.
+
+        :return: dict mapping endpoints to their state, the number of
+            consecutive failures and of requests rejected while the
+            circuit was open.
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    'state': self._get_circuit(endpoint).state,
+                    'failures': circuit.failures,
+                    'rejected': circuit.rejected
+                }
+                for endpoint, circuit in self._circuits.items()
+            }
+
+    def get_transitions(self):
+        """Returns the last state transitions, oldest first.
+
+        :return: List of dicts with the time (as returned by time.time()),
+            the endpoint, the old and the new state.
+        """
+        with self._lock:
+            return list(self._transitions)
+
+    def before_request(self, endpoint):
+        """Raises CircuitOpenError if no request may be sent to endpoint."""
+        with self._lock:
+            circuit = self._get_circuit(endpoint)
+
+            if circuit.state == CLOSED:
+                return
+
+            if (circuit.state == HALF_OPEN and
+                    circuit.trials < self.half_open_max_calls):
+                circuit.trials += 1
+                return
+
+            circuit.rejected += 1
+
+            retry_after = 0.0
+
+            if circuit.state == OPEN:
+                retry_after = max(
+                    circuit.opened_at + self.recovery_timeout -
+                    time.monotonic(),
+                    0.0
+                )
+
+        raise CircuitOpenError(endpoint, retry_after)
+
+    def record_response(self, endpoint, status_code):
+        if status_code in self.failure_status_codes:
+            self._record_failure(endpoint)
+        else:
+            self._record_success(endpoint)
+
+    def record_error(self, endpoint, error):
+        """Records a request that raised an exception."""
+        if isinstance(error, retry.CONNECTION_ERRORS):
+            self._record_failure(endpoint)
+        elif isinstance(error, ks_exceptions.HttpError):
+            # Keystone sessions raise errors for 4xx and 5xx responses.
+            self.record_response(endpoint, error.http_status)
+        else:
+            self._record_success(endpoint)
+
+    def _get_circuit(self, endpoint):
+        circuit = self._circuits[endpoint]
+
+        if (circuit.state == OPEN and
+                time.monotonic() - circuit.opened_at >=
+                self.recovery_timeout):
+            self._set_state(endpoint, circuit, HALF_OPEN)
+
+        return circuit
+
+    def _record_success(self, endpoint):
+        with self._lock:
+            circuit = self._get_circuit(endpoint)
+
+            circuit.failures = 0
+
+            if circuit.state == HALF_OPEN:
+                circuit.trials = max(circuit.trials - 1, 0)
+                circuit.successes += 1
+
+                if circuit.successes >= self.success_threshold:
+                    self._set_state(endpoint, circuit, CLOSED)
+
+    def _record_failure(self, endpoint):
+        with self._lock:
+            circuit = self._get_circuit(endpoint)
+
+            circuit.failures += 1
+
+            if circuit.state == HALF_OPEN or (
+                    circuit.state == CLOSED and
+                    circuit.failures >= self.failure_threshold):
+                self._set_state(endpoint, circuit, OPEN)
+
+    def _set_state(self, endpoint, circuit, state):
+        old_state = circuit.state
+
+        circuit.state = state
+        circuit.successes = 0
+        circuit.trials = 0
+
+        if state == OPEN:
+            circuit.opened_at = time.monotonic()
+        elif state == CLOSED:
+            circuit.failures = 0
+
+        self._transitions.append({
+            'time': time.time(),
+            'endpoint': endpoint,
+            'from': old_state,
+            'to': state
+        })
+
+        LOG.log(
+            logging.WARNING if state == OPEN else logging.INFO,
+            "Circuit breaker for %s changed from %s to %s",
+            endpoint, old_state, state
+        )
+
+        if self.on_state_change is not None:
+            self.on_state_change(endpoint, old_state, state)
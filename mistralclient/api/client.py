@@ -12,6 +12,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from mistralclient.api.v2 import async_client as async_client_v2
 from mistralclient.api.v2 import client as client_v2
 
 
@@ -19,6 +20,10 @@ def client(auth_type='keystone', **kwargs):
     return client_v2.Client(auth_type=auth_type, **kwargs)
 
 
+def async_client(auth_type='keystone', **kwargs):
+    return async_client_v2.AsyncClient(auth_type=auth_type, **kwargs)
+
+
 def determine_client_version(mistral_version):
     if mistral_version.find("v2") != -1:
         return 2
@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import collections
+import math
+import threading
+
+
+# Number of requests of a client that can be hedged at the same time.
+DEFAULT_MAX_WORKERS = 32
+
+
+class _Operation(object):
+    def __init__(self, window):
+        self.latencies = collections.deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+
+class HedgingPolicy(object):
+    """Decides when a duplicate of a slow GET request is sent.
+
+    The response times of the requests of every API operation, e.g.
+    "ExecutionManager.get", are recorded. Once a request has been waiting
+    longer than the ``percentile`` of the recent response times of its
+    operation, the same request is sent again, to another endpoint if
+    there are several. The first response is used, the other request is
+    cancelled. Until ``min_samples`` response times are known
+    ``initial_delay`` is used.
+
+    To keep hedging from doubling the load of an API that is slow as a
+    whole, at most ``max_ratio`` of the requests are hedged.
+
+    Requests that may be hedged are sent from a pool of ``max_workers``
+    threads of the client, the other ones from the calling thread. The
+    pool doesn't limit the number of concurrent requests: when all its
+    threads are busy, requests are sent from the calling thread and not
+    hedged.
+
+    :param percentile: Percentile of the response times after which a
+        request is hedged.
+    :param initial_delay: Delay in seconds used for operations with too
+        few known response times.
+    :param min_delay: Minimum delay in seconds.
+    :param max_delay: Maximum delay in seconds, or None for no limit.
+    :param window: Number of response times kept for each operation.
+    :param min_samples: Number of response times needed to compute the
+        percentile.
+    :param max_ratio: Maximum fraction of hedged requests.
+    :param max_workers: Size of the thread pool of the requests that may
+        be hedged and of their hedged requests.
+    """
+
+    def __init__(self, percentile=95.0, initial_delay=0.5, min_delay=0.01,
+                 max_delay=None, window=100, min_samples=20, max_ratio=0.1,
+                 max_workers=DEFAULT_MAX_WORKERS):
+        if not 0 < percentile <= 100:
+            raise ValueError('Percentile must be in (0, 100]: %s' %
+                             percentile)
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._operations = {}
+        self._requests = 0
+        self._hedged = 0
+
+    def _get_operation(self, name):
+        op = self._operations.get(name)
+
+        if op is None:
+            op = self._operations[name] = _Operation(self.window)
+
+        return op
+
+    def _get_delay(self, op):
+        if len(op.latencies) < max(self.min_samples, 1):
+            delay = self.initial_delay
+        else:
+            latencies = sorted(op.latencies)
+            rank = math.ceil(self.percentile / 100.0 * len(latencies))
+
+            delay = latencies[rank - 1]
+
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+
+        return max(delay, self.min_delay)
+
+    def start(self, operation):
+        """Counts a request and returns the delay before hedging it."""
+        with self._lock:
+            op = self._get_operation(operation)
+
+            op.requests += 1
+            self._requests += 1
+
+            return self._get_delay(op)
+
+    def should_hedge(self, operation):
+        """Tells whether a request still in progress may be hedged."""
+        with self._lock:
+            if self._hedged + 1 > self.max_ratio * self._requests:
+                return False
+
+            self._get_operation(operation).hedged += 1
+            self._hedged += 1
+
+            return True
+
+    def record_latency(self, operation, latency):
+        """Records the response time of a request in seconds."""
+        with self._lock:
+            self._get_operation(operation).latencies.append(latency)
+
+    def record_hedge_win(self, operation):
+        """Records that the hedged request answered first."""
+        with self._lock:
+            self._get_operation(operation).hedge_wins += 1
+
+    def get_stats(self):
+        """Returns hedging statistics grouped by API operation.
+
+        :return: dict mapping an operation name to the number of requests,
+            of hedged requests, of hedged requests that answered first
+            ("hedge_wins") and the current hedging delay in seconds.
+        """
+        with self._lock:
+            return {
+                name: {
+                    'requests': op.requests,
+                    'hedged': op.hedged,
+                    'hedge_wins': op.hedge_wins,
+                    'delay': self._get_delay(op)
+                }
+                for name, op in self._operations.items()
+            }
@@ -14,13 +14,35 @@
 #    limitations under the License.
 
 import base64
-import copy
+from concurrent import futures
+import contextlib
+import contextvars
+import functools
+import gzip
 import logging
 import os
+import threading
+import time
+import types
 
+from keystoneauth1 import exceptions as ks_exceptions
 from oslo_utils import importutils
 
 import requests
+from requests import adapters
+
+from mistralclient.api import balancer
+from mistralclient.api import cache
+from mistralclient.api import circuit_breaker
+from mistralclient.api import hedging
+from mistralclient.api import instrumentation
+from mistralclient.api import rate_limit
+from mistralclient.api import retry
+from mistralclient.api import single_flight
+from mistralclient.api import slow_calls
+from mistralclient.api import timeouts
+from mistralclient.api import transports
+from mistralclient.api import unix_socket
 
 
 AUTH_TOKEN = 'auth_token'
@@ -44,26 +66,350 @@ TARGET_REGION_NAME = 'target_region_name'
 TARGET_USER_DOMAIN_NAME = 'target_user_domain_name'
 TARGET_PROJECT_DOMAIN_NAME = 'target_project_domain_name'
 
+POOL_CONNECTIONS = 'pool_connections'
+POOL_MAXSIZE = 'pool_maxsize'
+POOL_BLOCK = 'pool_block'
+POOL_IDLE_TIMEOUT = 'pool_idle_timeout'
+
+POOL_OPTIONS = (POOL_CONNECTIONS, POOL_MAXSIZE, POOL_BLOCK, POOL_IDLE_TIMEOUT)
+
+RETRY_POLICY = 'retry_policy'
+
+TRANSPORT = 'transport'
+
+CACHE = 'cache'
+
+COALESCE_REQUESTS = 'coalesce_requests'
+
+MAX_CONCURRENCY = 'max_concurrency'
+
+CIRCUIT_BREAKER = 'circuit_breaker'
+
+LOAD_BALANCING = 'load_balancing'
+ENDPOINT_MAX_FAILURES = 'endpoint_max_failures'
+ENDPOINT_EJECTION_TIME = 'endpoint_ejection_time'
+
+# Methods whose requests can be sent again to another endpoint.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+HEDGING = 'hedging'
+
+RATE_LIMIT = 'rate_limit'
+
+CONNECT_TIMEOUT = 'connect_timeout'
+READ_TIMEOUT = 'read_timeout'
+
+REQUEST_HOOKS = 'request_hooks'
+
+TRACER = 'tracer'
+
+SLOW_CALL_THRESHOLD = 'slow_call_threshold'
+SLOW_CALL_LOG = 'slow_call_log'
+
+# Options taking objects that can't be deep-copied.
+OBJECT_OPTIONS = (RETRY_POLICY, TRANSPORT, CACHE, CIRCUIT_BREAKER, HEDGING,
+                  RATE_LIMIT, REQUEST_HOOKS, TRACER)
+
+COMPRESSION_THRESHOLD = 'compression_threshold'
+COMPRESSION_LEVEL = 'compression_level'
+
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Attributes the static part of the request headers is built from.
+_HEADERS_TEMPLATE_ATTRS = frozenset([
+    'session',
+    AUTH_TOKEN,
+    PROJECT_ID,
+    USER_ID,
+    REGION_NAME,
+    TARGET_AUTH_TOKEN,
+    'target_auth_uri',
+    TARGET_PROJECT_ID,
+    TARGET_USER_ID,
+    TARGET_INSECURE,
+    TARGET_SERVICE_CATALOG,
+    TARGET_REGION_NAME,
+    TARGET_USER_DOMAIN_NAME,
+    TARGET_PROJECT_DOMAIN_NAME,
+])
+
 osprofiler_web = importutils.try_import("osprofiler.web")
 
 LOG = logging.getLogger(__name__)
 
+# Name of the API operation (e.g. "ExecutionManager.get") the HTTP requests
+# made in the current context belong to.
+_operation = contextvars.ContextVar('mistralclient_operation', default=None)
+
+
+def get_operation():
+    """Returns the name of the API operation currently being performed."""
+    return _operation.get()
+
+
+@contextlib.contextmanager
+def operation(name):
+    """Marks HTTP requests made within the block as part of an operation.
+
+    Nested operations are reported as part of the outermost one.
+    """
+    if _operation.get() is not None:
+        yield
+        return
+
+    token = _operation.set(name)
+
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def instrument_request(func):
+    """Reports the request sent by an HTTP client method to the hooks."""
+    @functools.wraps(func)
+    def decorator(self, url, *args, **kwargs):
+        if not self.request_hooks:
+            resp = func(self, url, *args, **kwargs)
+            LOG.debug("HTTP %s %s %d", resp.request.method, resp.url,
+                      resp.status_code)
+            return resp
+
+        event, token = self._start_request_event(func.__name__, url)
+
+        try:
+            resp = func(self, url, *args, **kwargs)
+        except Exception as e:
+            self._finish_request_event(event, token, error=e)
+            raise
+
+        self._finish_request_event(event, token, resp=resp)
 
-def log_request(func):
-    def decorator(self, *args, **kwargs):
-        resp = func(self, *args, **kwargs)
-        LOG.debug("HTTP %s %s %d", resp.request.method, resp.url,
-                  resp.status_code)
         return resp
     return decorator
 
 
+class PoolingHTTPAdapter(adapters.HTTPAdapter):
+    """HTTP adapter that keeps track of its connection pools.
+
+    Besides the standard pool sizing options of requests this adapter
+    drops all pooled connections once it has been idle for longer than
+    ``idle_timeout`` seconds, so that connections closed by a proxy or
+    load balancer in the meantime are not reused.
+    """
+
+    def __init__(self, idle_timeout=None, **kwargs):
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._requests = 0
+        self._dropped_connections = 0
+        self._last_used = time.monotonic()
+
+        super(PoolingHTTPAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            if (self.idle_timeout is not None and not self._in_use and
+                    time.monotonic() - self._last_used > self.idle_timeout):
+                self._drop_pools()
+
+            self._in_use += 1
+            self._requests += 1
+
+        try:
+            return super(PoolingHTTPAdapter, self).send(request, **kwargs)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.monotonic()
+
+    def _pools(self):
+        pools = self.poolmanager.pools
+
+        return [pools[key] for key in pools.keys() if key in pools]
+
+    def _drop_pools(self):
+        LOG.debug("Dropping connections idle for more than %s seconds",
+                  self.idle_timeout)
+
+        self._dropped_connections += sum(
+            p.num_connections for p in self._pools()
+        )
+
+        self.poolmanager.clear()
+
+    def get_stats(self):
+        """Returns a snapshot of the connection pool usage."""
+        with self._lock:
+            pools = self._pools()
+
+            idle = 0
+
+            for pool in pools:
+                queue = getattr(pool.pool, 'queue', None) or []
+                idle += sum(1 for conn in list(queue) if conn is not None)
+
+            new_connections = self._dropped_connections + sum(
+                p.num_connections for p in pools
+            )
+
+            return {
+                'in_use': self._in_use,
+                'idle': idle,
+                'requests': self._requests,
+                'new_connections': new_connections,
+                'reused_connections': max(
+                    self._requests - new_connections, 0
+                )
+            }
+
+
+class UnixSocketAdapter(PoolingHTTPAdapter):
+    """Pooling HTTP adapter for the API listening on a Unix socket.
+
+    Sends the requests to ``http+unix://`` URLs, see
+    :mod:`mistralclient.api.unix_socket`.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(UnixSocketAdapter, self).init_poolmanager(*args, **kwargs)
+
+        unix_socket.register(self.poolmanager)
+
+
 class HTTPClient(object):
+    """Sends the requests of the resource managers.
+
+    An HTTPClient can be shared by any number of threads. If
+    ``max_concurrency`` is set, at most that many requests are sent at the
+    same time, the other threads wait for one of them to complete. The body
+    of a streamed response is read after the request has completed, it
+    isn't limited.
+
+    ``base_url`` can be a list of the base URLs of several replicas of the
+    API. The requests are then spread over them according to the
+    ``load_balancing`` strategy, see
+    :class:`mistralclient.api.balancer.EndpointBalancer`. Requests of
+    idempotent methods failing with a connection error, a timeout or a
+    502, 503 or 504 response are sent again to another endpoint.
+
+    With the ``hedging`` option GET requests taking longer than usual are
+    sent a second time, see :class:`mistralclient.api.hedging.HedgingPolicy`.
+
+    Requests time out after ``connect_timeout`` seconds without a
+    connection and ``read_timeout`` seconds without data from the server.
+    The timeouts can be changed for some requests and a time budget can be
+    set for several ones, see :mod:`mistralclient.api.timeouts`.
+
+    The ``rate_limit`` option takes a number of requests per second or a
+    :class:`mistralclient.api.rate_limit.RateLimiter` with limits for
+    some managers or HTTP methods. Requests exceeding the rate wait.
+
+    An API running on the same host can be reached over a Unix domain
+    socket with an ``http+unix://`` base URL, e.g.
+    ``http+unix://%2Frun%2Fmistral%2Fapi.sock/v2``.
+
+    The ``request_hooks`` are called with the measurements of every
+    request, see :mod:`mistralclient.api.instrumentation`. Requests
+    taking longer than ``slow_call_threshold`` seconds are recorded in the
+    ``slow_call_log`` file, see
+    :class:`mistralclient.api.slow_calls.SlowCallLog`. The operations of
+    the managers are traced by the ``tracer``, see
+    :mod:`mistralclient.api.tracing`.
+    """
+
     def __init__(self, base_url, **kwargs):
+        self.balancer = None
+
+        if not isinstance(base_url, str):
+            endpoints = list(base_url)
+
+            if len(endpoints) > 1:
+                self.balancer = balancer.EndpointBalancer(
+                    endpoints,
+                    strategy=(kwargs.get(LOAD_BALANCING) or
+                              balancer.ROUND_ROBIN),
+                    max_failures=kwargs.get(ENDPOINT_MAX_FAILURES) or 3,
+                    ejection_time=kwargs.get(ENDPOINT_EJECTION_TIME, 30.0)
+                )
+
+            base_url = endpoints[0]
+
         self.base_url = base_url
         self.session = kwargs.get('session')
-        if not self.session:
-            self.session = requests.Session()
+
+        self.max_concurrency = kwargs.get(MAX_CONCURRENCY)
+        self._semaphore = (
+            threading.BoundedSemaphore(self.max_concurrency)
+            if self.max_concurrency else None
+        )
+
+        self.pool_adapter = None
+
+        self._init_session(kwargs)
+
+        self.retry_policy = kwargs.get(RETRY_POLICY)
+
+        if self.retry_policy is True:
+            self.retry_policy = retry.RetryPolicy()
+
+        self.circuit_breaker = kwargs.get(CIRCUIT_BREAKER)
+
+        if self.circuit_breaker is True:
+            self.circuit_breaker = circuit_breaker.CircuitBreaker()
+
+        self.cache = kwargs.get(CACHE)
+
+        if self.cache is True:
+            self.cache = cache.ResponseCache()
+
+        self.single_flight = (
+            single_flight.SingleFlight()
+            if kwargs.get(COALESCE_REQUESTS) else None
+        )
+
+        self.hedging = kwargs.get(HEDGING)
+
+        if self.hedging is True:
+            self.hedging = hedging.HedgingPolicy()
+
+        self._hedging_executor = None
+        self._hedging_slots = None
+        self._hedging_lock = threading.Lock()
+
+        self.rate_limiter = kwargs.get(RATE_LIMIT)
+
+        if isinstance(self.rate_limiter, (int, float)):
+            self.rate_limiter = rate_limit.RateLimiter(self.rate_limiter)
+
+        self.connect_timeout = kwargs.get(CONNECT_TIMEOUT,
+                                          timeouts.DEFAULT_CONNECT_TIMEOUT)
+        self.read_timeout = kwargs.get(READ_TIMEOUT,
+                                       timeouts.DEFAULT_READ_TIMEOUT)
+
+        self.request_hooks = list(kwargs.get(REQUEST_HOOKS) or ())
+
+        if kwargs.get(SLOW_CALL_THRESHOLD) is not None:
+            self.request_hooks.append(
+                slow_calls.SlowCallLog(kwargs[SLOW_CALL_THRESHOLD],
+                                       kwargs.get(SLOW_CALL_LOG))
+            )
+
+        self.tracer = kwargs.get(TRACER)
+
+        if self.tracer is not None:
+            self.request_hooks.append(self.tracer)
+
+        self.compression_threshold = kwargs.get(COMPRESSION_THRESHOLD)
+        self.compression_level = (kwargs.get(COMPRESSION_LEVEL) or
+                                  DEFAULT_COMPRESSION_LEVEL)
+
+        self._stats_lock = threading.Lock()
+        self._retry_stats = {}
+        self._transfer_stats = {}
+
         self.auth_token = kwargs.get(AUTH_TOKEN)
         self.project_id = kwargs.get(PROJECT_ID)
         self.user_id = kwargs.get(USER_ID)
@@ -85,7 +431,7 @@ class HTTPClient(object):
             TARGET_PROJECT_DOMAIN_NAME
         )
 
-        if self.base_url.startswith('https'):
+        if any(url.startswith('https') for url in self.get_endpoints()):
             if self.cacert and not os.path.exists(self.cacert):
                 raise ValueError('Unable to locate cacert file '
                                  'at %s.' % self.cacert)
@@ -107,47 +453,772 @@ class HTTPClient(object):
                 kwargs.get(CERT_KEY)
             )
 
-    @log_request
-    def get(self, url, headers=None):
+        self.transport = self._create_transport(kwargs.get(TRANSPORT), kwargs)
+
+    def _init_session(self, kwargs):
+        """Creates the requests session and mounts its connection pool."""
+        own_session = not self.session
+
+        if own_session:
+            self.session = requests.Session()
+
+        use_unix_socket = any(
+            unix_socket.is_unix_socket_url(url) for url in self.get_endpoints()
+        )
+
+        if (kwargs.get(TRANSPORT) in (None, 'requests') and
+                (own_session or use_unix_socket or
+                 any(kwargs.get(o) is not None for o in POOL_OPTIONS))):
+            self._mount_pool_adapter(kwargs, use_unix_socket)
+
+        if own_session and all(unix_socket.is_unix_socket_url(url)
+                               for url in self.get_endpoints()):
+            # Proxy and CA bundle environment variables don't apply to
+            # Unix sockets, reading them takes longer than the request.
+            self.session.trust_env = False
+
+    def _create_transport(self, transport, kwargs):
+        """Returns the object the requests are sent with.
+
+        :param transport: "requests" (default) to send the requests with the
+            session, "http2" or "httpx" to send them with httpx, over HTTP/2
+            or HTTP/1.1 respectively, or an object with the same interface
+            as requests.Session.
+        """
+        if transport in (None, 'requests'):
+            return self.session
+
+        if transport in ('http2', 'httpx'):
+            options = {
+                'http2': transport == 'http2',
+                'verify': self.ssl_options.get('verify', True),
+                'cert': self.ssl_options.get('cert'),
+                'max_connections': kwargs.get(POOL_MAXSIZE)
+            }
+
+            if kwargs.get(POOL_IDLE_TIMEOUT) is not None:
+                options['keepalive_expiry'] = kwargs[POOL_IDLE_TIMEOUT]
+
+            return transports.HTTPXTransport(**options)
+
+        if isinstance(transport, str):
+            raise ValueError('Unknown transport: %s' % transport)
+
+        return transport
+
+    def _get_requests_session(self):
+        if isinstance(self.session, requests.Session):
+            return self.session
+
+        # Keystone sessions wrap a requests session.
+        session = getattr(self.session, 'session', None)
+
+        return session if isinstance(session, requests.Session) else None
+
+    def _mount_pool_adapter(self, kwargs, use_unix_socket=False):
+        session = self._get_requests_session()
+
+        if session is None:
+            if use_unix_socket:
+                raise ValueError('Unix sockets are not supported with '
+                                 'sessions of type %s.' %
+                                 type(self.session).__name__)
+
+            LOG.warning('Connection pool options are ignored for sessions '
+                        'of type %s.', type(self.session).__name__)
+            return
+
+        pool_connections = kwargs.get(POOL_CONNECTIONS)
+        # Connections exceeding the pool size are closed after each request,
+        # the pool should be large enough for all concurrent requests.
+        pool_maxsize = kwargs.get(POOL_MAXSIZE) or max(
+            adapters.DEFAULT_POOLSIZE,
+            self.max_concurrency or 0
+        )
+
+        adapter_cls, prefixes = (
+            (UnixSocketAdapter, (unix_socket.PREFIX,)) if use_unix_socket
+            else (PoolingHTTPAdapter, ('http://', 'https://'))
+        )
+
+        self.pool_adapter = adapter_cls(
+            idle_timeout=kwargs.get(POOL_IDLE_TIMEOUT),
+            pool_connections=(pool_connections or
+                              adapters.DEFAULT_POOLSIZE),
+            pool_maxsize=pool_maxsize,
+            pool_block=bool(kwargs.get(POOL_BLOCK, adapters.DEFAULT_POOLBLOCK))
+        )
+
+        for prefix in prefixes:
+            session.mount(prefix, self.pool_adapter)
+
+    def get_pool_stats(self):
+        """Returns connection pool statistics.
+
+        :return: dict with the number of connections currently in use and
+            idle, the total number of requests sent and how many of them
+            opened a new connection or reused a pooled one. None if the
+            client doesn't manage the connection pool.
+        """
+        if self.pool_adapter is None:
+            return None
+
+        return self.pool_adapter.get_stats()
+
+    def get_retry_stats(self):
+        """Returns retry statistics grouped by API operation.
+
+        :return: dict mapping an operation name (e.g. "ExecutionManager.get")
+            to the number of retries made and the total time in seconds
+            spent waiting before them.
+        """
+        with self._stats_lock:
+            return {k: dict(v) for k, v in self._retry_stats.items()}
+
+    def get_transfer_stats(self):
+        """Returns the amount of data transferred grouped by API operation.
+
+        :return: dict mapping an operation name to the number of requests
+            and the request and response sizes in bytes, both before
+            compression ("request_bytes", "response_bytes") and as
+            transferred over the network ("request_wire_bytes",
+            "response_wire_bytes"). Bodies of streamed responses are
+            not counted.
+        """
+        with self._stats_lock:
+            return {k: dict(v) for k, v in self._transfer_stats.items()}
+
+    def get_endpoints(self):
+        """Returns the base URLs of all endpoints of the API."""
+        if self.balancer is None:
+            return [self.base_url]
+
+        return self.balancer.endpoints
+
+    def get_endpoint_stats(self):
+        """Returns request statistics of each endpoint.
+
+        See :meth:`mistralclient.api.balancer.EndpointBalancer.get_stats`.
+        None if there is only one endpoint.
+        """
+        if self.balancer is None:
+            return None
+
+        return self.balancer.get_stats()
+
+    def get_coalescing_stats(self):
+        """Returns statistics of the coalescing of identical GET requests.
+
+        :return: dict with the number of GET requests sent ("calls") and of
+            the requests that waited for an identical one in progress and
+            shared its response ("coalesced"). None if the requests are not
+            coalesced.
+        """
+        if self.single_flight is None:
+            return None
+
+        return self.single_flight.get_stats()
+
+    def get_hedging_stats(self):
+        """Returns hedging statistics grouped by API operation.
+
+        See :meth:`mistralclient.api.hedging.HedgingPolicy.get_stats`. None
+        if requests are not hedged.
+        """
+        if self.hedging is None:
+            return None
+
+        return self.hedging.get_stats()
+
+    def get_rate_limit_stats(self):
+        """Returns rate limiting statistics grouped by API operation.
+
+        See :meth:`mistralclient.api.rate_limit.RateLimiter.get_stats`.
+        None if the rate of the requests is not limited.
+        """
+        if self.rate_limiter is None:
+            return None
+
+        return self.rate_limiter.get_stats()
+
+    def add_request_hook(self, hook):
+        """Adds a callable called with the RequestEvent of every request.
+
+        See :class:`mistralclient.api.instrumentation.RequestEvent`.
+        """
+        self.request_hooks.append(hook)
+
+    def remove_request_hook(self, hook):
+        self.request_hooks.remove(hook)
+
+    def get_cache_scope(self):
+        """Returns what cached responses are specific to.
+
+        :return: Tuple of the project ID and the identity and target cloud
+            headers sent with the requests, except the tokens.
+        """
+        project_id = self.project_id
+
+        if project_id is None and self.session is not None and \
+                not isinstance(self.session, requests.Session):
+            project_id = self.session.get_project_id()
+
+        return (project_id,) + tuple(
+            (k, v) for k, v in sorted(self._get_headers_template().items())
+            if not k.endswith('-Auth-Token')
+        )
+
+    @instrument_request
+    def get(self, url, headers=None, stream=False):
         options = self._get_request_options('get', headers)
 
-        return self.session.get(self.base_url + url, **options)
+        if stream:
+            options['stream'] = True
+        elif self.single_flight is not None:
+            # The response body has been read already, the resources are
+            # decoded from it separately by each caller.
+            key = (url, tuple(sorted(options['headers'].items())))
 
-    @log_request
+            return self.single_flight.call(
+                key,
+                self._request,
+                'get',
+                url,
+                **options
+            )
+
+        return self._request('get', url, **options)
+
+    @instrument_request
     def post(self, url, body, headers=None):
         options = self._get_request_options('post', headers)
 
-        return self.session.post(self.base_url + url, data=body, **options)
+        return self._request('post', url, data=body, **options)
 
-    @log_request
+    @instrument_request
     def put(self, url, body, headers=None):
         options = self._get_request_options('put', headers)
 
-        return self.session.put(self.base_url + url, data=body, **options)
+        return self._request('put', url, data=body, **options)
 
-    @log_request
+    @instrument_request
     def delete(self, url, headers=None):
         options = self._get_request_options('delete', headers)
 
-        return self.session.delete(self.base_url + url, **options)
+        return self._request('delete', url, **options)
+
+    def _request(self, method, url, data=None, **options):
+        data, raw_size = self._encode_body(data, options['headers'])
+
+        if data is not None:
+            options['data'] = data
+
+        resp = self._send_with_retries(method, url, **options)
+
+        # The body of a streamed response hasn't been read yet.
+        self._record_transfer(
+            raw_size,
+            data,
+            None if options.get('stream') else resp
+        )
+
+        return resp
+
+    def _send_with_retries(self, method, url, **options):
+        if self.retry_policy is None:
+            return self._send_within_deadline(method, url, **options)
+
+        start = time.monotonic()
+        attempt = 0
+
+        while True:
+            error = None
+
+            try:
+                resp = self._send_within_deadline(method, url, **options)
+            except (requests.exceptions.RequestException,
+                    ks_exceptions.ClientException) as e:
+                # Keystone sessions raise errors for 4xx and 5xx responses.
+                error = e
+                resp = getattr(e, 'response', None)
+
+            delay = self._get_retry_delay(method, attempt, start, resp, error)
+
+            if delay is None:
+                if error is not None:
+                    raise error
+
+                return resp
+
+            LOG.debug("Retrying HTTP %s %s in %.2f seconds [attempt=%s, "
+                      "reason=%s]", method.upper(), url, delay, attempt + 1,
+                      error or resp.status_code)
+
+            if resp is not None:
+                resp.close()
+
+            self._record_retry(delay)
+
+            time.sleep(delay)
+
+            attempt += 1
+
+    def _get_retry_delay(self, method, attempt, start, resp, error):
+        delay = self.retry_policy.get_retry_delay(
+            method,
+            attempt,
+            time.monotonic() - start,
+            response=resp,
+            error=error
+        )
+
+        remaining = timeouts.get_remaining()
+
+        # No time would be left for the request after the delay.
+        if delay is not None and remaining is not None and \
+                delay >= remaining:
+            return None
+
+        return delay
+
+    def _get_rate_limit_delay(self, method):
+        if self.rate_limiter is None:
+            return 0.0
+
+        remaining = timeouts.get_remaining()
+        delay = self.rate_limiter.reserve(get_operation() or 'unknown',
+                                          method, max_delay=remaining)
+
+        if remaining is not None and delay >= remaining:
+            # No need to wait if the request couldn't be sent in time, the
+            # tokens haven't been taken.
+            timeouts.check_deadline(delay=delay)
+
+        if delay > 0:
+            event = instrumentation.get_current()
+
+            if event is not None:
+                event.wait_time += delay
+
+        return delay
+
+    def _send_within_deadline(self, method, url, **options):
+        delay = self._get_rate_limit_delay(method)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        options['timeout'] = timeouts.get_timeout(self.connect_timeout,
+                                                  self.read_timeout)
+
+        try:
+            return self._send(method, url, **options)
+        except retry.CONNECTION_ERRORS as e:
+            # The request may have timed out because of the deadline.
+            timeouts.check_deadline(e)
+            raise
+
+    def _send(self, method, url, **options):
+        if self.hedging is not None and method == 'get':
+            return self._send_hedged(method, url, **options)
+
+        return self._send_balanced(method, url, **options)
+
+    def _send_hedged(self, method, url, **options):
+        op = get_operation() or 'unknown'
+        delay = self.hedging.start(op)
+        # Endpoints the request has been sent to, a hedged request is sent
+        # to another one if possible.
+        used_endpoints = []
+
+        if not self._acquire_hedging_slot():
+            # All the threads are busy, the request isn't queued behind
+            # others and isn't hedged.
+            return self._send_attempt(op, method, url, used_endpoints,
+                                      options)
+
+        future, started = self._submit_attempt(op, method, url,
+                                               used_endpoints, options)
+
+        # The request may wait for a thread to be started, it's hedged
+        # once it's been sent for the delay.
+        started.wait()
+
+        done, _ = futures.wait([future], timeout=delay)
+
+        if done or not self._acquire_hedging_slot():
+            return future.result()
+
+        if not self.hedging.should_hedge(op):
+            self._hedging_slots.release()
+
+            return future.result()
+
+        LOG.debug("Hedging HTTP %s %s after %.3f seconds", method.upper(),
+                  url, delay)
+
+        hedge, _ = self._submit_attempt(op, method, url, used_endpoints,
+                                        options)
+        attempts = [future, hedge]
+        pending = attempts
+        winner = None
+
+        # The first response wins, an error only if both requests fail.
+        while winner is None and pending:
+            done, pending = futures.wait(
+                pending,
+                return_when=futures.FIRST_COMPLETED
+            )
+
+            winner = next((f for f in done if f.exception() is None), None)
+
+        if winner is None:
+            return future.result()
+
+        if winner is hedge:
+            self.hedging.record_hedge_win(op)
+
+        for attempt in attempts:
+            if attempt is not winner:
+                self._discard_attempt(attempt)
+
+        return winner.result()
+
+    def _acquire_hedging_slot(self):
+        """Reserves a thread of the hedging pool.
+
+        :return: False if all the threads are busy.
+        """
+        with self._hedging_lock:
+            if self._hedging_executor is None:
+                self._hedging_executor = futures.ThreadPoolExecutor(
+                    self.hedging.max_workers,
+                    thread_name_prefix='mistralclient-hedging'
+                )
+                self._hedging_slots = threading.BoundedSemaphore(
+                    self.hedging.max_workers
+                )
+
+        return self._hedging_slots.acquire(blocking=False)
+
+    def _submit_attempt(self, op, method, url, used_endpoints, options):
+        """Sends a request from a reserved thread of the hedging pool.
+
+        :return: Tuple of the future of the response and an event set once
+            the request is being sent.
+        """
+        started = threading.Event()
+
+        def _attempt():
+            started.set()
+
+            try:
+                return self._send_attempt(op, method, url, used_endpoints,
+                                          options)
+            finally:
+                self._hedging_slots.release()
+
+        # Every thread needs its own copy of the context.
+        return (
+            self._hedging_executor.submit(contextvars.copy_context().run,
+                                          _attempt),
+            started
+        )
+
+    def _send_attempt(self, op, method, url, used_endpoints, options):
+        start = time.monotonic()
+
+        resp = self._send_balanced(method, url, used_endpoints, **options)
+
+        self.hedging.record_latency(op, time.monotonic() - start)
+
+        return resp
+
+    @staticmethod
+    def _discard_attempt(attempt):
+        # A request can't be aborted once sent, its response is closed to
+        # release the connection.
+        if attempt.cancel():
+            return
+
+        def _close(f):
+            if f.exception() is None:
+                f.result().close()
+
+        attempt.add_done_callback(_close)
+
+    def _send_balanced(self, method, url, used_endpoints=None, **options):
+        if self.balancer is None:
+            return self._send_to(self.base_url, method, url, **options)
+
+        failed_endpoints = []
+
+        while True:
+            endpoint = self._choose_endpoint(failed_endpoints, used_endpoints)
+            start = time.monotonic()
+
+            try:
+                resp = self._send_to(endpoint, method, url, **options)
+            except Exception as e:
+                failed = self._is_endpoint_failure(error=e)
+
+                self.balancer.record(endpoint, failed=failed)
+
+                if not (failed and self._can_fail_over(method,
+                                                       failed_endpoints,
+                                                       e)):
+                    raise
+
+                self._log_fail_over(method, url, endpoint, e)
+                failed_endpoints.append(endpoint)
+
+                continue
+
+            failed = self._is_endpoint_failure(resp=resp)
+
+            self.balancer.record(endpoint, time.monotonic() - start, failed)
+
+            if not (failed and self._can_fail_over(method,
+                                                   failed_endpoints)):
+                return resp
+
+            self._log_fail_over(method, url, endpoint, resp.status_code)
+            failed_endpoints.append(endpoint)
+
+            resp.close()
+
+    def _choose_endpoint(self, failed_endpoints, used_endpoints=None):
+        endpoint = None
+
+        if used_endpoints:
+            endpoint = self.balancer.choose(
+                exclude=failed_endpoints + used_endpoints
+            )
+
+        if endpoint is None:
+            endpoint = self.balancer.choose(exclude=failed_endpoints)
+
+        if used_endpoints is not None:
+            used_endpoints.append(endpoint)
+
+        return endpoint
+
+    @staticmethod
+    def _is_endpoint_failure(resp=None, error=None):
+        """Tells whether an endpoint failed to handle a request."""
+        if error is not None:
+            if isinstance(error, ks_exceptions.HttpError):
+                # Keystone sessions raise errors for 4xx and 5xx responses.
+                return error.http_status in retry.RETRY_STATUS_CODES
+
+            return isinstance(
+                error,
+                retry.CONNECTION_ERRORS + (circuit_breaker.CircuitOpenError,)
+            )
+
+        return resp.status_code in retry.RETRY_STATUS_CODES
+
+    def _can_fail_over(self, method, failed_endpoints, error=None):
+        if len(failed_endpoints) + 1 >= len(self.balancer.endpoints):
+            return False
+
+        # Requests rejected by the circuit breaker haven't been sent.
+        return (method.upper() in IDEMPOTENT_METHODS or
+                isinstance(error, circuit_breaker.CircuitOpenError))
+
+    @staticmethod
+    def _log_fail_over(method, url, endpoint, reason):
+        LOG.debug("HTTP %s %s failed on %s, sending it to another endpoint "
+                  "[reason=%s]", method.upper(), url, endpoint, reason)
+
+    def _send_to(self, endpoint, method, url, **options):
+        breaker = self.circuit_breaker
+
+        if breaker is None:
+            return self._send_request(endpoint + url, method, **options)
+
+        breaker.before_request(endpoint)
+
+        try:
+            resp = self._send_request(endpoint + url, method, **options)
+        except Exception as e:
+            breaker.record_error(endpoint, e)
+            raise
+
+        breaker.record_response(endpoint, resp.status_code)
+
+        return resp
+
+    def _send_request(self, full_url, method, **options):
+        if self._semaphore is None:
+            return getattr(self.transport, method)(full_url, **options)
+
+        with self._semaphore:
+            return getattr(self.transport, method)(full_url, **options)
+
+    def _encode_body(self, body, headers):
+        """Compresses the request body if it's large enough.
+
+        :return: Tuple of the body to send and its uncompressed size.
+        """
+        if not isinstance(body, (str, bytes)):
+            return body, 0
+
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        raw_size = len(body)
+
+        if (self.compression_threshold is not None and
+                raw_size >= self.compression_threshold):
+            body = gzip.compress(body, compresslevel=self.compression_level)
+
+            headers['Content-Encoding'] = 'gzip'
+
+        return body, raw_size
+
+    @staticmethod
+    def _get_response_sizes(resp):
+        size = len(resp.content)
+
+        try:
+            # Number of bytes read from the network, before decoding.
+            wire_size = resp.raw.tell()
+        except AttributeError:
+            wire_size = size
+
+        return size, wire_size or size
+
+    def _record_transfer(self, request_size, request_body, resp):
+        op = get_operation() or 'unknown'
+
+        if resp is not None:
+            response_size, response_wire_size = self._get_response_sizes(resp)
+        else:
+            response_size = response_wire_size = 0
+        request_wire_size = (
+            len(request_body) if isinstance(request_body, bytes) else 0
+        )
+
+        event = instrumentation.get_current()
+
+        if event is not None:
+            event.request_bytes = request_wire_size
+            event.response_bytes = response_wire_size
+            event.response = resp
+
+        with self._stats_lock:
+            stats = self._transfer_stats.setdefault(
+                op,
+                {
+                    'requests': 0,
+                    'request_bytes': 0,
+                    'request_wire_bytes': 0,
+                    'response_bytes': 0,
+                    'response_wire_bytes': 0
+                }
+            )
+
+            stats['requests'] += 1
+            stats['request_bytes'] += request_size
+            stats['request_wire_bytes'] += request_wire_size
+            stats['response_bytes'] += response_size
+            stats['response_wire_bytes'] += response_wire_size
+
+    def _record_retry(self, delay):
+        op = get_operation() or 'unknown'
+        event = instrumentation.get_current()
+
+        if event is not None:
+            event.retries += 1
+            event.wait_time += delay
+
+        with self._stats_lock:
+            stats = self._retry_stats.setdefault(
+                op,
+                {'retries': 0, 'wait_time': 0.0}
+            )
+
+            stats['retries'] += 1
+            stats['wait_time'] += delay
+
+    def _start_request_event(self, method, url):
+        event = instrumentation.RequestEvent(
+            get_operation() or 'unknown',
+            method.upper(),
+            url
+        )
+
+        return event, instrumentation.set_current(event)
+
+    def _finish_request_event(self, event, token, resp=None, error=None):
+        event.duration = time.monotonic() - event.start
+
+        instrumentation.reset_current(token)
+
+        if error is not None:
+            event.error = error
+            # Keystone sessions raise errors for 4xx and 5xx responses.
+            resp = getattr(error, 'response', None)
+
+            if event.response is None:
+                event.response = resp
+
+        if resp is not None:
+            event.status_code = resp.status_code
+            event.ttfb = self._get_ttfb(resp)
+
+        LOG.debug("HTTP %s %s %s [%.3fs]", event.method, event.url,
+                  event.status_code or event.error, event.duration)
+
+        for hook in self.request_hooks:
+            try:
+                hook(event)
+            except Exception:
+                LOG.exception("Request hook %s failed.", hook)
+
+    @staticmethod
+    def _get_ttfb(resp):
+        # Requests sets the time elapsed until the headers were parsed.
+        elapsed = getattr(resp, 'elapsed', None)
+
+        return None if elapsed is None else elapsed.total_seconds()
+
+    def __setattr__(self, name, value):
+        if name in _HEADERS_TEMPLATE_ATTRS:
+            # Identity or target fields changed, the template needs to be
+            # built again on the next request.
+            self.__dict__['_headers_template'] = None
+
+        super(HTTPClient, self).__setattr__(name, value)
 
     def _get_request_options(self, method, headers):
         headers = self._update_headers(headers)
 
         if method in ['post', 'put']:
-            content_type = headers.get('content-type', 'application/json')
-            headers['content-type'] = content_type
+            headers.setdefault('content-type', 'application/json')
 
-        options = copy.deepcopy(self.ssl_options)
+        options = dict(self.ssl_options)
         options['headers'] = headers
 
         return options
 
-    def _update_headers(self, headers):
-        if not headers:
-            headers = {}
+    def _get_headers_template(self):
+        template = self.__dict__.get('_headers_template')
 
-        if isinstance(self.session, requests.Session):
+        if template is None:
+            template = types.MappingProxyType(self._build_headers_template())
+
+            self.__dict__['_headers_template'] = template
+
+        return template
+
+    def _build_headers_template(self):
+        headers = {}
+
+        # Keystone sessions add the authentication headers themselves.
+        if self.session is None or isinstance(self.session,
+                                              requests.Session):
             if self.auth_token:
                 headers['X-Auth-Token'] = self.auth_token
 
@@ -194,6 +1265,19 @@ class HTTPClient(object):
                 self.target_service_catalog.encode('utf-8')
             )
 
+        return headers
+
+    def _update_headers(self, headers):
+        headers = dict(headers) if headers else {}
+        headers.update(self._get_headers_template())
+
+        if (self.transport is not self.session and
+                self.session is not None and
+                not isinstance(self.session, requests.Session)):
+            # Keystone sessions authenticate the requests they send
+            # themselves, here the token has to be added explicitly.
+            headers.update(self.session.get_auth_headers() or {})
+
         if osprofiler_web:
             # Add headers for osprofiler.
             headers.update(osprofiler_web.get_trace_id_headers())
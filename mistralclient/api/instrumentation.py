@@ -0,0 +1,303 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Per-request instrumentation of the HTTP clients.
+
+Request hooks are callables taking a :class:`RequestEvent`. They are
+passed to the client with the ``request_hooks`` option and called once
+every request has completed, e.g.::
+
+    histograms = instrumentation.LatencyHistograms()
+
+    mistral = client.Client(mistral_url=url, request_hooks=[histograms])
+    mistral.executions.list()
+
+    print(histograms.to_prometheus())
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+import urllib.parse
+
+
+# Upper bounds in seconds of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+# Path segments kept as they are in URL templates, the others are IDs or
+# names of resources.
+_URL_LITERALS = frozenset([
+    'action_executions',
+    'actions',
+    'code_sources',
+    'cron_triggers',
+    'dynamic_actions',
+    'environments',
+    'event_triggers',
+    'executions',
+    'members',
+    'report',
+    'tasks',
+    'validate',
+    'workbooks',
+    'workflows',
+])
+
+# Event of the request being sent in the current context.
+_current = contextvars.ContextVar('mistralclient_request_event',
+                                  default=None)
+
+
+def get_url_template(url):
+    """Returns the URL of a request with the IDs replaced by "{id}".
+
+    For example "/executions/123/tasks?limit=10" gives
+    "/executions/{id}/tasks". The query string is dropped.
+    """
+    path = urllib.parse.urlsplit(url).path
+    segments = path.split('/')
+
+    return '/'.join(
+        s if i < 2 or s in _URL_LITERALS else '{id}'
+        for i, s in enumerate(segments)
+    )
+
+
+class RequestEvent(object):
+    """Measurements of an HTTP request of a resource manager.
+
+    :ivar operation: API operation, e.g. "ExecutionManager.get", or
+        "unknown" for requests made outside of a manager.
+    :ivar method: HTTP method, e.g. "GET".
+    :ivar url: URL of the request relative to the base URL of the API,
+        with the query string.
+    :ivar status_code: Status of the response, None if there is none.
+    :ivar error: Exception the request failed with, or None.
+    :ivar request_bytes: Size of the request body as sent.
+    :ivar response_bytes: Size of the response body as received, 0 for
+        streamed responses.
+    :ivar ttfb: Time in seconds between sending the request and receiving
+        the headers of the response, for the attempt the response comes
+        from. None if unknown.
+    :ivar duration: Total time in seconds, including retries and the time
+        spent waiting for a connection or for the rate limit.
+    :ivar wait_time: Time in seconds spent waiting before retries and for
+        the rate limit.
+    :ivar retries: Number of times the request was sent again.
+    :ivar response: The response if its body has been read, otherwise
+        None.
+    """
+
+    __slots__ = ('operation', 'method', 'url', 'status_code', 'error',
+                 'request_bytes', 'response_bytes', 'ttfb', 'duration',
+                 'wait_time', 'retries', 'response', 'start')
+
+    def __init__(self, operation, method, url):
+        self.operation = operation
+        self.method = method
+        self.url = url
+        self.status_code = None
+        self.error = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.ttfb = None
+        self.duration = None
+        self.wait_time = 0.0
+        self.retries = 0
+        self.response = None
+        self.start = time.monotonic()
+
+    @property
+    def manager(self):
+        """Name of the resource manager, e.g. "ExecutionManager"."""
+        return self.operation.partition('.')[0]
+
+    @property
+    def manager_method(self):
+        """Name of the manager method, e.g. "get"."""
+        return self.operation.partition('.')[2]
+
+    @property
+    def url_template(self):
+        return get_url_template(self.url)
+
+    @property
+    def query_params(self):
+        """Query parameters of the request as a dict of lists."""
+        return urllib.parse.parse_qs(urllib.parse.urlsplit(self.url).query,
+                                     keep_blank_values=True)
+
+    def to_dict(self):
+        return {
+            'operation': self.operation,
+            'method': self.method,
+            'url': self.url,
+            'url_template': self.url_template,
+            'status_code': self.status_code,
+            'error': None if self.error is None else repr(self.error),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'ttfb': self.ttfb,
+            'duration': self.duration,
+            'wait_time': self.wait_time,
+            'retries': self.retries
+        }
+
+    def __repr__(self):
+        return '<RequestEvent %s %s %s %s>' % (
+            self.operation,
+            self.method,
+            self.url,
+            self.status_code
+        )
+
+
+def get_current():
+    """Returns the event of the request being sent in this context."""
+    return _current.get()
+
+
+def set_current(event):
+    return _current.set(event)
+
+
+def reset_current(token):
+    _current.reset(token)
+
+
+class _Histogram(object):
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, buckets, value):
+        self.counts[bisect.bisect_left(buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self, buckets):
+        cumulative = []
+        total = 0
+
+        for le, count in zip(buckets + ('+Inf',), self.counts):
+            total += count
+            cumulative.append((le, total))
+
+        return {'buckets': cumulative, 'sum': self.sum, 'count': self.count}
+
+
+def _escape(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+class LatencyHistograms(object):
+    """Request hook keeping histograms of the request latencies.
+
+    Requests are grouped by operation, HTTP method, URL template and
+    status. Failed requests without a response have the status "error".
+    There is a histogram of the total time of the requests and one of
+    their time to first byte.
+
+    :param buckets: Sorted upper bounds in seconds of the buckets.
+    """
+
+    METRICS = (
+        ('duration', 'mistralclient_request_duration_seconds',
+         'Total time of the Mistral API requests.'),
+        ('ttfb', 'mistralclient_request_ttfb_seconds',
+         'Time to first byte of the Mistral API requests.'),
+    )
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def __call__(self, event):
+        key = (
+            event.operation,
+            event.method,
+            event.url_template,
+            'error' if event.status_code is None else str(event.status_code)
+        )
+
+        with self._lock:
+            series = self._series.get(key)
+
+            if series is None:
+                series = self._series[key] = {
+                    'duration': _Histogram(self.buckets),
+                    'ttfb': _Histogram(self.buckets)
+                }
+
+            series['duration'].observe(self.buckets, event.duration)
+
+            if event.ttfb is not None:
+                series['ttfb'].observe(self.buckets, event.ttfb)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def to_dict(self):
+        """Returns the histograms.
+
+        :return: list of dicts with the labels of the requests (operation,
+            method, url_template, status) and their "duration" and "ttfb"
+            histograms. A histogram has the cumulative counts of the
+            buckets as a list of (upper bound, count) tuples, the last
+            bound being "+Inf", and the sum and count of the values.
+        """
+        with self._lock:
+            return [
+                {
+                    'operation': key[0],
+                    'method': key[1],
+                    'url_template': key[2],
+                    'status': key[3],
+                    'duration': series['duration'].to_dict(self.buckets),
+                    'ttfb': series['ttfb'].to_dict(self.buckets)
+                }
+                for key, series in sorted(self._series.items())
+            ]
+
+    def to_prometheus(self):
+        """Returns the histograms in the Prometheus text format."""
+        series = self.to_dict()
+        lines = []
+
+        for name, metric, doc in self.METRICS:
+            lines.append('# HELP %s %s' % (metric, doc))
+            lines.append('# TYPE %s histogram' % metric)
+
+            for s in series:
+                labels = ','.join(
+                    '%s="%s"' % (label, _escape(s[label]))
+                    for label in ('operation', 'method', 'url_template',
+                                  'status')
+                )
+                hist = s[name]
+
+                for le, count in hist['buckets']:
+                    lines.append('%s_bucket{%s,le="%s"} %d' %
+                                 (metric, labels, le, count))
+
+                lines.append('%s_sum{%s} %r' % (metric, labels, hist['sum']))
+                lines.append('%s_count{%s} %d' %
+                             (metric, labels, hist['count']))
+
+        return '\n'.join(lines) + '\n'
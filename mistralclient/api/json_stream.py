@@ -0,0 +1,281 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import codecs
+import json
+import re
+
+from oslo_serialization import jsonutils
+
+
+_DECODER = json.JSONDecoder()
+
+_SKIP_RE = re.compile(r'[\s,]*')
+_STRUCT_RE = re.compile(r'["{}\[\]]')
+_STRING_RE = re.compile(r'["\\]')
+_PRIMITIVE_END_RE = re.compile(r'[\s,\]}]')
+
+_START = 'start'
+_KEY = 'key'
+_COLON = 'colon'
+_SKIP_VALUE = 'skip_value'
+_ARRAY_START = 'array_start'
+_ITEMS = 'items'
+_DONE = 'done'
+
+
+class JSONArrayParser(object):
+    """Incrementally parses the items of an array within a JSON document.
+
+    The document is fed in chunks as they are received and every item of
+    the array is returned as soon as it is complete, so only one item has
+    to be held in memory at a time, not the whole document.
+
+    :param key: Key of the array in the top level object, or None if the
+        document itself is the array.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._state = _START
+        self._current_key = None
+
+        # Position, nesting depth and "inside a string" flag of the scan
+        # for the end of the current value.
+        self._scan = None
+
+    def feed(self, data):
+        """Adds a chunk of the document.
+
+        :param data: Chunk of the document as bytes or str.
+        :return: List of the array items completed by the chunk.
+        """
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+
+        self._buf += data
+
+        items = []
+
+        while self._step(items):
+            pass
+
+        # Drop the parsed part of the buffer.
+        if self._scan is not None:
+            self._scan[0] -= self._pos
+
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+
+        return items
+
+    def close(self):
+        """Checks that the whole array has been parsed."""
+        items = self.feed(self._decoder.decode(b'', final=True))
+
+        if self._state != _DONE:
+            raise ValueError('Incomplete JSON document.')
+
+        return items
+
+    def _skip(self, chars_re=_SKIP_RE):
+        self._pos = chars_re.match(self._buf, self._pos).end()
+
+        return self._pos < len(self._buf)
+
+    def _expect(self, char):
+        if self._buf[self._pos] != char:
+            raise ValueError(
+                "Expected '%s' at '%s'." %
+                (char, self._buf[self._pos:self._pos + 20])
+            )
+
+        self._pos += 1
+
+    def _step(self, items):
+        state = self._state
+
+        if state == _DONE or not self._skip():
+            return False
+
+        if state == _START:
+            if self.key is None:
+                self._expect('[')
+                self._state = _ITEMS
+            else:
+                self._expect('{')
+                self._state = _KEY
+        elif state == _KEY:
+            if self._buf[self._pos] == '}':
+                raise KeyError(self.key)
+
+            value = self._decode_value()
+
+            if value is None:
+                return False
+
+            self._current_key, self._pos = value
+            self._state = _COLON
+        elif state == _COLON:
+            self._expect(':')
+
+            if self._current_key == self.key:
+                self._state = _ARRAY_START
+            else:
+                self._state = _SKIP_VALUE
+        elif state == _SKIP_VALUE:
+            value = self._decode_value()
+
+            if value is None:
+                return False
+
+            self._pos = value[1]
+            self._state = _KEY
+        elif state == _ARRAY_START:
+            self._expect('[')
+            self._state = _ITEMS
+        elif state == _ITEMS:
+            if self._buf[self._pos] == ']':
+                self._pos += 1
+                self._state = _DONE
+
+                return False
+
+            value = self._decode_value()
+
+            if value is None:
+                return False
+
+            items.append(value[0])
+
+            self._pos = value[1]
+
+        return True
+
+    def _decode_value(self):
+        """Decodes the value starting at the current position.
+
+        :return: Tuple of the value and the index right after it, or None
+            if the buffer doesn't contain the whole value yet.
+        """
+        buf = self._buf
+
+        if self._scan is None:
+            # Most values are complete, let the C decoder try first.
+            try:
+                value, end = _DECODER.raw_decode(buf, self._pos)
+            except ValueError:
+                pass
+            else:
+                if isinstance(value, (dict, list, str)):
+                    return value, end
+
+                # A number is complete only if followed by a delimiter,
+                # otherwise it may continue in the next chunk.
+                if _PRIMITIVE_END_RE.match(buf, end):
+                    return value, end
+
+        # Find where the value ends first so that it is decoded just once
+        # no matter how many chunks it spans.
+        end = self._value_end()
+
+        if end is None:
+            return None
+
+        return jsonutils.loads(buf[self._pos:end]), end
+
+    def _value_end(self):
+        """Returns the end of the value starting at the current position.
+
+        :return: Index right after the value or None if the buffer doesn't
+            contain the whole value yet.
+        """
+        buf = self._buf
+
+        if self._scan is None:
+            if buf[self._pos] not in '{["':
+                m = _PRIMITIVE_END_RE.search(buf, self._pos)
+
+                return m.start() if m else None
+
+            self._scan = [self._pos, 0, False]
+
+        pos, depth, in_string = self._scan
+
+        while True:
+            if in_string:
+                m = _STRING_RE.search(buf, pos)
+
+                if m is None:
+                    pos = len(buf)
+                    break
+
+                if m.group() == '\\':
+                    if m.end() >= len(buf):
+                        # The escaped character hasn't been received yet.
+                        pos = m.start()
+                        break
+
+                    pos = m.end() + 1
+                    continue
+
+                in_string = False
+                pos = m.end()
+
+                if depth == 0:
+                    self._scan = None
+                    return pos
+
+                continue
+
+            m = _STRUCT_RE.search(buf, pos)
+
+            if m is None:
+                pos = len(buf)
+                break
+
+            char = m.group()
+            pos = m.end()
+
+            if char == '"':
+                in_string = True
+            elif char in '{[':
+                depth += 1
+            else:
+                depth -= 1
+
+                if depth == 0:
+                    self._scan = None
+                    return pos
+
+        self._scan = [pos, depth, in_string]
+
+        return None
+
+
+def iter_json_array(chunks, key=None):
+    """Yields the items of a JSON array from a document read in chunks.
+
+    :param chunks: Iterable of the document chunks (bytes or str).
+    :param key: Key of the array in the top level object, or None if the
+        document itself is the array.
+    """
+    parser = JSONArrayParser(key)
+
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+    yield from parser.close()
@@ -0,0 +1,142 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import threading
+import time
+
+
+class _Bucket(object):
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('Rate must be positive: %s' % rate)
+
+        self.rate = float(rate)
+        self.burst = float(burst or max(rate, 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(
+            self.burst,
+            self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def get_delay(self):
+        """Returns the time to wait until the next token is valid."""
+        # Tokens may be borrowed, the requests then wait in turn.
+        return max((1 - self.tokens) / self.rate, 0.0)
+
+
+class RateLimiter(object):
+    """Limits the rate of the requests sent to the API.
+
+    Token buckets hold up to ``burst`` tokens and are refilled with
+    ``rate`` tokens per second. A request takes a token from the global
+    bucket and from the buckets of its HTTP method (e.g. "POST"), resource
+    manager (e.g. "ExecutionManager") and API operation (e.g.
+    "ExecutionManager.create"), if any, and waits until all of them have
+    one. For example, to send at most 50 requests per second and create at
+    most 5 executions per second::
+
+        RateLimiter(rate=50, limits={'ExecutionManager.create': 5})
+
+    A rate limiter can be shared by any number of threads and clients.
+
+    :param rate: Number of requests per second, None for no global limit.
+    :param burst: Number of requests that can be sent at once, the rate
+        by default.
+    :param limits: dict mapping HTTP methods, manager and operation names
+        to a rate or a tuple of a rate and a burst.
+    """
+
+    def __init__(self, rate=None, burst=None, limits=None):
+        self._lock = threading.Lock()
+        self._global = _Bucket(rate, burst) if rate is not None else None
+        self._buckets = {}
+        self._stats = {}
+
+        for key, limit in (limits or {}).items():
+            if not isinstance(limit, (tuple, list)):
+                limit = (limit,)
+
+            # HTTP methods are upper case, manager names are not.
+            if key.lower() in ('get', 'post', 'put', 'delete'):
+                key = key.upper()
+
+            self._buckets[key] = _Bucket(*limit)
+
+    def _get_buckets(self, operation, method):
+        buckets = [
+            self._buckets.get(key)
+            for key in (method.upper(), operation.split('.')[0], operation)
+        ]
+
+        if self._global is not None:
+            buckets.append(self._global)
+
+        return [b for b in buckets if b is not None]
+
+    def reserve(self, operation, method, max_delay=None):
+        """Takes the tokens of a request.
+
+        :param operation: Name of the API operation.
+        :param method: HTTP method of the request.
+        :param max_delay: Time in seconds, no tokens are taken if the
+            request would have to wait as long or longer, e.g. because of
+            a deadline.
+        :return: Time in seconds to wait before sending the request.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            buckets = self._get_buckets(operation, method)
+
+            for b in buckets:
+                b.refill(now)
+
+            delay = max([b.get_delay() for b in buckets], default=0.0)
+
+            if max_delay is not None and delay >= max_delay:
+                return delay
+
+            for b in buckets:
+                b.tokens -= 1
+
+            stats = self._stats.get(operation)
+
+            if stats is None:
+                stats = self._stats[operation] = {
+                    'requests': 0,
+                    'delayed': 0,
+                    'wait_time': 0.0,
+                    'max_wait': 0.0
+                }
+
+            stats['requests'] += 1
+
+            if delay > 0:
+                stats['delayed'] += 1
+                stats['wait_time'] += delay
+                stats['max_wait'] = max(stats['max_wait'], delay)
+
+        return delay
+
+    def get_stats(self):
+        """Returns rate limiting statistics grouped by API operation.
+
+        :return: dict mapping an operation name to the number of requests,
+            of requests that waited, the total and the longest time in
+            seconds they waited.
+        """
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import datetime
+from email import utils as email_utils
+import random
+
+from keystoneauth1 import exceptions as ks_exceptions
+from oslo_utils import importutils
+import requests
+
+httpx = importutils.try_import('httpx')
+
+
+SAFE_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+RETRY_STATUS_CODES = frozenset([502, 503, 504])
+
+# Errors raised before any response has been received.
+CONNECTION_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    ks_exceptions.ConnectionError,
+)
+
+if httpx:
+    CONNECTION_ERRORS += (httpx.TransportError,)
+
+
+def parse_retry_after(value):
+    """Converts the value of a Retry-After header into seconds.
+
+    :param value: Either a number of seconds or an HTTP date.
+    :return: Number of seconds to wait or None if the value is invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email_utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    now = datetime.datetime.now(retry_at.tzinfo)
+
+    return max((retry_at - now).total_seconds(), 0.0)
+
+
+class RetryPolicy(object):
+    """Decides whether a failed request should be sent again.
+
+    The delay before attempt N is ``backoff_factor * 2 ** N`` seconds,
+    capped at ``backoff_max``. With ``jitter`` enabled a random delay
+    between zero and that value is used instead so that many clients
+    don't retry at the same moment. A ``Retry-After`` header sent by the
+    server takes precedence over the computed delay. No retry is made if
+    it would exceed ``total_timeout`` seconds since the first attempt.
+
+    :param max_retries: Maximum number of retries of a single request.
+    :param backoff_factor: Base of the exponential backoff in seconds.
+    :param backoff_max: Maximum delay between two attempts in seconds.
+    :param jitter: Whether to randomize the delay.
+    :param total_timeout: Maximum time in seconds spent on a request
+        including all retries, or None for no limit.
+    :param methods: HTTP methods that may be retried. Only the safe
+        methods are retried by default since other requests may have
+        been processed by the server even if the response got lost.
+    :param status_codes: Response status codes that are retried.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, backoff_max=30.0,
+                 jitter=True, total_timeout=60.0, methods=SAFE_METHODS,
+                 status_codes=RETRY_STATUS_CODES):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.total_timeout = total_timeout
+        self.methods = frozenset(m.upper() for m in methods)
+        self.status_codes = frozenset(status_codes)
+
+    def is_retryable(self, method, response=None, error=None):
+        if method.upper() not in self.methods:
+            return False
+
+        if response is not None:
+            return response.status_code in self.status_codes
+
+        return isinstance(error, CONNECTION_ERRORS)
+
+    def get_backoff(self, attempt):
+        backoff = min(self.backoff_factor * (2 ** attempt), self.backoff_max)
+
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def get_retry_delay(self, method, attempt, elapsed, response=None,
+                        error=None):
+        """Returns the delay before the next attempt.
+
+        :param method: HTTP method of the request.
+        :param attempt: Number of retries made so far.
+        :param elapsed: Seconds elapsed since the first attempt.
+        :param response: Response of the last attempt, if any.
+        :param error: Exception raised by the last attempt, if any.
+        :return: Delay in seconds or None if the request must not be
+            retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if not self.is_retryable(method, response, error):
+            return None
+
+        delay = None
+
+        if response is not None:
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+
+        if delay is None:
+            delay = self.get_backoff(attempt)
+
+        if (self.total_timeout is not None and
+                elapsed + delay > self.total_timeout):
+            return None
+
+        return delay
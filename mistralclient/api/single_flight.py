@@ -0,0 +1,87 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import threading
+
+from mistralclient.api import timeouts
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Runs identical concurrent calls only once.
+
+    A call made while an identical one (same key) is in progress in
+    another thread waits for it and gets its result or exception instead
+    of running again. It waits until the deadline of its caller, if any,
+    and raises DeadlineExceeded when it passes. If the deadline of the
+    call it waits for passes instead, the call is made again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'calls': 0, 'coalesced': 0}
+
+    def call(self, key, func, *args, **kwargs):
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    leader = True
+
+                    self._stats['calls'] += 1
+                else:
+                    leader = False
+
+                    self._stats['coalesced'] += 1
+
+            if leader:
+                break
+
+            if not call.done.wait(timeouts.get_remaining()):
+                timeouts.check_deadline()
+
+            if isinstance(call.error, timeouts.DeadlineExceeded):
+                # The deadline of the first call has passed, not the one
+                # of this call, which is made again.
+                continue
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+    def get_stats(self):
+        """Returns the number of calls run and of calls that shared them."""
+        with self._lock:
+            return dict(self._stats)
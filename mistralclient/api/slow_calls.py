@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import datetime
+import logging
+from logging import handlers
+
+from oslo_serialization import jsonutils
+
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+# Number of bytes of the response body kept in a record.
+DEFAULT_SAMPLE_SIZE = 1024
+
+LOG = logging.getLogger(__name__)
+
+
+class SlowCallLog(object):
+    """Request hook recording the requests slower than a threshold.
+
+    A record is a line of JSON with the operation, the URL template and
+    query parameters of the request, the status, the body sizes, the
+    timing breakdown and the beginning of the response body, e.g.::
+
+        {"timestamp": "2026-10-18T09:12:03.512893+00:00",
+         "operation": "ExecutionManager.list", "method": "GET",
+         "url_template": "/executions",
+         "query": {"limit": ["100"], "task": ["..."]},
+         "status_code": 200, "error": null,
+         "request_bytes": 0, "response_bytes": 482113,
+         "timing": {"duration": 3.2, "ttfb": 3.05, "wait_time": 0.0,
+                    "retries": 0},
+         "response_sample": "{\\"executions\\": [{\\"id\\": ...",
+         "response_truncated": true}
+
+    Records are appended to a file rotated once it reaches ``max_bytes``,
+    the last ``backup_count`` files are kept. Without a file they are
+    logged as warnings.
+
+    :param threshold: Duration in seconds above which a request is slow.
+    :param path: Path of the file, or None.
+    :param max_bytes: Size in bytes the file is rotated at.
+    :param backup_count: Number of rotated files kept.
+    :param sample_size: Number of bytes of the response body recorded.
+    """
+
+    def __init__(self, threshold, path=None, max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT,
+                 sample_size=DEFAULT_SAMPLE_SIZE):
+        self.threshold = threshold
+        self.sample_size = sample_size
+
+        self.handler = None
+
+        if path is not None:
+            # The file is only created once a slow request is recorded.
+            self.handler = handlers.RotatingFileHandler(
+                path,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding='utf-8',
+                delay=True
+            )
+
+    def close(self):
+        if self.handler is not None:
+            self.handler.close()
+
+    def __call__(self, event):
+        if event.duration < self.threshold:
+            return
+
+        line = jsonutils.dumps(self.get_record(event), sort_keys=True)
+
+        if self.handler is None:
+            LOG.warning("Slow request: %s", line)
+        else:
+            self.handler.handle(
+                logging.makeLogRecord({
+                    'name': __name__,
+                    'msg': line,
+                    'levelno': logging.WARNING,
+                    'levelname': 'WARNING'
+                })
+            )
+
+    def get_record(self, event):
+        """Returns the record of a slow request as a dict."""
+        record = {
+            'timestamp': datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat(),
+            'operation': event.operation,
+            'method': event.method,
+            'url_template': event.url_template,
+            'query': event.query_params,
+            'status_code': event.status_code,
+            'error': None if event.error is None else repr(event.error),
+            'request_bytes': event.request_bytes,
+            'response_bytes': event.response_bytes,
+            'timing': {
+                'duration': event.duration,
+                'ttfb': event.ttfb,
+                'wait_time': event.wait_time,
+                'retries': event.retries
+            },
+            'response_sample': None,
+            'response_truncated': False
+        }
+
+        # Streamed responses are not read.
+        if event.response is not None and self.sample_size:
+            content = event.response.content or b''
+
+            record['response_sample'] = content[:self.sample_size].decode(
+                'utf-8',
+                'replace'
+            )
+            record['response_truncated'] = len(content) > self.sample_size
+
+        return record
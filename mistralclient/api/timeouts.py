@@ -0,0 +1,144 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import contextlib
+import contextvars
+import time
+
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+# (connect timeout, read timeout) overriding the defaults of the client.
+_timeout = contextvars.ContextVar('mistralclient_timeout', default=None)
+
+# Time (as returned by time.monotonic()) by which the requests made within
+# a deadline() block must have completed.
+_deadline = contextvars.ContextVar('mistralclient_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the time budget of a deadline() block is exhausted."""
+
+    def __init__(self, budget):
+        super(DeadlineExceeded, self).__init__(
+            'Deadline of %.1f seconds exceeded' % budget
+        )
+
+        self.budget = budget
+
+
+class _Deadline(object):
+    def __init__(self, budget):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def get_remaining(self):
+        return self.expires_at - time.monotonic()
+
+
+@contextlib.contextmanager
+def timeout(connect=None, read=None):
+    """Overrides the timeouts of the requests made within the block.
+
+    For example::
+
+        with timeouts.timeout(read=300):
+            client.executions.list(limit=-1)
+
+    :param connect: Time in seconds to wait for a connection, or None to
+        keep the timeout of the client.
+    :param read: Time in seconds to wait for data from the server, or
+        None to keep the timeout of the client.
+    """
+    token = _timeout.set((connect, read))
+
+    try:
+        yield
+    finally:
+        _timeout.reset(token)
+
+
+@contextlib.contextmanager
+def deadline(budget):
+    """Bounds the time spent on the requests made within the block.
+
+    No request is sent once ``budget`` seconds have elapsed,
+    DeadlineExceeded is raised instead. The timeouts of the requests are
+    shortened to the remaining time. Nested deadlines can only shorten
+    the budget of the outer ones.
+
+    :param budget: Time budget in seconds.
+    """
+    new = _Deadline(budget)
+    current = _deadline.get()
+
+    if current is not None and current.expires_at < new.expires_at:
+        new = current
+
+    token = _deadline.set(new)
+
+    try:
+        yield new
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining():
+    """Returns the time left before the deadline, None if there is none."""
+    current = _deadline.get()
+
+    return None if current is None else current.get_remaining()
+
+
+def get_timeout(connect_timeout, read_timeout):
+    """Returns the timeouts of a request about to be sent.
+
+    :param connect_timeout: Default connect timeout of the client.
+    :param read_timeout: Default read timeout of the client.
+    :return: Tuple of the connect and read timeouts in seconds.
+    :raises DeadlineExceeded: If the deadline has passed.
+    """
+    connect, read = _timeout.get() or (None, None)
+
+    if connect is None:
+        connect = connect_timeout
+
+    if read is None:
+        read = read_timeout
+
+    current = _deadline.get()
+
+    if current is not None:
+        remaining = current.get_remaining()
+
+        if remaining <= 0:
+            raise DeadlineExceeded(current.budget)
+
+        connect = remaining if connect is None else min(connect, remaining)
+        read = remaining if read is None else min(read, remaining)
+
+    return connect, read
+
+
+def check_deadline(error=None, delay=0.0):
+    """Raises DeadlineExceeded if the deadline has passed.
+
+    :param error: Error that made the request fail, e.g. a timeout caused
+        by the deadline.
+    :param delay: Time in seconds to wait before sending a request, the
+        deadline must not pass meanwhile.
+    """
+    current = _deadline.get()
+
+    if current is not None and current.get_remaining() <= delay:
+        raise DeadlineExceeded(current.budget) from error
@@ -0,0 +1,334 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Client-side tracing of the API operations.
+
+Unlike osprofiler, which traces the requests on the server side, the
+spans are recorded by the client and exported to local files, no tracing
+backend is needed. With a tracer set on the client::
+
+    tracer = tracing.Tracer(tracing.JSONFileExporter('/tmp/spans.json'))
+    mistral = client.Client(mistral_url=url, tracer=tracer)
+
+every call of a manager method is a trace. Its spans are the manager
+method, the HTTP requests it made, the decoding of the JSON responses and
+the construction of the resources. :func:`get_breakdown` sums up the
+time spent in each of them.
+
+Resources returned by streamed listings are built after the manager
+method has returned, outside of its span.
+"""
+
+import collections
+import contextlib
+import contextvars
+import random
+import threading
+import time
+
+from oslo_serialization import jsonutils
+
+
+# Kinds of spans.
+CLI = 'cli'
+OPERATION = 'operation'
+HTTP = 'http'
+JSON = 'json'
+RESOURCE = 'resource'
+
+# Span the code running in the current context is part of.
+_current = contextvars.ContextVar('mistralclient_span', default=None)
+
+
+class Span(object):
+    """A timed part of a traced operation.
+
+    :ivar name: Name, e.g. "ExecutionManager.list" or "GET /executions".
+    :ivar kind: One of CLI, OPERATION, HTTP, JSON or RESOURCE.
+    :ivar trace_id: ID of the trace, 32 hexadecimal digits.
+    :ivar span_id: ID of the span, 16 hexadecimal digits.
+    :ivar parent_id: ID of the parent span, None for the root span.
+    :ivar start_time: Time the span started at, in seconds since the
+        epoch.
+    :ivar duration: Duration of the span in seconds.
+    :ivar attributes: dict of details, e.g. the status of an HTTP request.
+    """
+
+    __slots__ = ('name', 'kind', 'trace_id', 'span_id', 'parent_id',
+                 'start_time', 'duration', 'attributes', 'tracer')
+
+    def __init__(self, tracer, name, kind, parent=None, attributes=None):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.span_id = '%016x' % random.getrandbits(64)
+
+        if parent is None:
+            self.trace_id = '%032x' % random.getrandbits(128)
+            self.parent_id = None
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+
+        self.start_time = time.time()
+        self.duration = None
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'duration': self.duration,
+            'attributes': self.attributes
+        }
+
+    def __repr__(self):
+        return '<Span %s %s %s>' % (self.kind, self.name, self.duration)
+
+
+class Tracer(object):
+    """Records the spans of the operations and exports them.
+
+    The spans of a trace are exported together once its root span has
+    ended, the spans ending later, e.g. of hedged requests, are exported
+    on their own. A tracer is also a request hook of the HTTP client, the HTTP
+    requests are recorded from their instrumentation events.
+
+    :param exporter: Object with an export(spans) method, e.g. a
+        JSONFileExporter.
+    """
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+
+        self._lock = threading.Lock()
+        # Spans of the traces whose root span hasn't ended yet.
+        self._pending = {}
+
+    @contextlib.contextmanager
+    def span(self, name, kind=OPERATION, **attributes):
+        """Records the execution of the block as a span.
+
+        The span is a child of the current span, if any.
+        """
+        span = Span(self, name, kind, _current.get(), attributes)
+
+        if span.parent_id is None:
+            with self._lock:
+                self._pending[span.trace_id] = []
+
+        token = _current.set(span)
+        start = time.monotonic()
+
+        try:
+            yield span
+        except Exception as e:
+            span.attributes['error'] = repr(e)
+            raise
+        finally:
+            span.duration = time.monotonic() - start
+
+            _current.reset(token)
+
+            self._finish(span)
+
+    def __call__(self, event):
+        attributes = {
+            'http.method': event.method,
+            'http.url_template': event.url_template,
+            'http.status_code': event.status_code,
+            'http.request_bytes': event.request_bytes,
+            'http.response_bytes': event.response_bytes,
+            'http.ttfb': event.ttfb,
+            'http.retries': event.retries
+        }
+
+        if event.error is not None:
+            attributes['error'] = repr(event.error)
+
+        span = Span(
+            self,
+            '%s %s' % (event.method, event.url_template),
+            HTTP,
+            _current.get(),
+            attributes
+        )
+        span.start_time -= event.duration
+        span.duration = event.duration
+
+        self._finish(span)
+
+    def _finish(self, span):
+        with self._lock:
+            spans = self._pending.get(span.trace_id)
+
+            if spans is None:
+                # The root span has ended or belongs to another tracer.
+                spans = [span]
+            else:
+                spans.append(span)
+
+                if span.parent_id is not None:
+                    return
+
+                del self._pending[span.trace_id]
+
+        self.exporter.export(spans)
+
+
+def get_current_span():
+    """Returns the span of the current context, None if not traced."""
+    return _current.get()
+
+
+def span(name, kind, **attributes):
+    """Records the block as a child of the current span, if any.
+
+    Nothing is recorded if the current context isn't traced.
+    """
+    parent = _current.get()
+
+    if parent is None:
+        return contextlib.nullcontext()
+
+    return parent.tracer.span(name, kind, **attributes)
+
+
+def get_breakdown(spans):
+    """Sums up the duration of the spans of each kind.
+
+    :return: dict mapping a kind to the total duration in seconds of its
+        spans, nested spans of the same kind are counted once.
+    """
+    by_id = {s.span_id: s for s in spans}
+    breakdown = collections.defaultdict(float)
+
+    for s in spans:
+        parent = by_id.get(s.parent_id)
+
+        # Time of nested spans is part of their parent's.
+        while parent is not None and parent.kind != s.kind:
+            parent = by_id.get(parent.parent_id)
+
+        if parent is None:
+            breakdown[s.kind] += s.duration
+
+    return dict(breakdown)
+
+
+class MemoryExporter(object):
+    """Keeps the exported spans in the ``spans`` list."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class _FileExporter(object):
+    def __init__(self, path):
+        self.path = path
+
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        line = jsonutils.dumps(self._format(spans))
+
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line + '\n')
+
+    def _format(self, spans):
+        raise NotImplementedError
+
+
+class JSONFileExporter(_FileExporter):
+    """Appends every trace to a file as a line of JSON.
+
+    The line is a list of the spans of the trace, see Span.to_dict().
+    """
+
+    def _format(self, spans):
+        return [s.to_dict() for s in spans]
+
+
+def _get_otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+
+    if isinstance(value, int):
+        # 64-bit integers are strings in the JSON encoding of OTLP.
+        return {'intValue': str(value)}
+
+    if isinstance(value, float):
+        return {'doubleValue': value}
+
+    return {'stringValue': str(value)}
+
+
+class OTLPFileExporter(_FileExporter):
+    """Appends every trace to a file in the OTLP JSON format.
+
+    Every line is an OTLP ExportTraceServiceRequest, like the ones written
+    by the file exporter of the OpenTelemetry collector, so the file can
+    be replayed into any OTLP backend.
+    """
+
+    SERVICE_NAME = 'python-mistralclient'
+
+    # OTLP span kinds.
+    _INTERNAL = 1
+    _CLIENT = 3
+
+    def _format(self, spans):
+        return {
+            'resourceSpans': [{
+                'resource': {
+                    'attributes': [{
+                        'key': 'service.name',
+                        'value': {'stringValue': self.SERVICE_NAME}
+                    }]
+                },
+                'scopeSpans': [{
+                    'scope': {'name': 'mistralclient'},
+                    'spans': [self._format_span(s) for s in spans]
+                }]
+            }]
+        }
+
+    def _format_span(self, span):
+        start = int(span.start_time * 1e9)
+        attributes = dict(span.attributes, **{'mistralclient.kind': span.kind})
+
+        return {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'parentSpanId': span.parent_id or '',
+            'name': span.name,
+            'kind': self._CLIENT if span.kind == HTTP else self._INTERNAL,
+            'startTimeUnixNano': str(start),
+            'endTimeUnixNano': str(start + int(span.duration * 1e9)),
+            'attributes': [
+                {'key': k, 'value': _get_otlp_value(v)}
+                for k, v in sorted(attributes.items()) if v is not None
+            ],
+            # STATUS_CODE_ERROR or STATUS_CODE_UNSET.
+            'status': {'code': 2 if 'error' in span.attributes else 0}
+        }
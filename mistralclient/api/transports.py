@@ -0,0 +1,206 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Alternative transports HTTPClient can send its requests with.
+
+A transport implements the part of the requests.Session interface used by
+HTTPClient: the get(), post(), put() and delete() methods taking the URL
+and the keyword arguments of requests (data, headers, stream, ...) and
+returning a requests.Response.
+"""
+
+import datetime
+import ssl
+import time
+import urllib
+
+from oslo_utils import importutils
+import requests
+from requests import structures
+
+httpx = importutils.try_import('httpx')
+
+
+class _HTTPXRawResponse(object):
+    """File-like view of an httpx response used as requests' Response.raw."""
+
+    def __init__(self, response):
+        self._response = response
+        self._chunks = None
+
+    def stream(self, chunk_size=None, decode_content=True):
+        yield from self._response.iter_bytes(chunk_size)
+
+    def read(self, amt=None):
+        if self._chunks is None:
+            self._chunks = self._response.iter_bytes(amt)
+
+        return next(self._chunks, b'')
+
+    def tell(self):
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+
+
+class HTTPXTransport(object):
+    """Sends requests with httpx, over HTTP/2 if the server supports it.
+
+    Unlike requests, which sends one request at a time per connection,
+    concurrent requests from several threads are multiplexed over a few
+    HTTP/2 connections. For "https" URLs HTTP/2 is negotiated with the
+    server, for plain "http" URLs ``http1`` has to be set to False to use
+    HTTP/2 without negotiation ("prior knowledge").
+
+    :param http2: Whether to enable HTTP/2.
+    :param http1: Whether to enable HTTP/1.1.
+    :param verify: True, False or path to a CA bundle file.
+    :param cert: Tuple of client certificate and key file paths.
+    :param max_connections: Maximum number of connections.
+    :param keepalive_expiry: Time in seconds after which idle connections
+        are closed.
+    :param client_kwargs: Additional arguments of httpx.Client.
+    """
+
+    def __init__(self, http2=True, http1=True, verify=True, cert=None,
+                 max_connections=None, keepalive_expiry=5.0,
+                 **client_kwargs):
+        if httpx is None:
+            raise RuntimeError(
+                'The HTTP/2 transport requires the "httpx" package.'
+            )
+
+        self.client = httpx.Client(
+            http1=http1,
+            http2=http2,
+            verify=get_ssl_context(verify, cert),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=None,
+            **client_kwargs
+        )
+
+    def close(self):
+        self.client.close()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def request(self, method, url, data=None, headers=None, stream=False,
+                timeout=None, **kwargs):
+        # TLS options (verify, cert) are set when the transport is created.
+        request_kwargs = {'headers': headers}
+
+        if isinstance(data, dict):
+            # Form encoded the same way as by requests, httpx would send
+            # True as "true".
+            data = urllib.parse.urlencode(list(data.items()), doseq=True)
+
+        if data is not None:
+            request_kwargs['content'] = data
+
+        if timeout is not None:
+            request_kwargs['timeout'] = get_httpx_timeout(timeout)
+
+        request = self.client.build_request(method, url, **request_kwargs)
+
+        start = time.monotonic()
+
+        try:
+            response = self.client.send(request, stream=True)
+            elapsed = time.monotonic() - start
+
+            if not stream:
+                try:
+                    response.read()
+                finally:
+                    response.close()
+        except httpx.TimeoutException as e:
+            if isinstance(e, httpx.ConnectTimeout):
+                raise requests.exceptions.ConnectTimeout(e)
+
+            raise requests.exceptions.ReadTimeout(e)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e)
+
+        resp = _to_requests_response(response, stream)
+
+        # Time until the headers were received, as set by requests.
+        resp.elapsed = datetime.timedelta(seconds=elapsed)
+
+        return resp
+
+
+def get_httpx_timeout(timeout):
+    """Converts a requests timeout into an httpx one.
+
+    :param timeout: Number of seconds, tuple of the connect and read
+        timeouts or None for no timeout.
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+
+        # Writing the request is bounded by the read timeout as well.
+        return httpx.Timeout(None, connect=connect, read=read, write=read)
+
+    return httpx.Timeout(timeout)
+
+
+def get_ssl_context(verify, cert=None):
+    """Returns the httpx "verify" argument for requests' verify/cert."""
+    if verify is False:
+        return False
+
+    ctx = ssl.create_default_context(
+        cafile=verify if isinstance(verify, str) else None
+    )
+
+    if cert and cert[0]:
+        ctx.load_cert_chain(*cert)
+
+    return ctx
+
+
+def _to_requests_response(response, stream):
+    resp = requests.Response()
+
+    resp.status_code = response.status_code
+    resp.reason = response.reason_phrase
+    resp.headers = structures.CaseInsensitiveDict(response.headers.items())
+    resp.url = str(response.url)
+    resp.encoding = response.charset_encoding
+    resp.raw = _HTTPXRawResponse(response)
+
+    request = requests.PreparedRequest()
+    request.method = response.request.method
+    request.url = str(response.request.url)
+    request.headers = structures.CaseInsensitiveDict(
+        response.request.headers.items()
+    )
+    resp.request = request
+
+    if not stream:
+        resp._content = response.content
+
+    return resp
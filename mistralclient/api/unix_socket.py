@@ -0,0 +1,112 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""HTTP over Unix domain sockets.
+
+The path of the socket is the percent-encoded host of ``http+unix://``
+URLs, e.g. ``http+unix://%2Frun%2Fmistral%2Fapi.sock/v2``.
+"""
+
+import socket
+import urllib.parse
+
+from urllib3 import connection
+from urllib3 import connectionpool
+from urllib3 import exceptions
+from urllib3 import poolmanager
+
+SCHEME = 'http+unix'
+PREFIX = SCHEME + '://'
+
+# Host header sent with the requests.
+HOST = 'localhost'
+
+
+def is_unix_socket_url(url):
+    return url.startswith(PREFIX)
+
+
+def get_url(socket_path, path='/v2'):
+    """Returns the URL of the API listening on a Unix socket."""
+    return PREFIX + urllib.parse.quote(socket_path, safe='') + path
+
+
+def split_url(url):
+    """Splits an http+unix URL.
+
+    :return: Tuple of the socket path and an equivalent http URL.
+    """
+    parts = urllib.parse.urlsplit(url)
+
+    return (
+        urllib.parse.unquote(parts.netloc),
+        urllib.parse.urlunsplit(('http', HOST) + tuple(parts[2:]))
+    )
+
+
+class UnixHTTPConnection(connection.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        self.socket_path = kwargs.pop('socket_path')
+
+        super(UnixHTTPConnection, self).__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        # Otherwise the default timeout of the sockets is used.
+        if self.timeout is None or isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+
+        try:
+            sock.connect(self.socket_path)
+        except socket.timeout as e:
+            sock.close()
+
+            raise exceptions.ConnectTimeoutError(
+                self,
+                'Connection to %s timed out' % self.socket_path
+            ) from e
+        except OSError as e:
+            sock.close()
+
+            raise exceptions.NewConnectionError(
+                self,
+                'Failed to connect to %s: %s' % (self.socket_path, e)
+            ) from e
+
+        return sock
+
+
+class UnixHTTPConnectionPool(connectionpool.HTTPConnectionPool):
+    scheme = SCHEME
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, host, port=None, **kwargs):
+        # Like for http URLs, the TLS options don't apply.
+        for keyword in poolmanager.SSL_KEYWORDS:
+            kwargs.pop(keyword, None)
+
+        super(UnixHTTPConnectionPool, self).__init__(HOST, **kwargs)
+
+        self.conn_kw['socket_path'] = urllib.parse.unquote(host)
+
+
+def register(pool_manager):
+    """Makes a urllib3 pool manager handle http+unix URLs."""
+    pool_manager.pool_classes_by_scheme = dict(
+        pool_manager.pool_classes_by_scheme,
+        **{SCHEME: UnixHTTPConnectionPool}
+    )
+    pool_manager.key_fn_by_scheme = dict(
+        pool_manager.key_fn_by_scheme,
+        **{SCHEME: pool_manager.key_fn_by_scheme['http']}
+    )
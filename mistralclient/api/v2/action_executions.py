@@ -64,7 +64,7 @@ class ActionExecutionManager(base.ResourceManager):
         return self._update('/action_executions/%s' % id, data)
 
     def list(self, task_execution_id=None, limit=None, marker='', fields=None,
-             sort_keys='', sort_dirs='', **filters):
+             sort_keys='', sort_dirs='', stream=False, **filters):
         url = '/action_executions'
 
         if task_execution_id:
@@ -81,7 +81,11 @@ class ActionExecutionManager(base.ResourceManager):
             filters=filters
         )
 
-        return self._list(url % query_string, response_key='action_executions')
+        return self._list(
+            url % query_string,
+            response_key='action_executions',
+            stream=stream
+        )
 
     def get(self, id):
         self._ensure_not_empty(id=id)
@@ -91,4 +95,4 @@ class ActionExecutionManager(base.ResourceManager):
     def delete(self, id):
         self._ensure_not_empty(id=id)
 
-        self._delete('/action_executions/%s' % id)
+        return self._delete('/action_executions/%s' % id)
@@ -22,6 +22,8 @@ class Action(base.Resource):
 
 class ActionManager(base.ResourceManager):
     resource_class = Action
+    conditional_get = True
+    cacheable = True
 
     def create(self, definition, scope='private', namespace=''):
         self._ensure_not_empty(definition=definition)
@@ -93,7 +95,7 @@ class ActionManager(base.ResourceManager):
     def delete(self, identifier, namespace=''):
         self._ensure_not_empty(identifier=identifier)
 
-        self._delete('/actions/%s/%s' % (identifier, namespace))
+        return self._delete('/actions/%s/%s' % (identifier, namespace))
 
     def validate(self, definition):
         self._ensure_not_empty(definition=definition)
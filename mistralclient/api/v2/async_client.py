@@ -0,0 +1,60 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from mistralclient.api import async_base
+from mistralclient.api import async_httpclient
+from mistralclient.api.v2 import client
+
+
+class AsyncClient(client.Client):
+    """Mistral client for asyncio applications.
+
+    Takes the same arguments as Client, plus ``max_concurrency`` which
+    limits the number of requests in flight. All manager methods are
+    coroutines::
+
+        async with AsyncClient(mistral_url=url) as mistral:
+            execution = await mistral.executions.get(id)
+
+    Authentication is done synchronously when the client is created. The
+    client has to be closed with ``async with`` or ``await close()``,
+    concurrent calls are made with ``asyncio.gather()`` instead of map().
+    """
+
+    MANAGERS = {
+        name: async_base.make_async_manager(cls)
+        for name, cls in client.Client.MANAGERS.items()
+    }
+
+    @staticmethod
+    def _create_http_client(base_url, **kwargs):
+        return async_httpclient.AsyncHTTPClient(base_url, **kwargs)
+
+    def __enter__(self):
+        raise TypeError('Use "async with" with the asyncio client.')
+
+    def __exit__(self, *exc_info):
+        # Not reached, __enter__() raises.
+        pass
+
+    async def close(self):
+        await self.http_client.close()
+
+    def map(self, func, items, max_workers=None):
+        raise TypeError('The asyncio client has no map(), use '
+                        'asyncio.gather() to make concurrent calls.')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
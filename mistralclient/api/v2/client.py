@@ -13,11 +13,15 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from concurrent import futures
+import contextvars
 import copy
+import threading
 
 from oslo_utils import importutils
 
 from mistralclient.api import httpclient
+from mistralclient.api import timeouts
 from mistralclient.api.v2 import action_executions
 from mistralclient.api.v2 import actions
 from mistralclient.api.v2 import code_sources
@@ -37,8 +41,18 @@ osprofiler_profiler = importutils.try_import("osprofiler.profiler")
 
 _DEFAULT_MISTRAL_URL = "http://localhost:8989/v2"
 
+# Size of the thread pool of map() if max_concurrency is not set.
+DEFAULT_MAX_WORKERS = 10
+
 
 class Client(object):
+    """Mistral v2 API client.
+
+    A client, including its session, can be shared by any number of
+    threads, it authenticates only once. The ``max_concurrency`` option
+    limits the number of requests sent at the same time, see
+    :class:`mistralclient.api.httpclient.HTTPClient`.
+    """
 
     MANAGERS = {
         'workbooks': workbooks.WorkbookManager,
@@ -60,11 +74,17 @@ class Client(object):
         # objects might have mutexes that can't be deep-copied.
         session = kwargs.pop('session', None)
         enforce_raw_definitions = kwargs.pop('enforce_raw_definitions', False)
+        object_options = {
+            k: kwargs.pop(k) for k in httpclient.OBJECT_OPTIONS if k in kwargs
+        }
         req = copy.deepcopy(kwargs)
         mistral_url = req.get('mistral_url')
         profile = req.get('profile')
 
-        if mistral_url and not isinstance(mistral_url, str):
+        if isinstance(mistral_url, (list, tuple)):
+            if not all(isinstance(url, str) for url in mistral_url):
+                raise RuntimeError('Mistral urls should be strings.')
+        elif mistral_url and not isinstance(mistral_url, str):
             raise RuntimeError('Mistral url should be a string.')
 
         # If auth url was provided then we perform an authentication, otherwise
@@ -90,8 +110,163 @@ class Client(object):
         if profile:
             osprofiler_profiler.init(profile)
 
-        http_client = httpclient.HTTPClient(mistral_url, session=session,
-                                            **req)
+        http_client = self._create_http_client(
+            mistral_url,
+            session=session,
+            **dict(req, **object_options)
+        )
+        self.http_client = http_client
+
         # Create all resource managers.
         for name, cls in self.MANAGERS.items():
             setattr(self, name, cls(http_client, enforce_raw_definitions))
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shuts down the thread pool of map()."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(
+                    self.http_client.max_concurrency or DEFAULT_MAX_WORKERS,
+                    thread_name_prefix='mistralclient'
+                )
+
+            return self._executor
+
+    def map(self, func, items, max_workers=None):
+        """Calls a function for each item in the client's thread pool.
+
+        For example, to get many executions in parallel::
+
+            execs = client.map(client.executions.get, ids, max_workers=8)
+
+        The pool is shared by all map() calls of the client, it has
+        ``max_concurrency`` threads, or 10 if the option is not set. func
+        must not call map() itself.
+
+        :param func: Function taking an item.
+        :param items: Iterable of the items.
+        :param max_workers: Maximum number of items processed at the same
+            time by this call, limited by the size of the pool.
+        :return: List of the results in the order of the items. If a call
+            raised an exception, the first one is raised once all calls
+            have completed.
+        """
+        executor = self._get_executor()
+        slots = threading.Semaphore(max_workers) if max_workers else None
+
+        def _call(item):
+            try:
+                return func(item)
+            finally:
+                if slots is not None:
+                    slots.release()
+
+        fs = []
+
+        for item in items:
+            if slots is not None:
+                slots.acquire()
+
+            # Context variables, e.g. the current operation, are passed on
+            # to the pool threads.
+            fs.append(executor.submit(contextvars.copy_context().run,
+                                      _call, item))
+
+        futures.wait(fs)
+
+        return [f.result() for f in fs]
+
+    @staticmethod
+    def _create_http_client(base_url, **kwargs):
+        return httpclient.HTTPClient(base_url, **kwargs)
+
+    @staticmethod
+    def timeout(connect=None, read=None):
+        """Overrides the timeouts of the requests made within the block.
+
+        See :func:`mistralclient.api.timeouts.timeout`.
+        """
+        return timeouts.timeout(connect, read)
+
+    @staticmethod
+    def deadline(budget):
+        """Bounds the time spent on the requests made within the block.
+
+        For example, to list all executions within a minute::
+
+            with client.deadline(60):
+                execs = client.executions.list(limit=-1)
+
+        See :func:`mistralclient.api.timeouts.deadline`.
+        """
+        return timeouts.deadline(budget)
+
+    def get_pool_stats(self):
+        """Returns statistics of the HTTP connection pool.
+
+        See :meth:`mistralclient.api.httpclient.HTTPClient.get_pool_stats`.
+        """
+        return self.http_client.get_pool_stats()
+
+    def get_retry_stats(self):
+        """Returns retry statistics grouped by API operation.
+
+        See :meth:`mistralclient.api.httpclient.HTTPClient.get_retry_stats`.
+        """
+        return self.http_client.get_retry_stats()
+
+    def get_coalescing_stats(self):
+        """Returns statistics of the coalescing of identical GET requests.
+
+        See
+        :meth:`mistralclient.api.httpclient.HTTPClient.get_coalescing_stats`.
+        """
+        return self.http_client.get_coalescing_stats()
+
+    def get_hedging_stats(self):
+        """Returns hedging statistics grouped by API operation.
+
+        See :meth:`mistralclient.api.hedging.HedgingPolicy.get_stats`.
+        """
+        return self.http_client.get_hedging_stats()
+
+    def get_rate_limit_stats(self):
+        """Returns rate limiting statistics grouped by API operation.
+
+        See :meth:`mistralclient.api.rate_limit.RateLimiter.get_stats`.
+        """
+        return self.http_client.get_rate_limit_stats()
+
+    def get_cache_stats(self):
+        """Returns response cache statistics, None if there is no cache.
+
+        See :meth:`mistralclient.api.cache.ResponseCache.get_stats`.
+        """
+        if self.http_client.cache is None:
+            return None
+
+        return self.http_client.cache.get_stats()
+
+    def get_endpoint_stats(self):
+        """Returns request statistics of each API endpoint.
+
+        See :meth:`mistralclient.api.balancer.EndpointBalancer.get_stats`.
+        None if there is only one endpoint.
+        """
+        return self.http_client.get_endpoint_stats()
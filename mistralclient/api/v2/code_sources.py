@@ -21,6 +21,9 @@ class CodeSource(base.Resource):
 
 class CodeSourceManager(base.ResourceManager):
     resource_class = CodeSource
+    conditional_get = True
+    cacheable = True
+    cache_invalidates = ('DynamicActionManager',)
 
     def create(self, name, content, namespace='', scope='private'):
         self._ensure_not_empty(name=name, content=content)
@@ -84,4 +87,4 @@ class CodeSourceManager(base.ResourceManager):
         if namespace:
             url = url + '?namespace=%s' % namespace
 
-        self._delete(url)
+        return self._delete(url)
@@ -75,4 +75,4 @@ class CronTriggerManager(base.ResourceManager):
     def delete(self, name):
         self._ensure_not_empty(name=name)
 
-        self._delete('/cron_triggers/%s' % name)
+        return self._delete('/cron_triggers/%s' % name)
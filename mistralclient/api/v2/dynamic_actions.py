@@ -23,6 +23,7 @@ class DynamicAction(base.Resource):
 
 class DynamicActionManager(base.ResourceManager):
     resource_class = DynamicAction
+    cacheable = True
 
     def get(self, identifier, namespace=''):
         self._ensure_not_empty(identifier=identifier)
@@ -100,6 +101,6 @@ class DynamicActionManager(base.ResourceManager):
     def delete(self, identifier, namespace=''):
         self._ensure_not_empty(identifier=identifier)
 
-        self._delete(
+        return self._delete(
             '/dynamic_actions/%s?namespace=%s' % (identifier, namespace)
         )
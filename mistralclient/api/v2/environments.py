@@ -22,21 +22,19 @@ from mistralclient import utils
 class Environment(base.Resource):
     resource_name = 'Environment'
 
-    def _set_attributes(self):
-        """Override loading of the "variables" attribute from text to dict."""
-        for k, v in self._data.items():
-            if k == 'variables' and isinstance(v, str):
-                v = jsonutils.loads(v)
+    @property
+    def variables(self):
+        """The variables as a dict, decoded on first access."""
+        return self.get_decoded('variables')
 
-            try:
-                setattr(self, k, v)
-            except AttributeError:
-                # In this case we already defined the attribute on the class
-                pass
+    @variables.setter
+    def variables(self, value):
+        self._data['variables'] = value
 
 
 class EnvironmentManager(base.ResourceManager):
     resource_class = Environment
+    cacheable = True
 
     def create(self, **kwargs):
         # Check to see if the file name or URI is being passed in. If so,
@@ -92,4 +90,4 @@ class EnvironmentManager(base.ResourceManager):
     def delete(self, name):
         self._ensure_not_empty(name=name)
 
-        self._delete('/environments/%s' % name)
+        return self._delete('/environments/%s' % name)
@@ -69,4 +69,4 @@ class EventTriggerManager(base.ResourceManager):
     def delete(self, id):
         self._ensure_not_empty(id=id)
 
-        self._delete('/event_triggers/%s' % id)
+        return self._delete('/event_triggers/%s' % id)
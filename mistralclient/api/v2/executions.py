@@ -75,7 +75,7 @@ class ExecutionManager(base.ResourceManager):
         return self._update('/executions/%s' % id, data)
 
     def list(self, task=None, marker='', limit=None, sort_keys='',
-             sort_dirs='', fields='', **filters):
+             sort_dirs='', fields='', stream=False, **filters):
         if task:
             filters['task_execution_id'] = task
 
@@ -95,6 +95,7 @@ class ExecutionManager(base.ResourceManager):
         return self._list(
             '/executions%s' % query_string,
             response_key='executions',
+            stream=stream
         )
 
     def get(self, id):
@@ -121,7 +122,7 @@ class ExecutionManager(base.ResourceManager):
 
         query_string = self._build_query_params(filters=query_params)
 
-        self._delete('/executions/%s%s' % (id, query_string))
+        return self._delete('/executions/%s%s' % (id, query_string))
 
     def get_report(self, id, errors_only=True, max_depth=None,
                    statistics_only=False):
@@ -140,8 +141,6 @@ class ExecutionManager(base.ResourceManager):
 
         query_string = self._build_query_params(filters=query_params)
 
-        resp = self.http_client.get(
+        return self._get_json(
             '/executions/%s/report%s' % (id, query_string)
         )
-
-        return resp.json()
@@ -73,4 +73,4 @@ class MemberManager(base.ResourceManager):
 
         url = '/%ss/%s/members/%s' % (resource_type, resource_id, member_id)
 
-        self._delete(url)
+        return self._delete(url)
@@ -27,7 +27,8 @@ class TaskManager(base.ResourceManager):
     resource_class = Task
 
     def list(self, workflow_execution_id=None, marker='', limit=None,
-             sort_keys='', sort_dirs='', fields=None, **filters):
+             sort_keys='', sort_dirs='', fields=None, stream=False,
+             **filters):
         url = '/tasks'
 
         if workflow_execution_id:
@@ -44,7 +45,11 @@ class TaskManager(base.ResourceManager):
             filters=filters
         )
 
-        return self._list(url % query_string, response_key='tasks')
+        return self._list(
+            url % query_string,
+            response_key='tasks',
+            stream=stream
+        )
 
     def get(self, id):
         self._ensure_not_empty(id=id)
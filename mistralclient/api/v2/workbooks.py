@@ -22,6 +22,9 @@ class Workbook(base.Resource):
 
 class WorkbookManager(base.ResourceManager):
     resource_class = Workbook
+    conditional_get = True
+    cacheable = True
+    cache_invalidates = ('WorkflowManager', 'ActionManager')
 
     def _get_workbooks_url(self, resource=None, namespace=None, scope=None):
         url = '/workbooks'
@@ -92,7 +95,7 @@ class WorkbookManager(base.ResourceManager):
     def delete(self, name, namespace=''):
         self._ensure_not_empty(name=name)
 
-        self._delete(self._get_workbooks_url(name, namespace))
+        return self._delete(self._get_workbooks_url(name, namespace))
 
     def validate(self, definition):
         self._ensure_not_empty(definition=definition)
@@ -22,6 +22,8 @@ class Workflow(base.Resource):
 
 class WorkflowManager(base.ResourceManager):
     resource_class = Workflow
+    conditional_get = True
+    cacheable = True
 
     def create(self, definition, namespace='', scope='private'):
         self._ensure_not_empty(definition=definition)
@@ -98,7 +100,7 @@ class WorkflowManager(base.ResourceManager):
         if namespace:
             path = path + '?namespace=%s' % namespace
 
-        self._delete(path)
+        return self._delete(path)
 
     def validate(self, definition):
         self._ensure_not_empty(definition=definition)
@@ -17,8 +17,6 @@
 
 import logging
 
-from oslo_serialization import jsonutils
-
 from osc_lib.command import command
 
 from mistralclient.commands.v2 import base
@@ -278,13 +276,8 @@ class GetOutput(command.Command):
     def take_action(self, parsed_args):
         mistral_client = self.app.client_manager.workflow_engine
 
-        output = mistral_client.action_executions.get(parsed_args.id).output
-
-        try:
-            output = jsonutils.loads(output)
-            output = jsonutils.dumps(output, indent=4) + "\n"
-        except Exception:
-            LOG.debug("Task result is not JSON.")
+        action_ex = mistral_client.action_executions.get(parsed_args.id)
+        output = base.get_json_str(action_ex, 'output')
 
         self.app.stdout.write(output or "\n")
 
@@ -305,13 +298,8 @@ class GetInput(command.Command):
     def take_action(self, parsed_args):
         mistral_client = self.app.client_manager.workflow_engine
 
-        result = mistral_client.action_executions.get(parsed_args.id).input
-
-        try:
-            result = jsonutils.loads(result)
-            result = jsonutils.dumps(result, indent=4) + "\n"
-        except Exception:
-            LOG.debug("Task result is not JSON.")
+        action_ex = mistral_client.action_executions.get(parsed_args.id)
+        result = base.get_json_str(action_ex, 'input')
 
         self.app.stdout.write(result or "\n")
 
@@ -16,11 +16,14 @@
 
 import abc
 import datetime
+import logging
 import textwrap
 
 from osc_lib.command import command
+from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 
+LOG = logging.getLogger(__name__)
 
 DEFAULT_LIMIT = 100
 
@@ -194,6 +197,24 @@ def get_filters(parsed_args):
     return filters
 
 
+def get_json_str(resource, field):
+    """Returns a JSON field of a resource indented for printing.
+
+    The field is returned as is if it's empty or isn't JSON.
+    """
+    value = getattr(resource, field, None)
+
+    if not value:
+        return value
+
+    try:
+        return jsonutils.dumps(resource.get_decoded(field), indent=4) + "\n"
+    except ValueError:
+        LOG.debug("%s of %s is not JSON.", field, resource.resource_name)
+
+        return value
+
+
 def get_duration_str(start_dt_str, end_dt_str):
     """Builds a human friendly duration string.
 
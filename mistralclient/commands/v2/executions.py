@@ -20,8 +20,6 @@
 import logging
 import os.path
 
-from oslo_serialization import jsonutils
-
 from osc_lib.command import command
 
 from cliff.lister import Lister as cliff_lister
@@ -307,13 +305,8 @@ class GetInput(command.Command):
     def take_action(self, parsed_args):
         mistral_client = self.app.client_manager.workflow_engine
 
-        ex_input = mistral_client.executions.get(parsed_args.id).input
-
-        try:
-            ex_input = jsonutils.loads(ex_input)
-            ex_input = jsonutils.dumps(ex_input, indent=4) + "\n"
-        except Exception:
-            LOG.debug("Execution input is not JSON.")
+        execution = mistral_client.executions.get(parsed_args.id)
+        ex_input = base.get_json_str(execution, 'input')
 
         self.app.stdout.write(ex_input or "\n")
 
@@ -331,13 +324,8 @@ class GetOutput(command.Command):
     def take_action(self, parsed_args):
         mistral_client = self.app.client_manager.workflow_engine
 
-        output = mistral_client.executions.get(parsed_args.id).output
-
-        try:
-            output = jsonutils.loads(output)
-            output = jsonutils.dumps(output, indent=4) + "\n"
-        except Exception:
-            LOG.debug("Execution output is not JSON.")
+        execution = mistral_client.executions.get(parsed_args.id)
+        output = base.get_json_str(execution, 'output')
 
         self.app.stdout.write(output or "\n")
 
@@ -519,14 +507,7 @@ class GetPublished(command.Command):
     def take_action(self, parsed_args):
         mistral_client = self.app.client_manager.workflow_engine
         res = mistral_client.executions.get(parsed_args.id)
-        published = res.published_global \
-            if hasattr(res, 'published_global') else None
-
-        try:
-            published = jsonutils.loads(published)
-            published = jsonutils.dumps(published, indent=4) + "\n"
-        except Exception:
-            LOG.debug("Task result is not JSON.")
+        published = base.get_json_str(res, 'published_global')
 
         self.app.stdout.write(published or "\n")
 
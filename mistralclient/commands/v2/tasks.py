@@ -18,9 +18,8 @@
 import logging
 import os.path
 
-from oslo_serialization import jsonutils
-
 from osc_lib.command import command
+from oslo_serialization import jsonutils
 
 from mistralclient.commands.v2 import base
 from mistralclient.commands.v2 import executions
@@ -131,13 +130,8 @@ class GetResult(command.Command):
 
     def take_action(self, parsed_args):
         mistral_client = self.app.client_manager.workflow_engine
-        result = mistral_client.tasks.get(parsed_args.id).result
-
-        try:
-            result = jsonutils.loads(result)
-            result = jsonutils.dumps(result, indent=4) + "\n"
-        except Exception:
-            LOG.debug("Task result is not JSON.")
+        task = mistral_client.tasks.get(parsed_args.id)
+        result = base.get_json_str(task, 'result')
 
         self.app.stdout.write(result or "\n")
 
@@ -157,8 +151,7 @@ class GetPublished(command.Command):
         mistral_client = self.app.client_manager.workflow_engine
         res = mistral_client.tasks.get(parsed_args.id)
         published = res.published
-        published_glob = res.published_global \
-            if hasattr(res, 'published_global') else None
+        published_glob = getattr(res, 'published_global', None)
 
         try:
             published = jsonutils.loads(published)
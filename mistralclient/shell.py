@@ -25,7 +25,9 @@ from cliff import app
 from cliff import commandmanager
 from osc_lib.command import command
 
+from mistralclient.api import cassettes
 from mistralclient.api import client
+from mistralclient.api import tracing
 from mistralclient.auth import auth_types
 import mistralclient.commands.v2.action_executions
 import mistralclient.commands.v2.actions
@@ -127,6 +129,9 @@ class MistralShell(app.App):
             command_manager=commandmanager.CommandManager('mistral.cli'),
         )
 
+        self.tracer = None
+        self.recorder = None
+
         # Set v2 commands by default
         self._set_shell_commands(self._get_commands_v2())
 
@@ -394,6 +399,86 @@ class MistralShell(app.App):
                  '(Env: MISTRALCLIENT_INSECURE)'
         )
 
+        parser.add_argument(
+            '--connect-timeout',
+            action='store',
+            dest='connect_timeout',
+            type=float,
+            default=env('MISTRALCLIENT_CONNECT_TIMEOUT') or None,
+            help='Time in seconds to wait for a connection to the Mistral '
+                 'API (Env: MISTRALCLIENT_CONNECT_TIMEOUT)'
+        )
+
+        parser.add_argument(
+            '--read-timeout',
+            action='store',
+            dest='read_timeout',
+            type=float,
+            default=env('MISTRALCLIENT_READ_TIMEOUT') or None,
+            help='Time in seconds to wait for data from the Mistral API '
+                 '(Env: MISTRALCLIENT_READ_TIMEOUT)'
+        )
+
+        parser.add_argument(
+            '--slow-call-threshold',
+            action='store',
+            dest='slow_call_threshold',
+            type=float,
+            default=env('MISTRALCLIENT_SLOW_CALL_THRESHOLD') or None,
+            help='Time in seconds above which requests to the Mistral API '
+                 'are recorded as slow (Env: '
+                 'MISTRALCLIENT_SLOW_CALL_THRESHOLD)'
+        )
+
+        parser.add_argument(
+            '--slow-call-log',
+            action='store',
+            dest='slow_call_log',
+            default=env('MISTRALCLIENT_SLOW_CALL_LOG') or None,
+            help='File the slow requests are recorded in, they are logged '
+                 'as warnings otherwise (Env: MISTRALCLIENT_SLOW_CALL_LOG)'
+        )
+
+        parser.add_argument(
+            '--record-file',
+            action='store',
+            dest='record_file',
+            default=env('MISTRALCLIENT_RECORD_FILE') or None,
+            help='File the requests to the Mistral API and their responses '
+                 'are recorded to, without the tokens '
+                 '(Env: MISTRALCLIENT_RECORD_FILE)'
+        )
+
+        parser.add_argument(
+            '--replay-file',
+            action='store',
+            dest='replay_file',
+            default=env('MISTRALCLIENT_REPLAY_FILE') or None,
+            help='File with recorded responses the requests are answered '
+                 'with instead of the Mistral API '
+                 '(Env: MISTRALCLIENT_REPLAY_FILE)'
+        )
+
+        parser.add_argument(
+            '--trace-file',
+            action='store',
+            dest='trace_file',
+            default=env('MISTRALCLIENT_TRACE_FILE') or None,
+            help='File the spans of the command, its API calls, JSON '
+                 'decoding and resource construction are appended to '
+                 '(Env: MISTRALCLIENT_TRACE_FILE)'
+        )
+
+        parser.add_argument(
+            '--trace-format',
+            action='store',
+            dest='trace_format',
+            choices=['json', 'otlp'],
+            default=env('MISTRALCLIENT_TRACE_FORMAT') or 'json',
+            help='Format of the trace file, "json" or "otlp" for the OTLP '
+                 'JSON encoding (Env: MISTRALCLIENT_TRACE_FORMAT)'
+        )
+
         parser.add_argument(
             '--auth-type',
             action='store',
@@ -635,6 +720,32 @@ class MistralShell(app.App):
             'target_user_domain_id': self.options.target_user_domain_id
         }
 
+        # The defaults of the client are used unless set.
+        for option in ('connect_timeout', 'read_timeout',
+                       'slow_call_threshold', 'slow_call_log'):
+            if getattr(self.options, option) is not None:
+                kwargs[option] = getattr(self.options, option)
+
+        if self.options.record_file:
+            self.recorder = cassettes.RecordingTransport(
+                self.options.record_file
+            )
+            kwargs['transport'] = self.recorder
+        elif self.options.replay_file:
+            kwargs['transport'] = cassettes.ReplayTransport(
+                self.options.replay_file
+            )
+
+        if self.options.trace_file:
+            exporter_cls = (
+                tracing.OTLPFileExporter if self.options.trace_format == 'otlp'
+                else tracing.JSONFileExporter
+            )
+            self.tracer = tracing.Tracer(
+                exporter_cls(self.options.trace_file)
+            )
+            kwargs['tracer'] = self.tracer
+
         return client.client(
             mistral_url=self.options.mistral_url,
             username=self.options.username,
@@ -664,6 +775,18 @@ class MistralShell(app.App):
             **kwargs
         )
 
+    def run_subcommand(self, argv):
+        if self.tracer is None or not argv:
+            return super(MistralShell, self).run_subcommand(argv)
+
+        # The API calls of the command are traced as its children.
+        with self.tracer.span(argv[0], tracing.CLI):
+            return super(MistralShell, self).run_subcommand(argv)
+
+    def clean_up(self, cmd, result, err):
+        if self.recorder is not None:
+            self.recorder.save()
+
     def _set_shell_commands(self, cmds_dict):
         for k, v in cmds_dict.items():
             self.command_manager.add_command(k, v)
@@ -0,0 +1,1028 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Fake Mistral v2 API for benchmarks and integration tests.
+
+FakeMistralAPI is a WSGI application implementing the executions, tasks,
+action executions, workflows, environments and cron triggers endpoints,
+with marker/limit/sort/fields pagination and filters. It can be used
+in-process, without sockets::
+
+    api = fake_api.FakeMistralAPI()
+    api.seed('executions', 1000000)
+
+    mistral = client.Client(mistral_url=fake_api.BASE_URL,
+                            transport=fake_api.WSGITransport(api))
+
+or served on a local port::
+
+    with api.serve() as url:
+        mistral = client.Client(mistral_url=url)
+
+Seeded records are generated from their index when requested, so
+millions of them take no memory. Latency and errors can be injected
+with the ``latency``, ``error_rate`` and ``error_status`` attributes.
+
+Lists sorted by creation time or ID are read in index order and only the
+records of the page are generated. Sorting by other keys generates all
+the records matching the filters looked up by parent (e.g. the tasks of
+an execution), it's rejected with a 400 error above
+``max_sorted_records`` records. Other filters are matched against the
+records in order until the page is full.
+
+It can also be run as a standalone server::
+
+    python -m mistralclient.tests.fake_api --port 8989 \\
+        --seed executions=1000000 --seed tasks=5000000
+"""
+
+import argparse
+import bisect
+import contextlib
+import datetime
+import gzip
+import io
+import random
+import socketserver
+import threading
+import time
+import urllib.parse
+from wsgiref import simple_server
+
+from oslo_serialization import jsonutils
+import requests
+from requests import structures
+import yaml
+
+BASE_URL = 'http://fake-mistral/v2'
+
+RESOURCES = ('executions', 'tasks', 'action_executions', 'workflows',
+             'environments', 'cron_triggers')
+
+# Number of tasks of every seeded execution and of action executions of
+# every seeded task.
+TASKS_PER_EXECUTION = 5
+ACTIONS_PER_TASK = 2
+
+PROJECT_ID = '<default-project>'
+
+STATES = ('SUCCESS', 'RUNNING', 'ERROR', 'PAUSED')
+
+# Query parameters that are not filters.
+_NON_FILTERS = frozenset([
+    'marker', 'limit', 'sort_keys', 'sort_dirs', 'fields', 'all_projects',
+    'include_output', 'scope', 'force', 'reset', 'max_depth',
+    'errors_only'
+])
+
+# Sort keys in the order of the record indexes.
+_INDEX_ORDERED_KEYS = ('created_at', 'id')
+
+# Number of records above which sorting by other keys is rejected, all
+# the records have to be generated to sort them.
+MAX_SORTED_RECORDS = 100000
+
+_EPOCH = datetime.datetime(2026, 1, 1)
+
+_STATUS_REASONS = {
+    200: 'OK', 201: 'Created', 204: 'No Content', 400: 'Bad Request',
+    404: 'Not Found', 409: 'Conflict', 500: 'Internal Server Error',
+    502: 'Bad Gateway', 503: 'Service Unavailable', 504: 'Gateway Timeout'
+}
+
+
+def make_id(index):
+    """Returns the ID of the record with the given index."""
+    return '00000000-0000-4000-8000-%012x' % index
+
+
+def _get_index(record_id):
+    if not record_id.startswith('00000000-0000-4000-8000-'):
+        return None
+
+    try:
+        return int(record_id[24:], 16)
+    except ValueError:
+        return None
+
+
+def make_time(index):
+    return (_EPOCH + datetime.timedelta(seconds=index)).strftime(
+        '%Y-%m-%d %H:%M:%S'
+    )
+
+
+def _execution(i):
+    return {
+        'workflow_name': 'wf_%d' % (i % 100),
+        'workflow_id': make_id(i % 100),
+        'workflow_namespace': '',
+        'description': '',
+        'state': STATES[i % len(STATES)],
+        'state_info': None,
+        'input': jsonutils.dumps({'index': i}),
+        'output': jsonutils.dumps({'result': 'result_%d' % i}),
+        'params': jsonutils.dumps({'namespace': ''}),
+        'task_execution_id': None,
+        'root_execution_id': None,
+        'tags': []
+    }
+
+
+def _task(i):
+    return {
+        'name': 'task_%d' % (i % TASKS_PER_EXECUTION),
+        'type': 'ACTION',
+        'workflow_name': 'wf_%d' % (i // TASKS_PER_EXECUTION % 100),
+        'workflow_namespace': '',
+        'workflow_id': make_id(i // TASKS_PER_EXECUTION % 100),
+        'workflow_execution_id': make_id(i // TASKS_PER_EXECUTION),
+        'state': STATES[i % len(STATES)],
+        'state_info': None,
+        'result': jsonutils.dumps({'index': i}),
+        'published': jsonutils.dumps({'var_%d' % i: i}),
+        'published_global': '{}',
+        'processed': True,
+        'reset': False,
+        'env': '{}'
+    }
+
+
+def _action_execution(i):
+    return {
+        'name': 'std.echo',
+        'workflow_name': 'wf_%d' % (i // ACTIONS_PER_TASK //
+                                    TASKS_PER_EXECUTION % 100),
+        'workflow_namespace': '',
+        'task_name': 'task_%d' % (i // ACTIONS_PER_TASK %
+                                  TASKS_PER_EXECUTION),
+        'task_execution_id': make_id(i // ACTIONS_PER_TASK),
+        'state': STATES[i % len(STATES)],
+        'state_info': None,
+        'accepted': True,
+        'input': jsonutils.dumps({'output': i}),
+        'output': jsonutils.dumps({'result': i}),
+        'params': '{}',
+        'description': ''
+    }
+
+
+def _workflow(i):
+    name = 'wf_%d' % i
+
+    return {
+        'name': name,
+        'namespace': '',
+        'input': '',
+        'definition': _get_definition(name),
+        'tags': [],
+        'scope': 'private',
+        'interface': {'input': [], 'output': []}
+    }
+
+
+def _environment(i):
+    return {
+        'name': 'env_%d' % i,
+        'description': '',
+        'variables': jsonutils.dumps({'index': i}),
+        'scope': 'private'
+    }
+
+
+def _cron_trigger(i):
+    return {
+        'name': 'trigger_%d' % i,
+        'workflow_name': 'wf_%d' % (i % 100),
+        'workflow_id': make_id(i % 100),
+        'workflow_input': '{}',
+        'workflow_params': '{}',
+        'pattern': '* * * * *',
+        'scope': 'private',
+        'next_execution_time': make_time(i + 60),
+        'remaining_executions': None,
+        'first_execution_time': None
+    }
+
+
+def _get_definition(name):
+    return ('---\nversion: "2.0"\n\n%s:\n  tasks:\n    task1:\n'
+            '      action: std.noop\n' % name)
+
+
+def _get_tasks(execution_id):
+    index = _get_index(execution_id)
+
+    if index is None:
+        return ()
+
+    return range(index * TASKS_PER_EXECUTION,
+                 (index + 1) * TASKS_PER_EXECUTION)
+
+
+def _get_action_executions(task_id):
+    index = _get_index(task_id)
+
+    if index is None:
+        return ()
+
+    return range(index * ACTIONS_PER_TASK, (index + 1) * ACTIONS_PER_TASK)
+
+
+FACTORIES = {
+    'executions': _execution,
+    'tasks': _task,
+    'action_executions': _action_execution,
+    'workflows': _workflow,
+    'environments': _environment,
+    'cron_triggers': _cron_trigger
+}
+
+# Functions giving the indexes of the seeded records having a value, for
+# the filters by parent of the sub-resource listings.
+LOOKUPS = {
+    'executions': {
+        'root_execution_id': lambda value: (),
+        'task_execution_id': lambda value: ()
+    },
+    'tasks': {'workflow_execution_id': _get_tasks},
+    'action_executions': {'task_execution_id': _get_action_executions}
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super(HTTPError, self).__init__(message)
+
+        self.status = status
+
+
+class Collection(object):
+    """Records of a resource ordered by creation.
+
+    Records have an index, their ID and creation time are derived from it.
+    Seeded records are generated by a factory from their index. Only the
+    records created or changed through the API are stored.
+    """
+
+    def __init__(self, name_key=None):
+        self.name_key = name_key
+
+        self._lock = threading.RLock()
+        self._ranges = []
+        self._records = {}
+        self._deleted = set()
+        self._size = 0
+        self._names = None
+
+    def __len__(self):
+        return self._size - len(self._deleted)
+
+    def seed(self, count, factory, lookups=None):
+        """Adds records generated by a factory.
+
+        :param lookups: dict mapping a key of the records to a function
+            returning the indexes of the records having a value, relative
+            to the first seeded record.
+        """
+        with self._lock:
+            self._ranges.append(
+                (self._size, self._size + count, factory, lookups or {})
+            )
+            self._size += count
+            self._names = None
+
+    def add(self, record):
+        with self._lock:
+            index = self._size
+            self._size += 1
+            self._records[index] = self._complete(index, dict(record))
+
+            if self._names is not None:
+                self._names[self._records[index][self.name_key]] = index
+
+            return self._records[index]
+
+    def update(self, index, values):
+        with self._lock:
+            record = dict(self.get(index))
+            record.update(values)
+            record['updated_at'] = make_time(self._size)
+            self._records[index] = record
+
+            return record
+
+    def delete(self, index):
+        with self._lock:
+            if self.name_key and self._names is not None:
+                self._names.pop(self.get(index)[self.name_key], None)
+
+            self._deleted.add(index)
+            self._records.pop(index, None)
+
+    def get(self, index):
+        if index is None or index in self._deleted or \
+                not 0 <= index < self._size:
+            return None
+
+        record = self._records.get(index)
+
+        if record is not None:
+            return record
+
+        for start, end, factory, _ in self._ranges:
+            if start <= index < end:
+                return self._complete(index, factory(index))
+
+        return None
+
+    def find(self, identifier):
+        """Returns the index of a record given its ID or name."""
+        index = _get_index(identifier)
+
+        if index is not None and self.get(index) is not None:
+            return index
+
+        if not self.name_key:
+            return None
+
+        with self._lock:
+            if self._names is None:
+                # Built on the first lookup by name.
+                self._names = {
+                    self.get(i)[self.name_key]: i
+                    for i in self.iter_indexes()
+                }
+
+            return self._names.get(identifier)
+
+    def iter_indexes(self, reverse=False, start=None, candidates=None):
+        """Iterates over the indexes of the records in creation order.
+
+        :param start: Index the iteration starts after.
+        :param candidates: Sorted list of indexes to iterate over, all the
+            records by default.
+        """
+        if candidates is not None:
+            if start is not None:
+                pos = bisect.bisect_left(candidates, start)
+                candidates = (
+                    candidates[:pos] if reverse
+                    else candidates[pos + (pos < len(candidates) and
+                                           candidates[pos] == start):]
+                )
+
+            indexes = reversed(candidates) if reverse else candidates
+        elif start is not None:
+            indexes = (
+                range(start - 1, -1, -1) if reverse
+                else range(start + 1, self._size)
+            )
+        else:
+            indexes = range(self._size)
+
+            if reverse:
+                indexes = reversed(indexes)
+
+        for i in indexes:
+            if i not in self._deleted:
+                yield i
+
+    def get_candidates(self, filters):
+        """Returns the indexes of the records that may match the filters.
+
+        :return: Sorted list of indexes or None if the records can't be
+            looked up by any of the filters.
+        """
+        for key, value in filters:
+            if ':' in value:
+                continue
+
+            if not all(key in lookups for _, _, _, lookups in self._ranges):
+                continue
+
+            indexes = set(self._records)
+
+            for start, end, _, lookups in self._ranges:
+                indexes.update(
+                    start + i for i in lookups[key](value)
+                    if 0 <= i < end - start
+                )
+
+            return sorted(indexes)
+
+        return None
+
+    @staticmethod
+    def _complete(index, record):
+        record['id'] = make_id(index)
+        record.setdefault('created_at', make_time(index))
+        record.setdefault('updated_at', None)
+        record.setdefault('project_id', PROJECT_ID)
+
+        return record
+
+
+def _match(value, condition):
+    value = '' if value is None else str(value)
+
+    op, sep, operand = condition.partition(':')
+
+    if not sep or op not in ('eq', 'neq', 'in', 'nin', 'has'):
+        return value == condition
+
+    if op == 'eq':
+        return value == operand
+
+    if op == 'neq':
+        return value != operand
+
+    if op == 'in':
+        return value in operand.split(',')
+
+    if op == 'nin':
+        return value not in operand.split(',')
+
+    return operand in value
+
+
+class FakeMistralAPI(object):
+    """WSGI application faking the Mistral v2 API.
+
+    :param latency: Time in seconds every request takes.
+    :param error_rate: Fraction of the requests failing with
+        ``error_status``.
+    :param error_status: Status of the injected errors.
+    :param random_seed: Seed of the random injection of errors.
+    :param max_sorted_records: Number of records above which sorting by
+        keys other than the creation time and ID is rejected.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, error_status=503,
+                 random_seed=None, max_sorted_records=MAX_SORTED_RECORDS):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_sorted_records = max_sorted_records
+
+        self.collections = {
+            'executions': Collection(),
+            'tasks': Collection(),
+            'action_executions': Collection(),
+            'workflows': Collection(name_key='name'),
+            'environments': Collection(name_key='name'),
+            'cron_triggers': Collection(name_key='name')
+        }
+
+        self.requests = 0
+
+        self._random = random.Random(random_seed)
+        self._lock = threading.Lock()
+        self._failures = []
+
+    def seed(self, resource, count, factory=None):
+        """Adds synthetic records.
+
+        :param resource: Name of the resource, e.g. "executions".
+        :param count: Number of records.
+        :param factory: Function returning the record with a given index,
+            the ID and creation time are set from the index. By default
+            the records of the tasks and action executions belong to the
+            seeded executions and tasks.
+        """
+        if factory is None:
+            self.collections[resource].seed(count, FACTORIES[resource],
+                                            LOOKUPS.get(resource))
+        else:
+            self.collections[resource].seed(count, factory)
+
+    def add(self, resource, records):
+        """Stores records, e.g. produced by a generator.
+
+        :return: The stored records, with their IDs.
+        """
+        return [self.collections[resource].add(r) for r in records]
+
+    def fail_next(self, count=1, status=503):
+        """Makes the next requests fail with the given status."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    @contextlib.contextmanager
+    def serve(self, host='127.0.0.1', port=0):
+        """Serves the API on a local port.
+
+        :return: Context manager giving the base URL of the API.
+        """
+        server = simple_server.make_server(
+            host,
+            port,
+            self,
+            server_class=_ThreadingWSGIServer,
+            handler_class=_QuietHandler
+        )
+
+        thread = threading.Thread(
+            target=server.serve_forever,
+            kwargs={'poll_interval': 0.01}
+        )
+        thread.daemon = True
+        thread.start()
+
+        try:
+            yield 'http://%s:%s/v2' % (host, server.server_port)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def __call__(self, environ, start_response):
+        try:
+            status, body = self._handle(environ)
+        except HTTPError as e:
+            status, body = e.status, {'faultstring': str(e),
+                                      'debuginfo': None}
+
+        headers = []
+
+        if body is None:
+            content = b''
+        else:
+            content = jsonutils.dump_as_bytes(body)
+            headers.append(('Content-Type', 'application/json'))
+
+        headers.append(('Content-Length', str(len(content))))
+
+        start_response(
+            '%d %s' % (status, _STATUS_REASONS.get(status, 'Unknown')),
+            headers
+        )
+
+        return [content]
+
+    def _handle(self, environ):
+        with self._lock:
+            self.requests += 1
+            failure = self._failures.pop(0) if self._failures else None
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if failure is None and self.error_rate and \
+                self._random.random() < self.error_rate:
+            failure = self.error_status
+
+        if failure is not None:
+            raise HTTPError(failure, 'Injected error')
+
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '')
+
+        if path.startswith('/v2/') or path == '/v2':
+            path = path[3:]
+
+        segments = [urllib.parse.unquote(s) for s in path.split('/') if s]
+        query = urllib.parse.parse_qs(environ.get('QUERY_STRING', ''),
+                                      keep_blank_values=True)
+        query = {k: v[-1] for k, v in query.items()}
+
+        if not segments or segments[0] not in self.collections:
+            raise HTTPError(404, 'Unknown path: %s' % path)
+
+        resource = segments[0]
+        body = _read_body(environ)
+
+        if len(segments) == 1:
+            if method == 'GET':
+                return 200, self._list(resource, query)
+
+            if method == 'POST':
+                return 201, self._create(resource, body, query)
+
+            if method == 'PUT' and resource in ('workflows', 'environments'):
+                return 200, self._update_by_body(resource, body, query)
+
+        elif len(segments) == 2:
+            if segments[1] == 'validate' and method == 'POST':
+                return 200, self._validate(body)
+
+            index = self._find(resource, segments[1])
+
+            if method == 'GET':
+                return 200, self.collections[resource].get(index)
+
+            if method == 'PUT':
+                return 200, self._update(resource, index, body)
+
+            if method == 'DELETE':
+                self.collections[resource].delete(index)
+
+                return 204, None
+
+        elif len(segments) == 3 and method == 'GET':
+            # Sub-resources, e.g. /executions/<id>/tasks.
+            self._find(resource, segments[1])
+
+            parent_key = {
+                ('executions', 'tasks'): 'workflow_execution_id',
+                ('executions', 'executions'): 'root_execution_id',
+                ('tasks', 'action_executions'): 'task_execution_id',
+                ('tasks', 'executions'): 'task_execution_id'
+            }.get((resource, segments[2]))
+
+            if parent_key is not None:
+                return 200, self._list(
+                    segments[2],
+                    dict(query, **{parent_key: segments[1]})
+                )
+
+        raise HTTPError(404, 'Unknown path: %s %s' % (method, path))
+
+    def _find(self, resource, identifier):
+        index = self.collections[resource].find(identifier)
+
+        if index is None:
+            raise HTTPError(
+                404,
+                '%s not found [id=%s]' % (resource[:-1], identifier)
+            )
+
+        return index
+
+    def _list(self, resource, query):
+        collection = self.collections[resource]
+
+        try:
+            limit = int(query.get('limit') or 0)
+        except ValueError:
+            raise HTTPError(400, 'Invalid limit: %s' % query['limit'])
+
+        sort_keys = [k for k in query.get('sort_keys', '').split(',') if k]
+        sort_dirs = [d for d in query.get('sort_dirs', '').split(',') if d]
+
+        if not sort_keys:
+            sort_keys = ['created_at']
+
+        sort_dirs += [sort_dirs[-1] if sort_dirs else 'asc'] * (
+            len(sort_keys) - len(sort_dirs)
+        )
+
+        if any(d not in ('asc', 'desc') for d in sort_dirs):
+            raise HTTPError(400, 'Invalid sort direction: %s' % sort_dirs)
+
+        filters = [
+            (k, v) for k, v in query.items()
+            if k not in _NON_FILTERS and not (k == 'namespace' and v == '')
+        ]
+        marker = query.get('marker')
+        marker_index = (
+            self._find(resource, marker) if marker else None
+        )
+
+        candidates = collection.get_candidates(filters)
+
+        if sort_keys[0] not in _INDEX_ORDERED_KEYS:
+            count = len(collection if candidates is None else candidates)
+
+            if count > self.max_sorted_records:
+                raise HTTPError(
+                    400,
+                    'Sorting more than %d %s by %s is not supported.' %
+                    (self.max_sorted_records, resource, sort_keys[0])
+                )
+
+        records = self._iter_sorted(collection, sort_keys, sort_dirs,
+                                    marker_index, candidates)
+        page = []
+
+        for record in records:
+            if all(_match(record.get(k), v) for k, v in filters):
+                page.append(record)
+
+                if limit and len(page) >= limit:
+                    break
+
+        fields = [f for f in query.get('fields', '').split(',') if f]
+
+        if fields:
+            page = [
+                {k: r.get(k) for k in ['id'] + fields} for r in page
+            ]
+
+        result = {resource: page}
+
+        if limit and len(page) == limit:
+            result['next'] = '%s/%s?%s' % (
+                BASE_URL,
+                resource,
+                urllib.parse.urlencode(dict(query, marker=page[-1]['id']))
+            )
+
+        return result
+
+    @staticmethod
+    def _iter_sorted(collection, sort_keys, sort_dirs, marker_index,
+                     candidates):
+        if sort_keys[0] in _INDEX_ORDERED_KEYS:
+            # Index order, records are generated as they are needed.
+            for i in collection.iter_indexes(sort_dirs[0] == 'desc',
+                                             marker_index, candidates):
+                yield collection.get(i)
+
+            return
+
+        records = [
+            collection.get(i)
+            for i in collection.iter_indexes(candidates=candidates)
+        ]
+
+        # Sorts by the last key first, Python's sort is stable.
+        for key, direction in reversed(list(zip(sort_keys, sort_dirs))):
+            records.sort(
+                key=lambda r: (r.get(key) is not None, r.get(key) or ''),
+                reverse=direction == 'desc'
+            )
+
+        start = 0
+
+        if marker_index is not None:
+            marker_id = make_id(marker_index)
+            start = next(
+                (i + 1 for i, r in enumerate(records)
+                 if r['id'] == marker_id),
+                len(records)
+            )
+
+        yield from records[start:]
+
+    def _create(self, resource, body, query):
+        collection = self.collections[resource]
+
+        if resource == 'workflows':
+            names = _parse_workflow_names(body)
+
+            for name in names:
+                self._check_unique(resource, name)
+
+            workflows = [
+                collection.add(dict(
+                    _workflow(0),
+                    name=name,
+                    definition=body.decode('utf-8'),
+                    namespace=query.get('namespace', ''),
+                    scope=query.get('scope') or 'private'
+                ))
+                for name in names
+            ]
+
+            return {'workflows': workflows}
+
+        data = _load_json(body)
+
+        if resource == 'executions':
+            data.setdefault('state', 'RUNNING')
+            data.setdefault('output', '{}')
+            data.setdefault('input', '{}')
+        elif resource == 'action_executions':
+            data.setdefault('state', 'SUCCESS')
+            data.setdefault('output', jsonutils.dumps({'result': None}))
+        elif collection.name_key:
+            self._check_unique(resource, data.get(collection.name_key, ''))
+
+        return collection.add(data)
+
+    def _check_unique(self, resource, name):
+        if self.collections[resource].find(name) is not None:
+            raise HTTPError(
+                409,
+                'Duplicate entry for %s: %s' % (resource[:-1], name)
+            )
+
+    def _update(self, resource, index, body):
+        if resource == 'workflows':
+            return self.collections[resource].update(
+                index,
+                {'definition': body.decode('utf-8')}
+            )
+
+        data = _load_json(body)
+
+        if resource == 'executions' and isinstance(data.get('params'), dict):
+            data['params'] = jsonutils.dumps(data['params'])
+
+        return self.collections[resource].update(index, data)
+
+    def _update_by_body(self, resource, body, query):
+        collection = self.collections[resource]
+
+        if resource == 'workflows':
+            return {
+                'workflows': [
+                    collection.update(self._find(resource, name), {
+                        'definition': body.decode('utf-8')
+                    })
+                    for name in _parse_workflow_names(body)
+                ]
+            }
+
+        data = _load_json(body)
+
+        return collection.update(self._find(resource, data.get('name', '')),
+                                 data)
+
+    @staticmethod
+    def _validate(body):
+        try:
+            _parse_workflow_names(body)
+        except HTTPError as e:
+            return {'valid': False, 'error': str(e)}
+
+        return {'valid': True}
+
+
+def _read_body(environ):
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+
+    body = environ['wsgi.input'].read(length) if length else b''
+
+    if environ.get('HTTP_CONTENT_ENCODING') == 'gzip':
+        body = gzip.decompress(body)
+
+    return body
+
+
+def _load_json(body):
+    try:
+        data = jsonutils.loads(body or b'{}')
+    except ValueError as e:
+        raise HTTPError(400, 'Invalid JSON: %s' % e)
+
+    if not isinstance(data, dict):
+        raise HTTPError(400, 'A JSON object is expected.')
+
+    return data
+
+
+def _parse_workflow_names(body):
+    try:
+        spec = yaml.safe_load(body)
+    except yaml.YAMLError as e:
+        raise HTTPError(400, 'Invalid workflow definition: %s' % e)
+
+    if not isinstance(spec, dict):
+        raise HTTPError(400, 'Invalid workflow definition.')
+
+    names = [k for k in spec if k != 'version']
+
+    if not names:
+        raise HTTPError(400, 'No workflow in the definition.')
+
+    return names
+
+
+class _ThreadingWSGIServer(socketserver.ThreadingMixIn,
+                           simple_server.WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(simple_server.WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class WSGITransport(object):
+    """HTTPClient transport calling a WSGI application in-process.
+
+    :param app: The WSGI application, e.g. a FakeMistralAPI.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        start = time.monotonic()
+        parts = urllib.parse.urlsplit(url)
+        headers = structures.CaseInsensitiveDict(headers or {})
+
+        if isinstance(data, dict):
+            data = urllib.parse.urlencode(list(data.items()), doseq=True)
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        data = data or b''
+
+        environ = {
+            'REQUEST_METHOD': method.upper(),
+            'SCRIPT_NAME': '',
+            'PATH_INFO': urllib.parse.unquote(parts.path),
+            'QUERY_STRING': parts.query,
+            'SERVER_NAME': parts.hostname or 'localhost',
+            'SERVER_PORT': str(parts.port or 80),
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'CONTENT_LENGTH': str(len(data)),
+            'CONTENT_TYPE': headers.get('Content-Type', ''),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': parts.scheme or 'http',
+            'wsgi.input': io.BytesIO(data),
+            'wsgi.errors': io.StringIO(),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False
+        }
+
+        for k, v in headers.items():
+            environ['HTTP_' + k.upper().replace('-', '_')] = v
+
+        response_start = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            response_start['status'] = status
+            response_start['headers'] = response_headers
+
+        content = b''.join(self.app(environ, start_response))
+
+        status, _, reason = response_start['status'].partition(' ')
+
+        resp = requests.Response()
+        resp.status_code = int(status)
+        resp.reason = reason
+        resp.headers = structures.CaseInsensitiveDict(
+            response_start['headers']
+        )
+        resp.url = url
+        resp.encoding = 'utf-8'
+        resp._content = content
+        resp._content_consumed = True
+        resp.elapsed = datetime.timedelta(seconds=time.monotonic() - start)
+
+        request = requests.PreparedRequest()
+        request.method = method.upper()
+        request.url = url
+        request.headers = headers
+        resp.request = request
+
+        return resp
+
+    def close(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8989)
+    parser.add_argument('--seed', action='append', default=[],
+                        metavar='RESOURCE=COUNT',
+                        help='Number of synthetic records of a resource.')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-sorted-records', type=int,
+                        default=MAX_SORTED_RECORDS,
+                        help='Number of records above which sorting by '
+                             'keys other than created_at and id is '
+                             'rejected.')
+
+    args = parser.parse_args()
+
+    api = FakeMistralAPI(latency=args.latency, error_rate=args.error_rate,
+                         max_sorted_records=args.max_sorted_records)
+
+    for seed in args.seed:
+        resource, _, count = seed.partition('=')
+        api.seed(resource, int(count))
+
+    with api.serve(args.host, args.port) as url:
+        print('Serving the fake Mistral API at %s' % url)
+
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -12,11 +12,17 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from http import server
+import socketserver
+import threading
 from unittest import mock
 
+import fixtures
 from oslotest import base
 from requests_mock.contrib import fixture
 
+from mistralclient.api import unix_socket
+
 
 class BaseClientTest(base.BaseTestCase):
     _client = None
@@ -40,3 +46,47 @@ class BaseCommandTest(base.BaseTestCase):
         parsed_args = cmd.get_parser(prog_name).parse_args(app_args)
 
         return cmd.take_action(parsed_args)
+
+
+class HTTPServer(fixtures.Fixture):
+    """Serves the requests with a handler class in a thread.
+
+    The server listens on a local port, or on a Unix socket if
+    ``socket_path`` is given. The handlers can reach it as self.server,
+    e.g. to count the requests.
+
+    :ivar server: The server.
+    :ivar url: URL of the v2 API on the server.
+    """
+
+    def __init__(self, handler_class, socket_path=None):
+        super(HTTPServer, self).__init__()
+
+        self.handler_class = handler_class
+        self.socket_path = socket_path
+
+    def _setUp(self):
+        if self.socket_path is None:
+            self.server = server.ThreadingHTTPServer(
+                ('127.0.0.1', 0),
+                self.handler_class
+            )
+            self.url = 'http://127.0.0.1:%s/v2' % self.server.server_port
+        else:
+            self.server = socketserver.ThreadingUnixStreamServer(
+                self.socket_path,
+                self.handler_class
+            )
+            self.url = unix_socket.get_url(self.socket_path)
+
+        self.server.daemon_threads = True
+
+        thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={'poll_interval': 0.01}
+        )
+        thread.daemon = True
+        thread.start()
+
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
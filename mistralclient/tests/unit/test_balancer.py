@@ -0,0 +1,233 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from unittest import mock
+
+from oslotest import base
+import requests
+from requests_mock.contrib import fixture
+
+from mistralclient.api import balancer
+from mistralclient.api import circuit_breaker
+from mistralclient.api import httpclient
+
+ENDPOINT_1 = 'http://mistral-1:8989/v2'
+ENDPOINT_2 = 'http://mistral-2:8989/v2'
+ENDPOINT_3 = 'http://mistral-3:8989/v2'
+ENDPOINTS = [ENDPOINT_1, ENDPOINT_2, ENDPOINT_3]
+
+
+class EndpointBalancerTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(EndpointBalancerTest, self).setUp()
+
+        patcher = mock.patch('time.monotonic', return_value=100)
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _send(self, lb, latency=None, failed=False):
+        url = lb.choose()
+
+        lb.record(url, latency, failed)
+
+        return url
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, balancer.EndpointBalancer, [])
+        self.assertRaises(
+            ValueError,
+            balancer.EndpointBalancer,
+            ENDPOINTS,
+            strategy='random'
+        )
+
+    def test_round_robin(self):
+        lb = balancer.EndpointBalancer(ENDPOINTS)
+
+        self.assertEqual(
+            ENDPOINTS + ENDPOINTS,
+            [self._send(lb) for _ in range(6)]
+        )
+        self.assertEqual(ENDPOINT_2, lb.choose(exclude=[ENDPOINT_1]))
+        self.assertIsNone(lb.choose(exclude=ENDPOINTS))
+
+    def test_least_latency(self):
+        lb = balancer.EndpointBalancer(
+            ENDPOINTS,
+            strategy=balancer.LEAST_LATENCY
+        )
+
+        lb.record(lb.choose(), 0.3)
+        lb.record(lb.choose(), 0.1)
+        lb.record(lb.choose(), 0.15)
+
+        self.assertEqual(ENDPOINT_2, self._send(lb, 0.1))
+
+        # The requests in progress are taken into account.
+        self.assertEqual(ENDPOINT_2, lb.choose())
+        self.assertEqual(ENDPOINT_3, lb.choose())
+
+        stats = lb.get_stats()
+
+        self.assertEqual(0.1, stats[ENDPOINT_2]['latency'])
+        self.assertEqual(1, stats[ENDPOINT_2]['in_flight'])
+
+    def test_ejection(self):
+        lb = balancer.EndpointBalancer(
+            ENDPOINTS,
+            max_failures=2,
+            ejection_time=10
+        )
+
+        for _ in range(2):
+            url = lb.choose(exclude=[ENDPOINT_2, ENDPOINT_3])
+
+            lb.record(url, failed=True)
+
+        self.assertTrue(lb.get_stats()[ENDPOINT_1]['ejected'])
+        self.assertEqual(
+            [ENDPOINT_2, ENDPOINT_3, ENDPOINT_2],
+            [self._send(lb) for _ in range(3)]
+        )
+
+        # An ejected endpoint is used if it's the only one left.
+        self.assertEqual(
+            ENDPOINT_1,
+            lb.choose(exclude=[ENDPOINT_2, ENDPOINT_3])
+        )
+
+        lb.record(ENDPOINT_1)
+
+        self.assertFalse(lb.get_stats()[ENDPOINT_1]['ejected'])
+
+    def test_readmission(self):
+        lb = balancer.EndpointBalancer(
+            [ENDPOINT_1, ENDPOINT_2],
+            max_failures=1,
+            ejection_time=10
+        )
+
+        self.assertEqual(ENDPOINT_1, self._send(lb, failed=True))
+        self.assertEqual(ENDPOINT_2, self._send(lb))
+        self.assertEqual(ENDPOINT_2, self._send(lb))
+
+        self.monotonic.return_value = 110
+
+        self.assertFalse(lb.get_stats()[ENDPOINT_1]['ejected'])
+        self.assertIn(ENDPOINT_1, [self._send(lb) for _ in range(2)])
+
+
+class HTTPClientBalancingTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(HTTPClientBalancingTest, self).setUp()
+
+        self.requests_mock = self.useFixture(fixture.Fixture())
+
+        self.client = httpclient.HTTPClient(ENDPOINTS)
+
+    def test_single_endpoint(self):
+        client = httpclient.HTTPClient([ENDPOINT_1])
+
+        self.assertIsNone(client.balancer)
+        self.assertEqual(ENDPOINT_1, client.base_url)
+        self.assertEqual([ENDPOINT_1], client.get_endpoints())
+        self.assertIsNone(client.get_endpoint_stats())
+
+    def test_round_robin(self):
+        for url in ENDPOINTS:
+            self.requests_mock.get(url + '/executions', json={})
+
+        for _ in range(6):
+            self.client.get('/executions')
+
+        self.assertEqual(
+            [ENDPOINT_1, ENDPOINT_2, ENDPOINT_3] * 2,
+            [
+                r.url.rsplit('/', 1)[0]
+                for r in self.requests_mock.request_history
+            ]
+        )
+        self.assertEqual(
+            {2},
+            {s['requests'] for s in self.client.get_endpoint_stats().values()}
+        )
+
+    def test_fail_over_get(self):
+        self.requests_mock.get(
+            ENDPOINT_1 + '/executions',
+            exc=requests.exceptions.ConnectionError
+        )
+        self.requests_mock.get(ENDPOINT_2 + '/executions', json={})
+        self.requests_mock.get(ENDPOINT_3 + '/executions', status_code=503)
+
+        resp = self.client.get('/executions')
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(3, self.requests_mock.call_count)
+
+        stats = self.client.get_endpoint_stats()
+
+        self.assertEqual(1, stats[ENDPOINT_1]['failures'])
+        self.assertEqual(0, stats[ENDPOINT_2]['failures'])
+        self.assertEqual(1, stats[ENDPOINT_3]['failures'])
+
+    def test_fail_over_all_endpoints_down(self):
+        for url in ENDPOINTS:
+            self.requests_mock.get(url + '/executions', status_code=503)
+
+        resp = self.client.get('/executions')
+
+        self.assertEqual(503, resp.status_code)
+        self.assertEqual(3, self.requests_mock.call_count)
+
+    def test_no_fail_over_post(self):
+        self.requests_mock.post(
+            ENDPOINT_1 + '/executions',
+            exc=requests.exceptions.ConnectionError
+        )
+        self.requests_mock.post(ENDPOINT_2 + '/executions', json={})
+
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            self.client.post,
+            '/executions',
+            '{}'
+        )
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_no_fail_over_client_error(self):
+        self.requests_mock.get(ENDPOINT_1 + '/executions', status_code=404)
+
+        resp = self.client.get('/executions')
+
+        self.assertEqual(404, resp.status_code)
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_fail_over_open_circuit(self):
+        breaker = circuit_breaker.CircuitBreaker(failure_threshold=1)
+        client = httpclient.HTTPClient(
+            [ENDPOINT_1, ENDPOINT_2],
+            circuit_breaker=breaker
+        )
+
+        self.requests_mock.post(ENDPOINT_1 + '/executions', status_code=503)
+        self.requests_mock.post(ENDPOINT_2 + '/executions', json={})
+
+        self.assertEqual(503, client.post('/executions', '{}').status_code)
+        self.assertEqual(200, client.post('/executions', '{}').status_code)
+
+        # The request rejected by the open circuit is sent to the other
+        # endpoint, even though POST requests are never sent twice.
+        self.assertEqual(200, client.post('/executions', '{}').status_code)
+        self.assertEqual(3, self.requests_mock.call_count)
@@ -0,0 +1,218 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from unittest import mock
+
+from oslotest import base
+
+from mistralclient.api import base as api_base
+from mistralclient.api import cache
+from mistralclient.api.v2 import client
+from mistralclient.tests.unit import base as test_base
+
+MISTRAL_URL = 'http://localhost:8989/v2'
+
+WORKFLOW = {'id': '123', 'name': 'wf', 'definition': 'version: 2.0'}
+
+ENVIRONMENT = {'name': 'env', 'variables': {'k': 'v'}}
+
+
+class ResponseCacheTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(ResponseCacheTest, self).setUp()
+
+        self.cache = cache.ResponseCache(max_size=2, ttl=10)
+
+    def test_get_ttl(self):
+        self.cache.ttls = {'ExecutionManager': 5, 'ActionManager': 0}
+
+        self.assertEqual(10, self.cache.get_ttl('WorkflowManager', True))
+        self.assertIsNone(self.cache.get_ttl('TaskManager'))
+        self.assertEqual(5, self.cache.get_ttl('ExecutionManager'))
+        self.assertIsNone(self.cache.get_ttl('ActionManager', True))
+
+    def test_get_returns_copy(self):
+        self.cache.set(('m', 'a'), {'k': ['v']}, 10)
+
+        self.cache.get(('m', 'a'))['k'].append('changed')
+
+        self.assertEqual({'k': ['v']}, self.cache.get(('m', 'a')))
+
+    @mock.patch('time.monotonic')
+    def test_expiration(self, monotonic_mock):
+        monotonic_mock.return_value = 100
+
+        self.cache.set(('m', 'a'), 'value', 10)
+
+        monotonic_mock.return_value = 109
+
+        self.assertEqual('value', self.cache.get(('m', 'a')))
+
+        monotonic_mock.return_value = 110
+
+        self.assertIsNone(self.cache.get(('m', 'a')))
+
+        stats = self.cache.get_stats()
+
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(1, stats['expirations'])
+        self.assertEqual(0, stats['size'])
+
+    def test_lru_eviction(self):
+        self.cache.set(('m', 'a'), 'a', 10)
+        self.cache.set(('m', 'b'), 'b', 10)
+
+        # "a" becomes the most recently used entry.
+        self.cache.get(('m', 'a'))
+
+        self.cache.set(('m', 'c'), 'c', 10)
+
+        self.assertEqual('a', self.cache.get(('m', 'a')))
+        self.assertIsNone(self.cache.get(('m', 'b')))
+        self.assertEqual('c', self.cache.get(('m', 'c')))
+        self.assertEqual(1, self.cache.get_stats()['evictions'])
+
+    def test_invalidate(self):
+        self.cache.set(('m1', 'a'), 'a', 10)
+        self.cache.set(('m2', 'b'), 'b', 10)
+
+        self.cache.invalidate(('m1',))
+
+        self.assertIsNone(self.cache.get(('m1', 'a')))
+        self.assertEqual('b', self.cache.get(('m2', 'b')))
+        self.assertEqual(1, self.cache.get_stats()['invalidations'])
+
+
+class CachedClientTest(test_base.BaseClientTest):
+
+    def setUp(self):
+        super(CachedClientTest, self).setUp()
+
+        self.client = client.Client(
+            mistral_url=MISTRAL_URL,
+            project_id='project',
+            cache=cache.ResponseCache(ttls={'ExecutionManager': 5})
+        )
+
+    def test_get(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/workflows/wf',
+                                   json=WORKFLOW)
+
+        for _ in range(3):
+            wf = self.client.workflows.get('wf')
+
+        self.assertEqual(1, m.call_count)
+        self.assertEqual(WORKFLOW['definition'], wf.definition)
+
+        stats = self.client.get_cache_stats()
+
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_list(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/actions',
+                                   json={'actions': [WORKFLOW]})
+
+        self.client.actions.list()
+        actions = self.client.actions.list()
+
+        self.assertEqual(1, m.call_count)
+        self.assertEqual(['wf'], [a.name for a in actions])
+
+    def test_not_cacheable_manager(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/tasks/123', json={})
+
+        self.client.tasks.get('123')
+        self.client.tasks.get('123')
+
+        self.assertEqual(2, m.call_count)
+
+        m = self.requests_mock.get(MISTRAL_URL + '/executions/123', json={})
+
+        # Enabled with a TTL.
+        self.client.executions.get('123')
+        self.client.executions.get('123')
+
+        self.assertEqual(1, m.call_count)
+
+    def test_scope(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/workflows/wf',
+                                   json=WORKFLOW)
+
+        self.client.workflows.get('wf')
+
+        self.client.http_client.target_project_id = 'other'
+
+        self.client.workflows.get('wf')
+
+        self.assertEqual(2, m.call_count)
+
+    def test_invalidate_on_update(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/environments/env',
+                                   json=ENVIRONMENT)
+        self.requests_mock.put(MISTRAL_URL + '/environments',
+                               json=ENVIRONMENT)
+
+        self.client.environments.get('env')
+        self.client.environments.update(name='env', variables={'k': 'v'})
+        self.client.environments.get('env')
+
+        self.assertEqual(2, m.call_count)
+
+    def test_invalidate_on_delete_error(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/workflows/wf',
+                                   json=WORKFLOW)
+        self.requests_mock.delete(MISTRAL_URL + '/workflows/wf',
+                                  status_code=500)
+
+        self.client.workflows.get('wf')
+
+        self.assertRaises(
+            api_base.APIException,
+            self.client.workflows.delete,
+            'wf'
+        )
+
+        self.client.workflows.get('wf')
+
+        self.assertEqual(2, m.call_count)
+
+    def test_invalidate_other_managers(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/workflows/wf',
+                                   json=WORKFLOW)
+        self.requests_mock.delete(MISTRAL_URL + '/workbooks/wb',
+                                  status_code=204)
+
+        self.client.workflows.get('wf')
+        self.client.workbooks.delete('wb')
+        self.client.workflows.get('wf')
+
+        self.assertEqual(2, m.call_count)
+
+    def test_validate_does_not_invalidate(self):
+        m = self.requests_mock.get(MISTRAL_URL + '/workflows/wf',
+                                   json=WORKFLOW)
+        self.requests_mock.post(MISTRAL_URL + '/workflows/validate',
+                                json={'valid': True})
+
+        self.client.workflows.get('wf')
+        self.client.workflows.validate('version: 2.0')
+        self.client.workflows.get('wf')
+
+        self.assertEqual(1, m.call_count)
+
+    def test_no_cache(self):
+        mistral = client.Client(mistral_url=MISTRAL_URL)
+
+        self.assertIsNone(mistral.get_cache_stats())
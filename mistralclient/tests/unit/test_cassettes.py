@@ -0,0 +1,135 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os
+from unittest import mock
+
+import fixtures
+from oslo_serialization import jsonutils
+
+from mistralclient.api import base as api_base
+from mistralclient.api import cassettes
+from mistralclient.api.v2 import client
+from mistralclient.tests.unit import base
+
+TEST_URL = 'http://mistral.example.com'
+
+EXECUTIONS = [
+    {'id': '1', 'workflow_name': 'wf', 'state': 'SUCCESS'},
+    {'id': '2', 'workflow_name': 'wf', 'state': 'ERROR'}
+]
+
+
+class CassetteTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(CassetteTest, self).setUp()
+
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'cassette.json')
+
+        self.requests_mock.get(
+            TEST_URL + '/executions',
+            json={'executions': EXECUTIONS},
+            headers={'Set-Cookie': 'session=secret'}
+        )
+        self.requests_mock.get(TEST_URL + '/executions/3', status_code=404,
+                               json={'faultstring': 'Not found'})
+        self.requests_mock.post(TEST_URL + '/executions', status_code=201,
+                                json=EXECUTIONS[0])
+
+        self._record()
+
+    def _record(self):
+        recorder = cassettes.RecordingTransport(self.path)
+        mistral = client.Client(
+            mistral_url=TEST_URL,
+            auth_token='secret-token',
+            transport=recorder
+        )
+
+        mistral.executions.list(limit=10, sort_dirs='asc')
+        mistral.executions.create('wf', workflow_input={'x': 1})
+
+        self.assertRaises(api_base.APIException, mistral.executions.get, '3')
+
+        recorder.close()
+
+    def _replay(self, **kwargs):
+        return client.Client(
+            mistral_url='http://other.example.com',
+            transport=cassettes.ReplayTransport(self.path, **kwargs)
+        )
+
+    def test_scrubbed(self):
+        with open(self.path) as f:
+            text = f.read()
+
+        self.assertNotIn('secret', text)
+
+        cassette = jsonutils.loads(text)
+
+        self.assertEqual(3, len(cassette['interactions']))
+        self.assertEqual(
+            cassettes.SCRUBBED,
+            cassette['interactions'][0]['request']['headers']['X-Auth-Token']
+        )
+
+    def test_replay(self):
+        self.requests_mock.stop()
+
+        mistral = self._replay()
+
+        # The order of the query parameters doesn't matter.
+        self.assertEqual(
+            EXECUTIONS,
+            [ex.to_dict() for ex in
+             mistral.executions.list(sort_dirs='asc', limit=10)]
+        )
+        self.assertEqual(
+            '1',
+            mistral.executions.create('wf', workflow_input={'x': 1}).id
+        )
+
+        e = self.assertRaises(api_base.APIException,
+                              mistral.executions.get, '3')
+
+        self.assertEqual(404, e.error_code)
+
+        # Recorded responses are reused.
+        self.assertEqual(2, len(mistral.executions.list(limit=10,
+                                                        sort_dirs='asc')))
+
+    def test_unknown_request(self):
+        mistral = self._replay()
+
+        self.assertRaises(
+            cassettes.UnknownRequestError,
+            mistral.executions.list
+        )
+
+    @mock.patch('time.sleep')
+    def test_latency(self, sleep_mock):
+        mistral = self._replay(latency=2.0)
+
+        mistral.executions.list(limit=10, sort_dirs='asc')
+
+        with open(self.path, 'rb') as f:
+            duration = jsonutils.load(f)['interactions'][0]['duration']
+
+        sleep_mock.assert_called_once_with(duration * 2.0)
+
+    def test_unsupported_version(self):
+        with open(self.path, 'w') as f:
+            jsonutils.dump({'version': 0, 'interactions': []}, f)
+
+        self.assertRaises(ValueError, cassettes.ReplayTransport, self.path)
@@ -0,0 +1,233 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from http import server
+import socket
+import time
+from unittest import mock
+
+from oslotest import base
+import requests
+
+from mistralclient.api import circuit_breaker
+from mistralclient.api import httpclient
+from mistralclient.tests.unit import base as test_base
+
+ENDPOINT = 'http://localhost:8989/v2'
+
+
+class CircuitBreakerTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(CircuitBreakerTest, self).setUp()
+
+        patcher = mock.patch('time.monotonic', return_value=100)
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.changes = []
+
+        self.breaker = circuit_breaker.CircuitBreaker(
+            failure_threshold=3,
+            recovery_timeout=10,
+            on_state_change=lambda *args: self.changes.append(args)
+        )
+
+    def _open(self):
+        for _ in range(3):
+            self.breaker.before_request(ENDPOINT)
+            self.breaker.record_response(ENDPOINT, 503)
+
+    def test_open(self):
+        for _ in range(2):
+            self.breaker.before_request(ENDPOINT)
+            self.breaker.record_response(ENDPOINT, 503)
+
+        self.assertEqual('closed', self.breaker.get_state(ENDPOINT))
+
+        self.breaker.before_request(ENDPOINT)
+        self.breaker.record_error(ENDPOINT, requests.exceptions.Timeout())
+
+        self.assertEqual('open', self.breaker.get_state(ENDPOINT))
+
+        e = self.assertRaises(
+            circuit_breaker.CircuitOpenError,
+            self.breaker.before_request,
+            ENDPOINT
+        )
+
+        self.assertEqual(ENDPOINT, e.endpoint)
+        self.assertEqual(10, e.retry_after)
+        self.assertEqual([(ENDPOINT, 'closed', 'open')], self.changes)
+        self.assertEqual(
+            {ENDPOINT: {'state': 'open', 'failures': 3, 'rejected': 1}},
+            self.breaker.get_stats()
+        )
+
+        # Other endpoints are not affected.
+        self.breaker.before_request('http://other:8989/v2')
+
+    def test_success_resets_failures(self):
+        for status_code in (503, 503, 404, 503, 503):
+            self.breaker.record_response(ENDPOINT, status_code)
+
+        self.breaker.record_error(ENDPOINT, ValueError())
+
+        self.assertEqual('closed', self.breaker.get_state(ENDPOINT))
+
+    def test_half_open_close(self):
+        self._open()
+
+        self.monotonic.return_value = 110
+
+        self.assertEqual('half-open', self.breaker.get_state(ENDPOINT))
+
+        self.breaker.before_request(ENDPOINT)
+
+        # Only one trial request at a time.
+        e = self.assertRaises(
+            circuit_breaker.CircuitOpenError,
+            self.breaker.before_request,
+            ENDPOINT
+        )
+
+        self.assertEqual(0, e.retry_after)
+
+        self.breaker.record_response(ENDPOINT, 200)
+
+        self.assertEqual('closed', self.breaker.get_state(ENDPOINT))
+        self.assertEqual(
+            [
+                (ENDPOINT, 'closed', 'open'),
+                (ENDPOINT, 'open', 'half-open'),
+                (ENDPOINT, 'half-open', 'closed')
+            ],
+            self.changes
+        )
+        self.assertEqual(
+            ['open', 'half-open', 'closed'],
+            [t['to'] for t in self.breaker.get_transitions()]
+        )
+
+    def test_half_open_failure(self):
+        self._open()
+
+        self.monotonic.return_value = 110
+
+        self.breaker.before_request(ENDPOINT)
+        self.breaker.record_error(
+            ENDPOINT,
+            requests.exceptions.ConnectionError()
+        )
+
+        self.assertEqual('open', self.breaker.get_state(ENDPOINT))
+
+        self.monotonic.return_value = 119
+
+        self.assertRaises(
+            circuit_breaker.CircuitOpenError,
+            self.breaker.before_request,
+            ENDPOINT
+        )
+
+
+class _FlakyHandler(server.BaseHTTPRequestHandler):
+    """Answers with 503 until the server is marked as healthy."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests += 1
+
+        status = 200 if self.server.healthy else 503
+        body = b'{}'
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPClientCircuitBreakerTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(HTTPClientCircuitBreakerTest, self).setUp()
+
+        http_server = self.useFixture(test_base.HTTPServer(_FlakyHandler))
+        self.server = http_server.server
+        self.server.healthy = False
+        self.server.requests = 0
+
+        self.base_url = http_server.url
+
+        # Only the clock of the circuit breaker is patched, the one of the
+        # connections keeps running.
+        patcher = mock.patch.object(circuit_breaker, 'time', wraps=time)
+        self.monotonic = patcher.start().monotonic
+        self.monotonic.return_value = 100
+        self.addCleanup(patcher.stop)
+
+        self.breaker = circuit_breaker.CircuitBreaker(
+            failure_threshold=3,
+            recovery_timeout=0.05
+        )
+        self.client = httpclient.HTTPClient(
+            self.base_url,
+            circuit_breaker=self.breaker
+        )
+
+    def test_flaky_server(self):
+        for _ in range(3):
+            self.assertEqual(503, self.client.get('/executions').status_code)
+
+        self.assertRaises(
+            circuit_breaker.CircuitOpenError,
+            self.client.get,
+            '/executions'
+        )
+        self.assertEqual(3, self.server.requests)
+
+        self.server.healthy = True
+
+        self.monotonic.return_value = 101
+
+        self.assertEqual(200, self.client.get('/executions').status_code)
+        self.assertEqual('closed', self.breaker.get_state(self.base_url))
+
+    def test_unreachable_server(self):
+        # Nothing listens on this port once the socket is closed.
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        url = 'http://127.0.0.1:%s/v2' % sock.getsockname()[1]
+        sock.close()
+
+        client = httpclient.HTTPClient(url, circuit_breaker=self.breaker)
+
+        for _ in range(3):
+            self.assertRaises(
+                requests.exceptions.ConnectionError,
+                client.get,
+                '/executions'
+            )
+
+        self.assertRaises(
+            circuit_breaker.CircuitOpenError,
+            client.get,
+            '/executions'
+        )
+
+        # The circuit of the other endpoint is still closed.
+        self.assertEqual(503, self.client.get('/executions').status_code)
@@ -13,8 +13,10 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from http import server
 import os
 import tempfile
+import threading
 from unittest import mock
 
 from oslo_serialization import jsonutils
@@ -22,7 +24,11 @@ from oslo_utils import uuidutils
 from oslotest import base
 import osprofiler.profiler
 
+from mistralclient.api import base as api_base
+from mistralclient.api import circuit_breaker
 from mistralclient.api import client
+from mistralclient.api import hedging
+from mistralclient.tests.unit import base as test_base
 
 AUTH_HTTP_URL_v3 = 'http://localhost:35357/v3'
 AUTH_HTTP_URL_v2_0 = 'http://localhost:35357/v2.0'
@@ -313,3 +319,228 @@ class BaseClientTest(base.BaseTestCase):
         )
 
         self.assertEqual(0, get_auth_handler_mock.call_count)
+
+    def test_mistral_pool_options(self):
+        mistralclient = client.client(
+            mistral_url=MISTRAL_HTTP_URL,
+            pool_maxsize=64,
+            pool_block=True,
+            pool_idle_timeout=30
+        )
+
+        adapter = mistralclient.http_client.pool_adapter
+
+        self.assertIs(mistralclient.executions.http_client,
+                      mistralclient.http_client)
+        self.assertEqual(64, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(30, adapter.idle_timeout)
+        self.assertEqual(0, mistralclient.get_pool_stats()['requests'])
+
+    def test_mistral_transport(self):
+        transport = mock.Mock()
+        transport.get.return_value = mock.Mock(
+            status_code=200,
+            content=b'',
+            raw=None
+        )
+
+        mistralclient = client.client(
+            mistral_url=MISTRAL_HTTP_URL,
+            transport=transport
+        )
+
+        mistralclient.http_client.get('/executions')
+
+        transport.get.assert_called_once_with(
+            MISTRAL_HTTP_URL + '/executions',
+            headers=mock.ANY,
+            timeout=(10.0, 60.0)
+        )
+
+    def test_mistral_circuit_breaker(self):
+        breaker = circuit_breaker.CircuitBreaker()
+
+        mistralclient = client.client(
+            mistral_url=MISTRAL_HTTP_URL,
+            circuit_breaker=breaker
+        )
+
+        self.assertIs(breaker, mistralclient.http_client.circuit_breaker)
+
+    def test_mistral_hedging(self):
+        policy = hedging.HedgingPolicy()
+
+        mistralclient = client.client(
+            mistral_url=MISTRAL_HTTP_URL,
+            hedging=policy
+        )
+
+        self.assertIs(policy, mistralclient.http_client.hedging)
+        self.assertEqual({}, mistralclient.get_hedging_stats())
+
+    def test_mistral_rate_limit(self):
+        mistralclient = client.client(
+            mistral_url=MISTRAL_HTTP_URL,
+            rate_limit=10
+        )
+
+        self.assertIsNotNone(mistralclient.http_client.rate_limiter)
+        self.assertEqual({}, mistralclient.get_rate_limit_stats())
+
+    def test_mistral_url_list(self):
+        urls = [MISTRAL_HTTP_URL, 'http://mistral-2:8989/v2']
+
+        mistralclient = client.client(
+            mistral_url=urls,
+            load_balancing='least-latency'
+        )
+
+        self.assertEqual(urls, mistralclient.http_client.get_endpoints())
+        self.assertEqual(
+            'least-latency',
+            mistralclient.http_client.balancer.strategy
+        )
+        self.assertEqual(set(urls), set(mistralclient.get_endpoint_stats()))
+
+    def test_mistral_url_invalid(self):
+        self.assertRaises(
+            RuntimeError,
+            client.client,
+            mistral_url=[MISTRAL_HTTP_URL, 8989]
+        )
+
+
+class _ExecutionsHandler(server.BaseHTTPRequestHandler):
+    """Returns executions, counting requests in flight.
+
+    The first requests wait until ``expected_in_flight`` of them are in
+    flight, if set.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        stats = self.server.stats
+
+        with stats['lock']:
+            stats['in_flight'] += 1
+            stats['max_in_flight'] = max(stats['max_in_flight'],
+                                         stats['in_flight'])
+            stats['lock'].notify_all()
+
+            stats['lock'].wait_for(
+                lambda: (stats['max_in_flight'] >=
+                         stats['expected_in_flight']),
+                timeout=5
+            )
+
+            stats['in_flight'] -= 1
+
+        ex_id = self.path.rsplit('/', 1)[1]
+
+        if ex_id == 'missing':
+            self.send_response(404)
+            body = jsonutils.dump_as_bytes({'faultstring': 'Not found'})
+        else:
+            self.send_response(200)
+            body = jsonutils.dump_as_bytes({'id': ex_id})
+
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ClientConcurrencyTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(ClientConcurrencyTest, self).setUp()
+
+        http_server = self.useFixture(
+            test_base.HTTPServer(_ExecutionsHandler)
+        )
+        self.server = http_server.server
+        self.server.stats = {
+            'lock': threading.Condition(),
+            'in_flight': 0,
+            'max_in_flight': 0,
+            'expected_in_flight': 0
+        }
+
+        self.mistral_url = http_server.url
+
+    def _create_client(self, **kwargs):
+        mistralclient = client.client(mistral_url=self.mistral_url, **kwargs)
+
+        self.addCleanup(mistralclient.close)
+
+        return mistralclient
+
+    def test_shared_client(self):
+        mistralclient = self._create_client()
+        ids = [str(i) for i in range(20)]
+        results = {}
+
+        def _get(ex_id):
+            results[ex_id] = mistralclient.executions.get(ex_id).id
+
+        threads = [threading.Thread(target=_get, args=(i,)) for i in ids]
+
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+        self.assertEqual({i: i for i in ids}, results)
+        self.assertEqual(20, mistralclient.get_pool_stats()['requests'])
+
+    def test_max_concurrency(self):
+        mistralclient = self._create_client(max_concurrency=3)
+        self.server.stats['expected_in_flight'] = 3
+
+        ids = [str(i) for i in range(12)]
+
+        execs = mistralclient.map(mistralclient.executions.get, ids)
+
+        self.assertEqual(ids, [ex.id for ex in execs])
+        self.assertEqual(3, self.server.stats['max_in_flight'])
+
+    def test_max_concurrency_pool_size(self):
+        mistralclient = self._create_client(max_concurrency=30)
+
+        self.assertEqual(
+            30,
+            mistralclient.http_client.pool_adapter._pool_maxsize
+        )
+
+    def test_map_max_workers(self):
+        mistralclient = self._create_client()
+        self.server.stats['expected_in_flight'] = 2
+
+        ids = [str(i) for i in range(10)]
+
+        execs = mistralclient.map(
+            mistralclient.executions.get,
+            ids,
+            max_workers=2
+        )
+
+        self.assertEqual(ids, [ex.id for ex in execs])
+        self.assertEqual(2, self.server.stats['max_in_flight'])
+
+    def test_map_error(self):
+        mistralclient = self._create_client()
+
+        e = self.assertRaises(
+            api_base.APIException,
+            mistralclient.map,
+            mistralclient.executions.get,
+            ['1', 'missing', '2']
+        )
+
+        self.assertEqual(404, e.error_code)
@@ -0,0 +1,182 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from oslotest import base
+
+from mistralclient.api import base as api_base
+from mistralclient.api.v2 import client
+from mistralclient.tests import fake_api
+
+WF_DEF = """
+---
+version: '2.0'
+
+my_wf:
+  tasks:
+    task1:
+      action: std.noop
+"""
+
+
+class FakeAPITest(base.BaseTestCase):
+
+    def setUp(self):
+        super(FakeAPITest, self).setUp()
+
+        self.api = fake_api.FakeMistralAPI()
+        self.api.seed('executions', 1000000)
+        self.api.seed('tasks', 5000000)
+
+        self.client = client.Client(
+            mistral_url=fake_api.BASE_URL,
+            transport=fake_api.WSGITransport(self.api)
+        )
+
+    def test_list(self):
+        executions = self.client.executions.list(limit=3)
+
+        self.assertEqual(
+            [fake_api.make_id(i) for i in range(3)],
+            [ex.id for ex in executions]
+        )
+
+        executions = self.client.executions.list(
+            marker=executions[-1].id,
+            limit=2,
+            sort_dirs='desc'
+        )
+
+        self.assertEqual(
+            [fake_api.make_id(1), fake_api.make_id(0)],
+            [ex.id for ex in executions]
+        )
+
+    def test_list_newest(self):
+        ex, = self.client.executions.list(limit=1, sort_dirs='desc')
+
+        self.assertEqual(fake_api.make_id(999999), ex.id)
+
+    def test_list_filters_and_fields(self):
+        executions = self.client.executions.list(
+            limit=10,
+            fields=['state'],
+            state='in:ERROR,PAUSED'
+        )
+
+        self.assertEqual(10, len(executions))
+        self.assertEqual(
+            {'ERROR', 'PAUSED'},
+            {ex.state for ex in executions}
+        )
+        self.assertEqual(
+            {'id', 'state'},
+            set(executions[0].to_dict())
+        )
+
+    def test_list_sorted_by_other_key(self):
+        self.api = fake_api.FakeMistralAPI()
+        self.api.seed('executions', 8)
+        self.client.http_client.transport = fake_api.WSGITransport(self.api)
+
+        executions = self.client.executions.list(sort_keys='state,created_at',
+                                                 sort_dirs='asc,desc')
+
+        self.assertEqual(
+            ['ERROR', 'ERROR', 'PAUSED', 'PAUSED'],
+            [ex.state for ex in executions][:4]
+        )
+        self.assertGreater(executions[0].created_at,
+                           executions[1].created_at)
+
+    def test_list_sorted_by_other_key_too_many(self):
+        self.assertRaises(
+            api_base.APIException,
+            self.client.executions.list,
+            sort_keys='state'
+        )
+
+        # The tasks of an execution are looked up before being sorted.
+        tasks = self.client.tasks.list(
+            workflow_execution_id=fake_api.make_id(10),
+            sort_keys='name'
+        )
+
+        self.assertEqual(fake_api.TASKS_PER_EXECUTION, len(tasks))
+
+    def test_sub_resources(self):
+        ex_id = fake_api.make_id(10)
+
+        tasks = self.client.tasks.list(workflow_execution_id=ex_id, limit=100)
+
+        self.assertEqual(fake_api.TASKS_PER_EXECUTION, len(tasks))
+
+        tasks = self.client.executions.get_ex_sub_executions(ex_id)
+
+        self.assertEqual([], tasks)
+
+    def test_crud(self):
+        ex = self.client.executions.create('wf', workflow_input={'x': 1})
+
+        self.assertEqual(fake_api.make_id(1000000), ex.id)
+        self.assertEqual('RUNNING', ex.state)
+        self.assertEqual('{"x": 1}', ex.input)
+
+        ex = self.client.executions.update(ex.id, 'PAUSED')
+
+        self.assertEqual('PAUSED', self.client.executions.get(ex.id).state)
+
+        self.client.executions.delete(ex.id)
+
+        e = self.assertRaises(api_base.APIException,
+                              self.client.executions.get, ex.id)
+
+        self.assertEqual(404, e.error_code)
+
+    def test_workflows(self):
+        wf, = self.client.workflows.create(WF_DEF)
+
+        self.assertEqual('my_wf', wf.name)
+        self.assertEqual(WF_DEF, self.client.workflows.get('my_wf').definition)
+        self.assertTrue(self.client.workflows.validate(WF_DEF)['valid'])
+
+        self.assertRaises(api_base.APIException,
+                          self.client.workflows.create, WF_DEF)
+
+    def test_environments(self):
+        self.client.environments.create(name='env', variables={'x': 1})
+
+        self.assertEqual(
+            {'x': 1},
+            self.client.environments.get('env').variables
+        )
+
+    def test_injected_errors(self):
+        self.api.fail_next(status=500)
+
+        e = self.assertRaises(api_base.APIException,
+                              self.client.executions.list)
+
+        self.assertEqual(500, e.error_code)
+
+        self.api.error_rate = 1.0
+
+        self.assertRaises(api_base.APIException, self.client.executions.list)
+
+    def test_serve(self):
+        with self.api.serve() as url:
+            mistral = client.Client(mistral_url=url)
+
+            self.assertEqual(
+                fake_api.make_id(5),
+                mistral.executions.get(fake_api.make_id(5)).id
+            )
+            self.assertEqual(2, len(mistral.tasks.list(limit=2)))
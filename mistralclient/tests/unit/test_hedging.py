@@ -0,0 +1,194 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from http import server
+import threading
+import time
+
+from oslotest import base
+
+from mistralclient.api import hedging
+from mistralclient.api import httpclient
+from mistralclient.tests.unit import base as test_base
+
+
+class HedgingPolicyTest(base.BaseTestCase):
+
+    def test_invalid_percentile(self):
+        self.assertRaises(ValueError, hedging.HedgingPolicy, percentile=0)
+
+    def test_delay(self):
+        policy = hedging.HedgingPolicy(
+            percentile=90,
+            initial_delay=0.5,
+            min_samples=10
+        )
+
+        self.assertEqual(0.5, policy.start('ExecutionManager.get'))
+
+        for i in range(1, 11):
+            policy.record_latency('ExecutionManager.get', i / 100.0)
+
+        self.assertEqual(0.09, policy.start('ExecutionManager.get'))
+
+        # Every operation has its own response times.
+        self.assertEqual(0.5, policy.start('TaskManager.list'))
+
+    def test_delay_bounds(self):
+        policy = hedging.HedgingPolicy(
+            min_delay=0.05,
+            max_delay=0.2,
+            min_samples=1
+        )
+
+        policy.record_latency('ExecutionManager.get', 0.01)
+        policy.record_latency('TaskManager.get', 1.0)
+
+        self.assertEqual(0.05, policy.start('ExecutionManager.get'))
+        self.assertEqual(0.2, policy.start('TaskManager.get'))
+
+    def test_max_ratio(self):
+        policy = hedging.HedgingPolicy(max_ratio=0.25)
+
+        for _ in range(8):
+            policy.start('ExecutionManager.get')
+
+        self.assertEqual(
+            [True, True, False],
+            [policy.should_hedge('ExecutionManager.get') for _ in range(3)]
+        )
+
+        stats = policy.get_stats()['ExecutionManager.get']
+
+        self.assertEqual(8, stats['requests'])
+        self.assertEqual(2, stats['hedged'])
+
+
+class _SlowHandler(server.BaseHTTPRequestHandler):
+    """Holds the first requests of the server until the end of the test."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            slow = self.server.requests <= self.server.slow_requests
+
+        if slow:
+            self.server.release.wait(5)
+
+        body = b'{}'
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPClientHedgingTest(base.BaseTestCase):
+
+    def _start_server(self, slow_requests):
+        http_server = self.useFixture(test_base.HTTPServer(_SlowHandler))
+        srv = http_server.server
+        srv.lock = threading.Lock()
+        srv.requests = 0
+        srv.slow_requests = slow_requests
+        srv.release = threading.Event()
+
+        self.addCleanup(srv.release.set)
+
+        return srv, http_server.url
+
+    def _get(self, client):
+        with httpclient.operation('ExecutionManager.get'):
+            return client.get('/executions/123')
+
+    def test_hedged_request_wins(self):
+        srv, url = self._start_server(slow_requests=1)
+        policy = hedging.HedgingPolicy(initial_delay=0.05, max_ratio=1)
+        client = httpclient.HTTPClient(url, hedging=policy)
+
+        resp = self._get(client)
+
+        # The first request is still held.
+        self.assertFalse(srv.release.is_set())
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, srv.requests)
+
+        stats = client.get_hedging_stats()['ExecutionManager.get']
+
+        self.assertEqual(1, stats['hedged'])
+        self.assertEqual(1, stats['hedge_wins'])
+
+    def test_fast_request_not_hedged(self):
+        srv, url = self._start_server(slow_requests=0)
+        policy = hedging.HedgingPolicy(initial_delay=5, max_ratio=1)
+        client = httpclient.HTTPClient(url, hedging=policy)
+
+        for _ in range(3):
+            self.assertEqual(200, self._get(client).status_code)
+
+        self.assertEqual(3, srv.requests)
+        self.assertEqual(
+            0,
+            client.get_hedging_stats()['ExecutionManager.get']['hedged']
+        )
+
+    def test_hedge_to_other_endpoint(self):
+        slow_srv, slow_url = self._start_server(slow_requests=100)
+        fast_srv, fast_url = self._start_server(slow_requests=0)
+        policy = hedging.HedgingPolicy(initial_delay=0.05, max_ratio=1)
+        client = httpclient.HTTPClient([slow_url, fast_url], hedging=policy)
+
+        resp = self._get(client)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, slow_srv.requests)
+        self.assertEqual(1, fast_srv.requests)
+
+    def test_busy_pool(self):
+        srv, url = self._start_server(slow_requests=1)
+        policy = hedging.HedgingPolicy(initial_delay=0.05, max_ratio=1,
+                                       max_workers=1)
+        client = httpclient.HTTPClient(url, hedging=policy)
+
+        # The first request holds the only thread of the pool.
+        thread = threading.Thread(target=self._get, args=(client,))
+        thread.start()
+
+        while srv.requests < 1:
+            time.sleep(0.001)
+
+        resp = self._get(client)
+
+        # The second request didn't wait for the first one.
+        self.assertTrue(thread.is_alive())
+
+        srv.release.set()
+        thread.join(5)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, srv.requests)
+        self.assertEqual(
+            0,
+            client.get_hedging_stats()['ExecutionManager.get']['hedged']
+        )
+
+    def test_no_hedging(self):
+        client = httpclient.HTTPClient('http://localhost:8989/v2')
+
+        self.assertIsNone(client.hedging)
+        self.assertIsNone(client.get_hedging_stats())
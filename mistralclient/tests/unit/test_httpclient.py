@@ -14,17 +14,25 @@
 
 import base64
 import copy
+import gzip
+from http import server
 from unittest import mock
 
 from urllib import parse as urlparse
 
 from oslo_utils import uuidutils
+from oslotest import base as oslo_base
 from osprofiler import _utils as osprofiler_utils
 import osprofiler.profiler
+import requests
+import testtools
 
 from mistralclient.api import httpclient
+from mistralclient.api import transports
 from mistralclient.tests.unit import base
 
+httpx = transports.httpx
+
 API_BASE_URL = 'http://localhost:8989/v2'
 API_URL = '/executions'
 
@@ -59,14 +67,16 @@ class HTTPClientTest(base.BaseClientTest):
 
     def setUp(self):
         super(HTTPClientTest, self).setUp()
-        self.client = httpclient.HTTPClient(
-            API_BASE_URL,
+        self.client = self._create_client(
             auth_token=AUTH_TOKEN,
             project_id=PROJECT_ID,
             user_id=USER_ID,
             region_name=REGION_NAME
         )
 
+    def _create_client(self, **kwargs):
+        return httpclient.HTTPClient(API_BASE_URL, **kwargs)
+
     def assertExpectedAuthHeaders(self):
         headers = self.requests_mock.last_request.headers
 
@@ -131,8 +141,7 @@ class HTTPClientTest(base.BaseClientTest):
         target_user_domain_name = 'target user domain name'
         target_project_domain_name = 'target project domain name'
 
-        target_client = httpclient.HTTPClient(
-            API_BASE_URL,
+        target_client = self._create_client(
             auth_token=AUTH_TOKEN,
             project_id=PROJECT_ID,
             user_id=USER_ID,
@@ -200,6 +209,111 @@ class HTTPClientTest(base.BaseClientTest):
         headers = self.assertExpectedAuthHeaders()
         self.assertEqual('bar', headers['foo'])
 
+    def test_get_request_options_does_not_change_headers(self):
+        headers = {'content-type': 'text/plain'}
+
+        options = self.client._get_request_options('post', headers)
+
+        self.assertEqual({'content-type': 'text/plain'}, headers)
+        self.assertEqual('text/plain', options['headers']['content-type'])
+        self.assertEqual(AUTH_TOKEN, options['headers']['X-Auth-Token'])
+
+    def test_headers_template_is_cached(self):
+        self.client.target_service_catalog = 'catalog'
+
+        with mock.patch.object(
+                self.client,
+                '_build_headers_template',
+                wraps=self.client._build_headers_template) as build_mock:
+            for _ in range(3):
+                options = self.client._get_request_options('get', None)
+
+        self.assertEqual(1, build_mock.call_count)
+        self.assertEqual(
+            base64.b64encode(b'catalog'),
+            options['headers']['X-Target-Service-Catalog']
+        )
+
+    def test_headers_template_is_rebuilt_on_change(self):
+        options = self.client._get_request_options('get', None)
+
+        self.assertEqual(AUTH_TOKEN, options['headers']['X-Auth-Token'])
+        self.assertNotIn('X-Target-Auth-Token', options['headers'])
+
+        self.client.auth_token = 'new_token'
+        self.client.target_auth_token = 'target_token'
+
+        options = self.client._get_request_options('get', None)
+
+        self.assertEqual('new_token', options['headers']['X-Auth-Token'])
+        self.assertEqual(
+            'target_token',
+            options['headers']['X-Target-Auth-Token']
+        )
+
+    def test_request_compression(self):
+        m = self.requests_mock.post(EXPECTED_URL, text='text')
+        body = '{"definition": "%s"}' % ('x' * 2048)
+
+        self.client.compression_threshold = 1024
+
+        self.client.post(API_URL, body)
+
+        self.assertTrue(m.called_once)
+
+        req = self.requests_mock.last_request
+
+        self.assertEqual('gzip', req.headers['Content-Encoding'])
+        self.assertEqual(body.encode('utf-8'), gzip.decompress(req.body))
+
+    def test_request_compression_below_threshold(self):
+        self.requests_mock.post(EXPECTED_URL, text='text')
+
+        self.client.compression_threshold = 1024
+
+        self.client.post(API_URL, '{"k": "v"}')
+
+        req = self.requests_mock.last_request
+
+        self.assertNotIn('Content-Encoding', req.headers)
+        self.assertEqual(b'{"k": "v"}', req.body)
+
+    def test_transfer_stats(self):
+        content = b'{"executions": []}' * 100
+
+        self.requests_mock.get(
+            EXPECTED_URL,
+            content=gzip.compress(content),
+            headers={'Content-Encoding': 'gzip'}
+        )
+        self.requests_mock.post(EXPECTED_URL, text='{}')
+
+        self.client.compression_threshold = 100
+
+        with httpclient.operation('ExecutionManager.list'):
+            resp = self.client.get(API_URL)
+
+        self.client.post(API_URL, 'x' * 1000)
+
+        self.assertEqual(content, resp.content)
+
+        stats = self.client.get_transfer_stats()
+
+        self.assertEqual(
+            {
+                'requests': 1,
+                'request_bytes': 0,
+                'request_wire_bytes': 0,
+                'response_bytes': len(content),
+                'response_wire_bytes': len(gzip.compress(content))
+            },
+            stats['ExecutionManager.list']
+        )
+
+        self.assertEqual(1000, stats['unknown']['request_bytes'])
+        self.assertLess(stats['unknown']['request_wire_bytes'], 100)
+        self.assertEqual(2, stats['unknown']['response_bytes'])
+
     @mock.patch.object(
         httpclient.HTTPClient,
         '_get_request_options',
@@ -268,3 +382,242 @@ class HTTPClientTest(base.BaseClientTest):
 
         self.assertTrue(m.called_once)
         self.assertExpectedAuthHeaders()
+
+
+class _RequestsTransport(object):
+    """httpx transport sending the requests with a requests session.
+
+    It lets requests_mock intercept the requests sent by HTTPXTransport.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+
+    def handle_request(self, request):
+        resp = self.session.request(
+            request.method,
+            str(request.url),
+            headers=dict(request.headers.items()),
+            data=request.read() or None,
+            stream=True
+        )
+
+        return httpx.Response(
+            resp.status_code,
+            headers=list(resp.headers.items()),
+            stream=httpx.ByteStream(resp.raw.read(decode_content=False))
+        )
+
+    def close(self):
+        self.session.close()
+
+
+@testtools.skipIf(httpx is None, 'httpx is not installed')
+class HTTPClientHTTPXTransportTest(HTTPClientTest):
+    """Runs the HTTPClient tests with requests sent by httpx."""
+
+    def _create_client(self, **kwargs):
+        transport = transports.HTTPXTransport(transport=_RequestsTransport())
+
+        self.addCleanup(transport.close)
+
+        return httpclient.HTTPClient(
+            API_BASE_URL,
+            transport=transport,
+            **kwargs
+        )
+
+    def test_get_request_options_with_headers_for_get(self):
+        m = self.requests_mock.get(EXPECTED_URL, text='text')
+
+        target_client = self._create_client(
+            auth_token=AUTH_TOKEN,
+            project_id=PROJECT_ID,
+            user_id=USER_ID,
+            target_auth_token='target_token',
+            target_service_catalog='catalog'
+        )
+
+        target_client.get(API_URL)
+
+        self.assertTrue(m.called_once)
+        headers = self.assertExpectedAuthHeaders()
+        self.assertEqual('target_token', headers['X-Target-Auth-Token'])
+
+        # httpx sends all header values as text.
+        self.assertEqual(
+            base64.b64encode(b'catalog').decode(),
+            headers['X-Target-Service-Catalog']
+        )
+
+    def test_stream(self):
+        self.requests_mock.get(EXPECTED_URL, text='{"executions": []}')
+
+        resp = self.client.get(API_URL, stream=True)
+
+        self.assertEqual(
+            b'{"executions": []}',
+            b''.join(resp.iter_content(4))
+        )
+
+        resp.close()
+
+    def test_response(self):
+        self.requests_mock.get(
+            EXPECTED_URL,
+            status_code=404,
+            json={'faultstring': 'Not found'},
+            headers={'Server-Error-Message': 'Not found'}
+        )
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual(404, resp.status_code)
+        self.assertEqual('Not found', resp.headers['server-error-message'])
+        self.assertEqual({'faultstring': 'Not found'}, resp.json())
+        self.assertEqual('GET', resp.request.method)
+        self.assertEqual(EXPECTED_URL, resp.url)
+
+    def test_connection_error(self):
+        self.requests_mock.get(
+            EXPECTED_URL,
+            exc=requests.exceptions.ConnectionError
+        )
+
+        # The bridge turns the error of the mock into an httpx error, which
+        # HTTPXTransport turns back into an error of requests.
+        with mock.patch.object(
+                _RequestsTransport,
+                'handle_request',
+                side_effect=httpx.ConnectError('Connection refused')):
+            self.assertRaises(
+                requests.exceptions.ConnectionError,
+                self.client.get,
+                API_URL
+            )
+
+    def test_keystone_session_auth_headers(self):
+        self.requests_mock.get(EXPECTED_URL, text='text')
+
+        session = mock.Mock()
+        session.get_auth_headers.return_value = {'X-Auth-Token': 'ks_token'}
+
+        client = self._create_client(session=session)
+
+        client.get(API_URL)
+
+        headers = self.requests_mock.last_request.headers
+
+        self.assertEqual('ks_token', headers['X-Auth-Token'])
+        self.assertFalse(session.get.called)
+
+    def test_transport_option(self):
+        client = httpclient.HTTPClient(API_BASE_URL, transport='http2')
+
+        self.addCleanup(client.transport.close)
+
+        self.assertIsInstance(client.transport, transports.HTTPXTransport)
+        self.assertIsNone(client.pool_adapter)
+
+        self.assertRaises(
+            ValueError,
+            httpclient.HTTPClient,
+            API_BASE_URL,
+            transport='ftp'
+        )
+
+
+class _KeepAliveHandler(server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{}'
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPClientPoolTest(oslo_base.BaseTestCase):
+
+    def setUp(self):
+        super(HTTPClientPoolTest, self).setUp()
+
+        self.base_url = self.useFixture(
+            base.HTTPServer(_KeepAliveHandler)
+        ).url
+
+    def test_pool_options(self):
+        client = httpclient.HTTPClient(
+            self.base_url,
+            pool_connections=2,
+            pool_maxsize=50,
+            pool_block=True
+        )
+
+        adapter = client.session.get_adapter(self.base_url)
+
+        self.assertIs(client.pool_adapter, adapter)
+        self.assertEqual(50, adapter._pool_maxsize)
+        self.assertEqual(2, adapter._pool_connections)
+        self.assertTrue(adapter._pool_block)
+
+    def test_pool_options_with_custom_session(self):
+        session = requests.Session()
+
+        client = httpclient.HTTPClient(self.base_url, session=session)
+
+        self.assertIsNone(client.pool_adapter)
+        self.assertIsNone(client.get_pool_stats())
+
+        client = httpclient.HTTPClient(
+            self.base_url,
+            session=session,
+            pool_maxsize=20
+        )
+
+        self.assertIs(client.pool_adapter, session.get_adapter(self.base_url))
+
+    def test_pool_stats(self):
+        client = httpclient.HTTPClient(self.base_url)
+
+        for _ in range(3):
+            client.get('/executions')
+
+        stats = client.get_pool_stats()
+
+        self.assertEqual(0, stats['in_use'])
+        self.assertEqual(1, stats['idle'])
+        self.assertEqual(3, stats['requests'])
+        self.assertEqual(1, stats['new_connections'])
+        self.assertEqual(2, stats['reused_connections'])
+
+    def test_pool_idle_timeout(self):
+        client = httpclient.HTTPClient(self.base_url, pool_idle_timeout=0)
+
+        for _ in range(3):
+            client.get('/executions')
+
+        stats = client.get_pool_stats()
+
+        self.assertEqual(3, stats['requests'])
+        self.assertEqual(3, stats['new_connections'])
+        self.assertEqual(0, stats['reused_connections'])
+
+    @testtools.skipIf(httpx is None, 'httpx is not installed')
+    def test_httpx_transport(self):
+        client = httpclient.HTTPClient(self.base_url, transport='httpx')
+
+        self.addCleanup(client.transport.close)
+
+        for _ in range(3):
+            resp = client.get('/executions')
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual({}, resp.json())
+        self.assertIsNone(client.get_pool_stats())
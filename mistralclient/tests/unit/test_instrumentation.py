@@ -0,0 +1,213 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from unittest import mock
+
+from oslotest import base
+import requests
+
+from mistralclient.api import httpclient
+from mistralclient.api import instrumentation
+from mistralclient.api import retry
+from mistralclient.tests.unit import base as test_base
+
+API_BASE_URL = 'http://localhost:8989/v2'
+
+
+def _event(operation, url, status_code, duration, ttfb=None):
+    event = instrumentation.RequestEvent(operation, 'GET', url)
+    event.status_code = status_code
+    event.duration = duration
+    event.ttfb = ttfb
+
+    return event
+
+
+class URLTemplateTest(base.BaseTestCase):
+
+    def test_get_url_template(self):
+        for url, expected in (
+                ('/executions', '/executions'),
+                ('/executions?limit=10&sort_dirs=desc', '/executions'),
+                ('/executions/123', '/executions/{id}'),
+                ('/executions/123/tasks', '/executions/{id}/tasks'),
+                ('/executions/123/report?errors_only=true',
+                 '/executions/{id}/report'),
+                ('/workflows/validate', '/workflows/validate'),
+                ('/actions/std.echo/my_ns', '/actions/{id}/{id}'),
+                ('/workflows/wf/members/456',
+                 '/workflows/{id}/members/{id}')):
+            self.assertEqual(expected,
+                             instrumentation.get_url_template(url))
+
+
+class LatencyHistogramsTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(LatencyHistogramsTest, self).setUp()
+
+        self.histograms = instrumentation.LatencyHistograms(
+            buckets=(0.1, 1.0)
+        )
+
+        for url, duration in (('/executions/1', 0.05),
+                              ('/executions/2', 0.1),
+                              ('/executions/3', 2.0)):
+            self.histograms(
+                _event('ExecutionManager.get', url, 200, duration, 0.01)
+            )
+
+        self.histograms(
+            _event('ExecutionManager.get', '/executions/4', None, 0.5)
+        )
+
+    def test_to_dict(self):
+        series = self.histograms.to_dict()
+
+        self.assertEqual(2, len(series))
+        self.assertEqual(
+            {
+                'operation': 'ExecutionManager.get',
+                'method': 'GET',
+                'url_template': '/executions/{id}',
+                'status': '200',
+                'duration': {
+                    'buckets': [(0.1, 2), (1.0, 2), ('+Inf', 3)],
+                    'sum': 2.15,
+                    'count': 3
+                },
+                'ttfb': {
+                    'buckets': [(0.1, 3), (1.0, 3), ('+Inf', 3)],
+                    'sum': 0.03,
+                    'count': 3
+                }
+            },
+            series[0]
+        )
+        self.assertEqual('error', series[1]['status'])
+        self.assertEqual(0, series[1]['ttfb']['count'])
+
+    def test_to_prometheus(self):
+        text = self.histograms.to_prometheus()
+        labels = ('operation="ExecutionManager.get",method="GET",'
+                  'url_template="/executions/{id}",status="200"')
+
+        self.assertIn(
+            '# TYPE mistralclient_request_duration_seconds histogram\n',
+            text
+        )
+        self.assertIn(
+            'mistralclient_request_duration_seconds_bucket{%s,le="0.1"} 2\n'
+            % labels,
+            text
+        )
+        self.assertIn(
+            'mistralclient_request_duration_seconds_bucket{%s,le="+Inf"} 3\n'
+            % labels,
+            text
+        )
+        self.assertIn(
+            'mistralclient_request_duration_seconds_count{%s} 3\n' % labels,
+            text
+        )
+        self.assertIn(
+            'mistralclient_request_ttfb_seconds_sum{%s} 0.03\n' % labels,
+            text
+        )
+
+    def test_reset(self):
+        self.histograms.reset()
+
+        self.assertEqual([], self.histograms.to_dict())
+
+
+class HTTPClientInstrumentationTest(test_base.BaseClientTest):
+
+    def setUp(self):
+        super(HTTPClientInstrumentationTest, self).setUp()
+
+        self.events = []
+        self.client = httpclient.HTTPClient(
+            API_BASE_URL,
+            request_hooks=[self.events.append]
+        )
+
+    def test_event(self):
+        self.requests_mock.post(API_BASE_URL + '/executions',
+                                json={'id': '123'}, status_code=201)
+
+        with httpclient.operation('ExecutionManager.create'):
+            self.client.post('/executions', '{"workflow_id": "wf"}')
+
+        self.assertEqual(1, len(self.events))
+
+        event = self.events[0]
+
+        self.assertEqual('ExecutionManager', event.manager)
+        self.assertEqual('create', event.manager_method)
+        self.assertEqual('POST', event.method)
+        self.assertEqual('/executions', event.url_template)
+        self.assertEqual(201, event.status_code)
+        self.assertIsNone(event.error)
+        self.assertEqual(21, event.request_bytes)
+        self.assertEqual(13, event.response_bytes)
+        self.assertEqual(0, event.retries)
+        self.assertIsNotNone(event.ttfb)
+        self.assertGreaterEqual(event.duration, 0)
+
+    @mock.patch('time.sleep')
+    def test_retries(self, sleep_mock):
+        self.requests_mock.get(
+            API_BASE_URL + '/executions/123',
+            [{'status_code': 503}, {'status_code': 503},
+             {'json': {'id': '123'}}]
+        )
+        self.client.retry_policy = retry.RetryPolicy(jitter=False)
+
+        self.client.get('/executions/123')
+
+        self.assertEqual(2, self.events[0].retries)
+        self.assertEqual(200, self.events[0].status_code)
+        self.assertEqual('unknown', self.events[0].operation)
+
+    def test_error(self):
+        self.requests_mock.get(
+            API_BASE_URL + '/executions/123',
+            exc=requests.exceptions.ConnectionError
+        )
+
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            self.client.get,
+            '/executions/123'
+        )
+
+        self.assertIsNone(self.events[0].status_code)
+        self.assertIsInstance(self.events[0].error,
+                              requests.exceptions.ConnectionError)
+
+    def test_failing_hook(self):
+        self.requests_mock.get(API_BASE_URL + '/executions/123', json={})
+
+        hook = mock.Mock(side_effect=ValueError)
+        self.client.add_request_hook(hook)
+
+        self.client.get('/executions/123')
+
+        hook.assert_called_once()
+        self.assertEqual(1, len(self.events))
+
+        self.client.remove_request_hook(hook)
+        self.client.get('/executions/123')
+
+        hook.assert_called_once()
+        self.assertEqual(2, len(self.events))
@@ -0,0 +1,104 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from oslo_serialization import jsonutils
+from oslotest import base
+
+from mistralclient.api import json_stream
+
+DOCUMENT = {
+    'next': 'http://localhost:8989/v2/executions?marker=abc',
+    'meta': {'tricky': ['}', ']', '"{[', '\\']},
+    'executions': [
+        {
+            'id': str(i),
+            'input': '{"a": "b\\"}"}',
+            'params': {'nested': [1, 2, {'x': None}]},
+            'description': 'Привет ✓' * i
+        }
+        for i in range(20)
+    ] + [1, 'str', None, 2.5, True, []],
+    'after': 1
+}
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class JSONArrayParserTest(base.BaseTestCase):
+
+    def test_parse_in_chunks(self):
+        data = jsonutils.dump_as_bytes(DOCUMENT)
+
+        for size in (1, 2, 3, 7, 64, len(data)):
+            items = list(
+                json_stream.iter_json_array(_chunks(data, size), 'executions')
+            )
+
+            self.assertEqual(DOCUMENT['executions'], items)
+
+    def test_parse_str_chunks(self):
+        data = jsonutils.dumps(DOCUMENT)
+
+        items = list(
+            json_stream.iter_json_array(_chunks(data, 5), 'executions')
+        )
+
+        self.assertEqual(DOCUMENT['executions'], items)
+
+    def test_items_are_returned_early(self):
+        parser = json_stream.JSONArrayParser('tasks')
+
+        self.assertEqual(
+            [{'id': '1'}],
+            parser.feed(b'{"tasks": [{"id": "1"}, {"id"')
+        )
+        self.assertEqual([{'id': '2'}], parser.feed(b': "2"}, '))
+        self.assertEqual([], parser.feed(b']}'))
+        self.assertEqual([], parser.close())
+
+    def test_top_level_array(self):
+        self.assertEqual(
+            [1.5, 23, {'a': [1]}],
+            list(json_stream.iter_json_array(
+                [b' [1.', b'5, 2', b'3, {"a": [1]}]']
+            ))
+        )
+
+    def test_empty_array(self):
+        self.assertEqual(
+            [],
+            list(json_stream.iter_json_array([b'{"tasks": []}'], 'tasks'))
+        )
+
+    def test_missing_key(self):
+        self.assertRaises(
+            KeyError,
+            list,
+            json_stream.iter_json_array([b'{"a": [1]}'], 'tasks')
+        )
+
+    def test_incomplete_document(self):
+        for data in (b'{"tasks": [{"id": 1}', b'{"tasks": [1, 2', b'{"ta'):
+            self.assertRaises(
+                ValueError,
+                list,
+                json_stream.iter_json_array([data], 'tasks')
+            )
+
+    def test_invalid_document(self):
+        self.assertRaises(
+            ValueError,
+            list,
+            json_stream.iter_json_array([b'{"tasks": {"id": 1}}'], 'tasks')
+        )
@@ -0,0 +1,173 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from concurrent import futures
+from unittest import mock
+
+from oslotest import base
+
+from mistralclient.api import httpclient
+from mistralclient.api import rate_limit
+from mistralclient.api import timeouts
+from mistralclient.tests.unit import base as test_base
+
+API_BASE_URL = 'http://localhost:8989/v2'
+
+
+class RateLimiterTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(RateLimiterTest, self).setUp()
+
+        patcher = mock.patch('time.monotonic', return_value=100)
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalid_rate(self):
+        self.assertRaises(ValueError, rate_limit.RateLimiter, rate=0)
+
+    def test_global(self):
+        limiter = rate_limit.RateLimiter(rate=2)
+
+        self.assertEqual(
+            [0, 0, 0.5, 1.0],
+            [limiter.reserve('ExecutionManager.get', 'get')
+             for _ in range(4)]
+        )
+
+        # The bucket is refilled over time.
+        self.monotonic.return_value = 102
+
+        self.assertEqual(0, limiter.reserve('ExecutionManager.get', 'get'))
+
+    def test_burst(self):
+        limiter = rate_limit.RateLimiter(rate=10, burst=1)
+
+        self.assertEqual(0, limiter.reserve('TaskManager.list', 'get'))
+        self.assertEqual(0.1, limiter.reserve('TaskManager.list', 'get'))
+
+    def test_max_delay(self):
+        limiter = rate_limit.RateLimiter(rate=1)
+
+        self.assertEqual(0, limiter.reserve('TaskManager.get', 'get'))
+
+        # The token isn't taken if the request would wait too long.
+        self.assertEqual(
+            1.0,
+            limiter.reserve('TaskManager.get', 'get', max_delay=0.5)
+        )
+        self.assertEqual(1.0, limiter.reserve('TaskManager.get', 'get'))
+        self.assertEqual(2, limiter.get_stats()['TaskManager.get']['requests'])
+
+    def test_limits(self):
+        limiter = rate_limit.RateLimiter(
+            limits={
+                'ExecutionManager.create': 1,
+                'ActionExecutionManager': (2, 1),
+                'delete': 1
+            }
+        )
+
+        for _ in range(3):
+            limiter.reserve('ExecutionManager.create', 'post')
+            limiter.reserve('ExecutionManager.get', 'get')
+            limiter.reserve('ActionExecutionManager.create', 'post')
+            limiter.reserve('WorkflowManager.delete', 'delete')
+
+        stats = limiter.get_stats()
+
+        self.assertEqual(
+            {'requests': 3, 'delayed': 2, 'wait_time': 3.0, 'max_wait': 2.0},
+            stats['ExecutionManager.create']
+        )
+        self.assertEqual(0, stats['ExecutionManager.get']['delayed'])
+        self.assertEqual(1.0, stats['ActionExecutionManager.create']
+                         ['max_wait'])
+        self.assertEqual(2, stats['WorkflowManager.delete']['delayed'])
+
+
+class HTTPClientRateLimitTest(test_base.BaseClientTest):
+
+    def setUp(self):
+        super(HTTPClientRateLimitTest, self).setUp()
+
+        self.requests_mock.post(API_BASE_URL + '/executions', json={})
+
+    def _create(self, client):
+        with httpclient.operation('ExecutionManager.create'):
+            return client.post('/executions', '{}')
+
+    @mock.patch('time.sleep')
+    def test_rate(self, sleep_mock):
+        client = httpclient.HTTPClient(API_BASE_URL, rate_limit=1000)
+
+        self.assertIsInstance(client.rate_limiter, rate_limit.RateLimiter)
+
+        self._create(client)
+
+        sleep_mock.assert_not_called()
+        self.assertEqual(
+            1,
+            client.get_rate_limit_stats()['ExecutionManager.create']
+            ['requests']
+        )
+
+    def test_no_rate_limit(self):
+        client = httpclient.HTTPClient(API_BASE_URL)
+
+        self.assertIsNone(client.get_rate_limit_stats())
+
+    @mock.patch('time.sleep')
+    @mock.patch('time.monotonic', return_value=100)
+    def test_shared_by_threads(self, monotonic_mock, sleep_mock):
+        limiter = rate_limit.RateLimiter(
+            limits={'ExecutionManager.create': (50, 1)}
+        )
+        client = httpclient.HTTPClient(API_BASE_URL, rate_limit=limiter)
+
+        with futures.ThreadPoolExecutor(5) as executor:
+            for f in [executor.submit(self._create, client)
+                      for _ in range(6)]:
+                f.result()
+
+        # 5 of the requests wait for a token, 20 ms apart.
+        self.assertEqual(
+            [0.02, 0.04, 0.06, 0.08, 0.1],
+            sorted(c[0][0] for c in sleep_mock.call_args_list)
+        )
+        self.assertEqual(6, self.requests_mock.call_count)
+
+        stats = client.get_rate_limit_stats()['ExecutionManager.create']
+
+        self.assertEqual(5, stats['delayed'])
+        self.assertEqual(0.1, stats['max_wait'])
+
+    def test_deadline(self):
+        limiter = rate_limit.RateLimiter(rate=1)
+        client = httpclient.HTTPClient(API_BASE_URL, rate_limit=limiter)
+
+        self._create(client)
+
+        with timeouts.deadline(0.5):
+            self.assertRaises(
+                timeouts.DeadlineExceeded,
+                self._create,
+                client
+            )
+
+        self.assertEqual(1, self.requests_mock.call_count)
+
+        # The rejected request didn't take a token.
+        self.assertLessEqual(
+            limiter.reserve('ExecutionManager.create', 'post'),
+            1.0
+        )
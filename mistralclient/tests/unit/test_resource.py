@@ -0,0 +1,123 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import copy
+import operator
+import pickle
+from unittest import mock
+
+from oslo_serialization import jsonutils
+from oslotest import base
+
+from mistralclient.api import base as api_base
+from mistralclient.api.v2 import environments
+from mistralclient.api.v2 import executions
+
+
+EXEC = {
+    'id': '123',
+    'workflow_name': 'wf',
+    'state': 'SUCCESS',
+    'tags': ['a', 'b']
+}
+
+
+class ResourceTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(ResourceTest, self).setUp()
+
+        self.ex = executions.Execution(None, copy.deepcopy(EXEC))
+
+    def test_fields(self):
+        self.assertEqual('123', self.ex.id)
+        self.assertEqual('SUCCESS', self.ex.state)
+        self.assertEqual('Execution', self.ex.resource_name)
+
+        # Fields are not copied.
+        self.assertIs(self.ex._data, vars(self.ex))
+        self.assertIn('workflow_name', dir(self.ex))
+
+        self.assertRaises(AttributeError, getattr, self.ex, 'output')
+        self.assertFalse(hasattr(self.ex, 'output'))
+
+    def test_set_attribute(self):
+        self.ex.state = 'ERROR'
+
+        self.assertEqual('ERROR', self.ex.state)
+        self.assertEqual('ERROR', self.ex.to_dict()['state'])
+
+    def test_to_dict(self):
+        d = self.ex.to_dict()
+
+        self.assertEqual(EXEC, d)
+
+        d['tags'].append('c')
+        d['state'] = 'ERROR'
+
+        self.assertEqual(['a', 'b'], self.ex.tags)
+        self.assertEqual('SUCCESS', self.ex.state)
+
+    def test_to_mapping(self):
+        mapping = self.ex.to_mapping()
+
+        self.assertEqual(EXEC, mapping)
+        self.assertRaises(TypeError, operator.setitem, mapping, 'state', '')
+
+    def test_defaults(self):
+        class Resource(api_base.Resource):
+            defaults = {'state': 'IDLE', 'tags': []}
+
+        resource = Resource(None, {'id': '1', 'state': 'RUNNING'})
+
+        self.assertEqual('RUNNING', resource.state)
+        self.assertEqual([], resource.tags)
+
+    def test_pickle(self):
+        ex = pickle.loads(pickle.dumps(self.ex))
+
+        self.assertEqual(EXEC, ex.to_dict())
+
+    def test_get_decoded(self):
+        ex = executions.Execution(
+            None,
+            {'id': '123', 'input': '{"x": 1}', 'output': 'not JSON'}
+        )
+
+        with mock.patch.object(jsonutils, 'loads',
+                               wraps=jsonutils.loads) as loads_mock:
+            self.assertEqual({'x': 1}, ex.get_decoded('input'))
+            self.assertIs(ex.get_decoded('input'), ex.get_decoded('input'))
+
+            loads_mock.assert_called_once_with('{"x": 1}')
+
+        # The raw string is kept.
+        self.assertEqual('{"x": 1}', ex.input)
+        self.assertEqual('{"x": 1}', ex.to_dict()['input'])
+
+        ex.input = '{"x": 2}'
+
+        self.assertEqual({'x': 2}, ex.get_decoded('input'))
+
+        self.assertRaises(ValueError, ex.get_decoded, 'output')
+        self.assertRaises(AttributeError, ex.get_decoded, 'params')
+
+    def test_environment_variables(self):
+        env = environments.Environment(
+            None,
+            {'name': 'env', 'variables': '{"x": 1}'}
+        )
+
+        # Decoded on first access.
+        self.assertFalse(hasattr(env, '_decoded'))
+        self.assertEqual({'x': 1}, env.variables)
+        self.assertEqual('{"x": 1}', env.to_dict()['variables'])
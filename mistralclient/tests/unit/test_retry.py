@@ -0,0 +1,223 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from unittest import mock
+
+from keystoneauth1 import exceptions as ks_exceptions
+from oslotest import base
+import requests
+
+from mistralclient.api import httpclient
+from mistralclient.api import retry
+from mistralclient.tests.unit import base as test_base
+
+API_BASE_URL = 'http://localhost:8989/v2'
+API_URL = '/executions'
+
+EXPECTED_URL = API_BASE_URL + API_URL
+
+
+class RetryPolicyTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(RetryPolicyTest, self).setUp()
+
+        self.policy = retry.RetryPolicy(
+            max_retries=3,
+            backoff_factor=1,
+            backoff_max=5,
+            jitter=False,
+            total_timeout=20
+        )
+
+    @staticmethod
+    def _response(status_code, headers=None):
+        resp = requests.Response()
+        resp.status_code = status_code
+        resp.headers.update(headers or {})
+
+        return resp
+
+    def test_exponential_backoff(self):
+        delays = [
+            self.policy.get_retry_delay('get', i, 0, self._response(503))
+            for i in range(4)
+        ]
+
+        self.assertEqual([1, 2, 4, None], delays)
+
+    def test_backoff_max(self):
+        self.policy.max_retries = 10
+
+        self.assertEqual(5, self.policy.get_backoff(8))
+
+    def test_jitter(self):
+        self.policy.jitter = True
+
+        with mock.patch('random.uniform', return_value=0.3) as uniform:
+            self.assertEqual(0.3, self.policy.get_backoff(2))
+
+        uniform.assert_called_once_with(0, 4)
+
+    def test_only_safe_methods(self):
+        for method in ('post', 'put', 'delete'):
+            self.assertIsNone(
+                self.policy.get_retry_delay(method, 0, 0, self._response(503))
+            )
+
+        self.assertIsNotNone(
+            self.policy.get_retry_delay('get', 0, 0, self._response(503))
+        )
+
+    def test_status_codes(self):
+        for status in (200, 400, 404, 500):
+            resp = self._response(status)
+
+            self.assertIsNone(self.policy.get_retry_delay('get', 0, 0, resp))
+
+    def test_connection_errors(self):
+        for error in (requests.exceptions.ConnectionError(),
+                      requests.exceptions.ReadTimeout(),
+                      ks_exceptions.ConnectFailure()):
+            self.assertEqual(
+                1,
+                self.policy.get_retry_delay('get', 0, 0, error=error)
+            )
+
+        self.assertIsNone(
+            self.policy.get_retry_delay('get', 0, 0, error=ValueError())
+        )
+
+    def test_retry_after(self):
+        resp = self._response(503, {'Retry-After': '7'})
+
+        self.assertEqual(7, self.policy.get_retry_delay('get', 0, 0, resp))
+
+    def test_retry_after_http_date(self):
+        resp = self._response(
+            503,
+            {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+        )
+
+        self.assertEqual(0, self.policy.get_retry_delay('get', 0, 0, resp))
+
+    def test_total_timeout(self):
+        resp = self._response(503)
+
+        self.assertEqual(2, self.policy.get_retry_delay('get', 1, 18, resp))
+        self.assertIsNone(self.policy.get_retry_delay('get', 1, 18.5, resp))
+
+        resp = self._response(503, {'Retry-After': '30'})
+
+        self.assertIsNone(self.policy.get_retry_delay('get', 0, 0, resp))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(1.5, retry.parse_retry_after('1.5'))
+        self.assertEqual(0, retry.parse_retry_after('-1'))
+        self.assertIsNone(retry.parse_retry_after('soon'))
+        self.assertIsNone(retry.parse_retry_after(None))
+
+
+@mock.patch('time.sleep')
+class HTTPClientRetryTest(test_base.BaseClientTest):
+
+    def setUp(self):
+        super(HTTPClientRetryTest, self).setUp()
+
+        self.client = httpclient.HTTPClient(
+            API_BASE_URL,
+            retry_policy=retry.RetryPolicy(backoff_factor=1, jitter=False)
+        )
+
+    def test_retry_get(self, sleep_mock):
+        m = self.requests_mock.get(
+            EXPECTED_URL,
+            [
+                {'status_code': 503},
+                {'exc': requests.exceptions.ConnectionError},
+                {'status_code': 200, 'json': {}}
+            ]
+        )
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(3, m.call_count)
+        self.assertEqual(
+            [mock.call(1), mock.call(2)],
+            sleep_mock.call_args_list
+        )
+
+        self.assertEqual(
+            {'unknown': {'retries': 2, 'wait_time': 3.0}},
+            self.client.get_retry_stats()
+        )
+
+    def test_retries_exhausted(self, sleep_mock):
+        m = self.requests_mock.get(EXPECTED_URL, status_code=502)
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual(502, resp.status_code)
+        self.assertEqual(4, m.call_count)
+
+    def test_connection_error_reraised(self, sleep_mock):
+        self.requests_mock.get(
+            EXPECTED_URL,
+            exc=requests.exceptions.ConnectionError
+        )
+
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            self.client.get,
+            API_URL
+        )
+
+        self.assertEqual(3, sleep_mock.call_count)
+
+    def test_no_retry_post(self, sleep_mock):
+        m = self.requests_mock.post(EXPECTED_URL, status_code=503)
+
+        resp = self.client.post(API_URL, '{}')
+
+        self.assertEqual(503, resp.status_code)
+        self.assertEqual(1, m.call_count)
+        self.assertFalse(sleep_mock.called)
+
+    def test_no_retry_policy(self, sleep_mock):
+        client = httpclient.HTTPClient(API_BASE_URL)
+        m = self.requests_mock.get(EXPECTED_URL, status_code=503)
+
+        client.get(API_URL)
+
+        self.assertEqual(1, m.call_count)
+        self.assertEqual({}, client.get_retry_stats())
+
+    def test_default_retry_policy(self, sleep_mock):
+        client = httpclient.HTTPClient(API_BASE_URL, retry_policy=True)
+
+        self.assertIsInstance(client.retry_policy, retry.RetryPolicy)
+
+    def test_retry_stats_by_operation(self, sleep_mock):
+        self.requests_mock.get(
+            EXPECTED_URL,
+            [{'status_code': 503}, {'status_code': 200}]
+        )
+
+        with httpclient.operation('ExecutionManager.list'):
+            with httpclient.operation('ExecutionManager.find'):
+                self.client.get(API_URL)
+
+        self.assertEqual(
+            {'ExecutionManager.list': {'retries': 1, 'wait_time': 1.0}},
+            self.client.get_retry_stats()
+        )
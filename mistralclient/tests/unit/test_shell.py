@@ -12,8 +12,13 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import os
 from unittest import mock
 
+import fixtures
+
+from mistralclient.api import cassettes
+from mistralclient.api import tracing
 import mistralclient.tests.unit.base_shell_test as base
 
 
@@ -198,6 +203,63 @@ class TestShell(base.BaseShellTests):
 
         self.assertEqual('default', params[1]['project_domain_id'])
 
+    @mock.patch('mistralclient.api.client.client')
+    def test_timeouts(self, client_mock):
+        self.shell('--read-timeout=300 workbook-list')
+
+        self.assertTrue(client_mock.called)
+
+        params = client_mock.call_args
+
+        self.assertEqual(300.0, params[1]['read_timeout'])
+        self.assertNotIn('connect_timeout', params[1])
+
+    @mock.patch('mistralclient.api.client.client')
+    def test_slow_call_threshold(self, client_mock):
+        self.shell('--slow-call-threshold=2.5 --slow-call-log=/tmp/slow.log '
+                   'execution-list')
+
+        self.assertTrue(client_mock.called)
+
+        params = client_mock.call_args
+
+        self.assertEqual(2.5, params[1]['slow_call_threshold'])
+        self.assertEqual('/tmp/slow.log', params[1]['slow_call_log'])
+
+    @mock.patch('mistralclient.api.client.client')
+    def test_record_file(self, client_mock):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'cassette.json')
+
+        self.shell('--record-file=%s execution-list' % path)
+
+        self.assertTrue(client_mock.called)
+
+        recorder = client_mock.call_args[1]['transport']
+
+        self.assertIsInstance(recorder, cassettes.RecordingTransport)
+        # Saved once the command has run.
+        self.assertTrue(os.path.exists(path))
+
+    @mock.patch('mistralclient.api.client.client')
+    def test_trace_file(self, client_mock):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'spans.json')
+
+        self.shell('--trace-file=%s --trace-format=otlp execution-list' %
+                   path)
+
+        self.assertTrue(client_mock.called)
+
+        tracer = client_mock.call_args[1]['tracer']
+
+        self.assertIsInstance(tracer.exporter, tracing.OTLPFileExporter)
+        self.assertEqual(path, tracer.exporter.path)
+
+        # The command is the root span.
+        with open(path) as f:
+            self.assertIn('"name": "execution-list"', f.read())
+
     @mock.patch('mistralclient.api.client.client')
     def test_user_domain_name(self, client_mock):
         self.shell('--os-user-domain-name=default workbook-list')
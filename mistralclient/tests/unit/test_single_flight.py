@@ -0,0 +1,168 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import threading
+import time
+
+from oslotest import base
+
+from mistralclient.api import single_flight
+from mistralclient.api import timeouts
+
+
+class SingleFlightTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(SingleFlightTest, self).setUp()
+
+        self.flight = single_flight.SingleFlight()
+
+    def _call_concurrently(self, key, func, count):
+        """Makes one call and ``count`` identical ones while it runs."""
+        results = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def _leader():
+            started.set()
+            release.wait(5)
+
+            return func()
+
+        def _run(f):
+            try:
+                results.append(self.flight.call(key, f))
+            except ValueError as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=_run, args=(_leader,))]
+        threads[0].start()
+        started.wait(5)
+
+        threads += [
+            threading.Thread(target=_run, args=(func,)) for _ in range(count)
+        ]
+
+        for t in threads[1:]:
+            t.start()
+
+        while self.flight.get_stats()['coalesced'] < count:
+            time.sleep(0.001)
+
+        release.set()
+
+        for t in threads:
+            t.join(5)
+
+        return results
+
+    def test_call(self):
+        calls = []
+
+        def _func():
+            calls.append(1)
+
+            return 'result'
+
+        results = self._call_concurrently('key', _func, 3)
+
+        self.assertEqual(['result'] * 4, results)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(
+            {'calls': 1, 'coalesced': 3},
+            self.flight.get_stats()
+        )
+
+        # Calls made after the first one has completed run again.
+        self.assertEqual('result', self.flight.call('key', _func))
+        self.assertEqual(2, len(calls))
+
+    def test_call_error(self):
+        error = ValueError('error')
+
+        def _func():
+            raise error
+
+        results = self._call_concurrently('key', _func, 2)
+
+        self.assertEqual([error] * 3, results)
+
+    def test_different_keys(self):
+        self.assertEqual(1, self.flight.call('a', lambda: 1))
+        self.assertEqual(2, self.flight.call('b', lambda: 2))
+        self.assertEqual(0, self.flight.get_stats()['coalesced'])
+
+    def test_deadline(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def _leader():
+            started.set()
+            release.wait(5)
+
+            return 'result'
+
+        leader = threading.Thread(target=self.flight.call,
+                                  args=('key', _leader))
+        leader.start()
+        self.addCleanup(leader.join, 5)
+        self.addCleanup(release.set)
+        started.wait(5)
+
+        with timeouts.deadline(0.05):
+            self.assertRaises(
+                timeouts.DeadlineExceeded,
+                self.flight.call,
+                'key',
+                lambda: 'other'
+            )
+
+        self.assertEqual(1, self.flight.get_stats()['coalesced'])
+
+    def test_deadline_of_first_call(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def _leader():
+            started.set()
+            release.wait(5)
+
+            # The deadline of the first call has passed meanwhile.
+            raise timeouts.DeadlineExceeded(0.01)
+
+        def _release():
+            while self.flight.get_stats()['coalesced'] < 1:
+                time.sleep(0.001)
+
+            release.set()
+
+        leader = threading.Thread(target=self.assertRaises,
+                                  args=(timeouts.DeadlineExceeded,
+                                        self.flight.call, 'key', _leader))
+        leader.start()
+        self.addCleanup(leader.join, 5)
+        started.wait(5)
+
+        releaser = threading.Thread(target=_release)
+        releaser.start()
+        self.addCleanup(releaser.join, 5)
+
+        with timeouts.deadline(5):
+            self.assertEqual(
+                'result',
+                self.flight.call('key', lambda: 'result')
+            )
+
+        self.assertEqual(
+            {'calls': 2, 'coalesced': 1},
+            self.flight.get_stats()
+        )
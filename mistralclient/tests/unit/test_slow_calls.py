@@ -0,0 +1,109 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os
+from unittest import mock
+
+import fixtures
+from oslo_serialization import jsonutils
+
+from mistralclient.api import httpclient
+from mistralclient.api import slow_calls
+from mistralclient.tests.unit import base as test_base
+
+API_BASE_URL = 'http://localhost:8989/v2'
+
+
+class SlowCallLogTest(test_base.BaseClientTest):
+
+    def setUp(self):
+        super(SlowCallLogTest, self).setUp()
+
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'slow.log')
+
+        self.requests_mock.get(
+            API_BASE_URL + '/executions',
+            json={'executions': [{'id': str(i)} for i in range(100)]}
+        )
+
+        # Every request takes 2 seconds.
+        patcher = mock.patch('time.monotonic', side_effect=range(0, 100, 2))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _read_records(self):
+        with open(self.path) as f:
+            return [jsonutils.loads(line) for line in f]
+
+    def _list(self, client):
+        with httpclient.operation('ExecutionManager.list'):
+            client.get('/executions?limit=100&task=123')
+
+    def test_slow_call(self):
+        client = httpclient.HTTPClient(
+            API_BASE_URL,
+            slow_call_threshold=1.0,
+            slow_call_log=self.path
+        )
+        log = client.request_hooks[0]
+        log.sample_size = 20
+
+        self._list(client)
+        log.close()
+
+        records = self._read_records()
+
+        self.assertEqual(1, len(records))
+
+        record = records[0]
+
+        self.assertEqual('ExecutionManager.list', record['operation'])
+        self.assertEqual('/executions', record['url_template'])
+        self.assertEqual({'limit': ['100'], 'task': ['123']},
+                         record['query'])
+        self.assertEqual(200, record['status_code'])
+        self.assertEqual(2, record['timing']['duration'])
+        self.assertEqual(0, record['timing']['retries'])
+        self.assertEqual('{"executions": [{"id', record['response_sample'])
+        self.assertTrue(record['response_truncated'])
+
+    def test_fast_call(self):
+        log = slow_calls.SlowCallLog(5.0, self.path)
+        client = httpclient.HTTPClient(API_BASE_URL, request_hooks=[log])
+
+        self._list(client)
+        log.close()
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_rotation(self):
+        log = slow_calls.SlowCallLog(1.0, self.path, max_bytes=1000,
+                                     backup_count=2)
+        client = httpclient.HTTPClient(API_BASE_URL, request_hooks=[log])
+
+        for _ in range(5):
+            self._list(client)
+
+        log.close()
+
+        self.assertTrue(os.path.exists(self.path + '.2'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+    def test_no_file(self):
+        log = slow_calls.SlowCallLog(1.0)
+        client = httpclient.HTTPClient(API_BASE_URL, request_hooks=[log])
+
+        with mock.patch.object(slow_calls.LOG, 'warning') as warning:
+            self._list(client)
+
+        warning.assert_called_once()
@@ -0,0 +1,195 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from http import server
+import threading
+from unittest import mock
+
+from oslotest import base
+import requests
+
+from mistralclient.api import httpclient
+from mistralclient.api import retry
+from mistralclient.api import timeouts
+from mistralclient.tests.unit import base as test_base
+
+API_BASE_URL = 'http://localhost:8989/v2'
+
+
+class TimeoutsTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(TimeoutsTest, self).setUp()
+
+        patcher = mock.patch('time.monotonic', return_value=100)
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_default(self):
+        self.assertEqual((10, 60), timeouts.get_timeout(10, 60))
+        self.assertEqual((None, None), timeouts.get_timeout(None, None))
+        self.assertIsNone(timeouts.get_remaining())
+
+    def test_timeout(self):
+        with timeouts.timeout(read=300):
+            self.assertEqual((10, 300), timeouts.get_timeout(10, 60))
+
+            with timeouts.timeout(connect=1, read=2):
+                self.assertEqual((1, 2), timeouts.get_timeout(10, 60))
+
+        self.assertEqual((10, 60), timeouts.get_timeout(10, 60))
+
+    def test_deadline(self):
+        with timeouts.deadline(30):
+            self.assertEqual((10, 30), timeouts.get_timeout(10, 60))
+            self.assertEqual((30, 30), timeouts.get_timeout(None, None))
+
+            self.monotonic.return_value = 125
+
+            self.assertEqual((5, 5), timeouts.get_timeout(10, 60))
+            self.assertEqual(5, timeouts.get_remaining())
+
+            self.monotonic.return_value = 130
+
+            e = self.assertRaises(
+                timeouts.DeadlineExceeded,
+                timeouts.get_timeout,
+                10,
+                60
+            )
+
+            self.assertIsInstance(e, TimeoutError)
+            self.assertEqual(30, e.budget)
+
+    def test_nested_deadline(self):
+        with timeouts.deadline(30):
+            with timeouts.deadline(60):
+                self.assertEqual(30, timeouts.get_remaining())
+
+            with timeouts.deadline(5):
+                self.assertEqual(5, timeouts.get_remaining())
+
+            self.assertEqual(30, timeouts.get_remaining())
+
+
+class HTTPClientTimeoutsTest(test_base.BaseClientTest):
+
+    def setUp(self):
+        super(HTTPClientTimeoutsTest, self).setUp()
+
+        self.client = httpclient.HTTPClient(API_BASE_URL)
+
+    def test_default_timeouts(self):
+        self.requests_mock.get(API_BASE_URL + '/executions', json={})
+
+        self.client.get('/executions')
+
+        self.assertEqual((10.0, 60.0), self.requests_mock.last_request.timeout)
+
+    def test_client_timeouts(self):
+        client = httpclient.HTTPClient(
+            API_BASE_URL,
+            connect_timeout=2,
+            read_timeout=None
+        )
+
+        self.requests_mock.get(API_BASE_URL + '/executions', json={})
+
+        client.get('/executions')
+
+        self.assertEqual((2, None), self.requests_mock.last_request.timeout)
+
+    def test_call_timeouts(self):
+        self.requests_mock.get(API_BASE_URL + '/executions', json={})
+
+        with timeouts.timeout(read=300):
+            self.client.get('/executions')
+
+        self.assertEqual((10.0, 300), self.requests_mock.last_request.timeout)
+
+    def test_deadline_exhausted(self):
+        self.requests_mock.get(API_BASE_URL + '/executions', json={})
+
+        with timeouts.deadline(0):
+            self.assertRaises(
+                timeouts.DeadlineExceeded,
+                self.client.get,
+                '/executions'
+            )
+
+        self.assertEqual(0, self.requests_mock.call_count)
+
+    @mock.patch('time.sleep')
+    def test_deadline_stops_retries(self, sleep_mock):
+        client = httpclient.HTTPClient(
+            API_BASE_URL,
+            retry_policy=retry.RetryPolicy(backoff_factor=5, jitter=False)
+        )
+
+        self.requests_mock.get(API_BASE_URL + '/executions', status_code=503)
+
+        with timeouts.deadline(8):
+            resp = client.get('/executions')
+
+        # The second retry would wait 10 seconds, longer than the time left.
+        self.assertEqual(503, resp.status_code)
+        self.assertEqual(2, self.requests_mock.call_count)
+        sleep_mock.assert_called_once_with(5)
+
+
+class _HangingHandler(server.BaseHTTPRequestHandler):
+    """Holds the requests until the end of the test."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.release.wait(5)
+
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPClientDeadlineTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(HTTPClientDeadlineTest, self).setUp()
+
+        http_server = self.useFixture(test_base.HTTPServer(_HangingHandler))
+        http_server.server.release = threading.Event()
+
+        self.addCleanup(http_server.server.release.set)
+
+        self.client = httpclient.HTTPClient(http_server.url)
+
+    def test_hung_server(self):
+        with timeouts.deadline(0.1):
+            e = self.assertRaises(
+                timeouts.DeadlineExceeded,
+                self.client.get,
+                '/executions'
+            )
+
+        self.assertIsInstance(e.__cause__, requests.exceptions.ReadTimeout)
+
+    def test_read_timeout(self):
+        client = httpclient.HTTPClient(self.client.base_url, read_timeout=0.1)
+
+        self.assertRaises(
+            requests.exceptions.ReadTimeout,
+            client.get,
+            '/executions'
+        )
@@ -0,0 +1,180 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import contextvars
+import os
+
+import fixtures
+from oslo_serialization import jsonutils
+
+from mistralclient.api import base as api_base
+from mistralclient.api import tracing
+from mistralclient.api.v2 import client
+from mistralclient.tests.unit import base
+
+TEST_URL = 'http://mistral.example.com'
+
+
+class TracingTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(TracingTest, self).setUp()
+
+        self.exporter = tracing.MemoryExporter()
+        self.client = client.Client(
+            mistral_url=TEST_URL,
+            tracer=tracing.Tracer(self.exporter)
+        )
+
+        self.requests_mock.get(
+            TEST_URL + '/executions',
+            json={'executions': [{'id': '1'}, {'id': '2'}]}
+        )
+
+    def _get_spans(self, kind):
+        return [s for s in self.exporter.spans if s.kind == kind]
+
+    def test_operation(self):
+        self.client.executions.list()
+
+        root, = self._get_spans(tracing.OPERATION)
+        http, = self._get_spans(tracing.HTTP)
+        decode, = self._get_spans(tracing.JSON)
+        build, = self._get_spans(tracing.RESOURCE)
+
+        self.assertEqual('ExecutionManager.list', root.name)
+        self.assertIsNone(root.parent_id)
+
+        for s in (http, decode, build):
+            self.assertEqual(root.trace_id, s.trace_id)
+            self.assertEqual(root.span_id, s.parent_id)
+
+        self.assertEqual('GET /executions', http.name)
+        self.assertEqual(200, http.attributes['http.status_code'])
+        self.assertEqual('Execution', build.name)
+        self.assertEqual(2, build.attributes['count'])
+
+        breakdown = tracing.get_breakdown(self.exporter.spans)
+
+        self.assertEqual(
+            {tracing.OPERATION, tracing.HTTP, tracing.JSON,
+             tracing.RESOURCE},
+            set(breakdown)
+        )
+        self.assertLessEqual(breakdown[tracing.HTTP],
+                             breakdown[tracing.OPERATION])
+
+    def test_traces(self):
+        self.client.executions.list()
+        self.client.executions.list()
+
+        self.assertEqual(
+            2,
+            len({s.trace_id for s in self.exporter.spans})
+        )
+
+    def test_error(self):
+        self.requests_mock.get(TEST_URL + '/executions/123', status_code=404,
+                               json={'faultstring': 'Not found'})
+
+        self.assertRaises(
+            api_base.APIException,
+            self.client.executions.get,
+            '123'
+        )
+
+        root, = self._get_spans(tracing.OPERATION)
+        http, = self._get_spans(tracing.HTTP)
+
+        self.assertIn('APIException', root.attributes['error'])
+        self.assertEqual(404, http.attributes['http.status_code'])
+
+    def test_late_child(self):
+        tracer = self.client.http_client.tracer
+
+        with tracer.span('ExecutionManager.get') as root:
+            # E.g. a hedged request still running in another thread.
+            context = contextvars.copy_context()
+
+        self.assertEqual([root], self.exporter.spans)
+
+        def _late_child():
+            with tracer.span('decode', tracing.JSON):
+                pass
+
+        context.run(_late_child)
+
+        late = self.exporter.spans[-1]
+
+        self.assertEqual('decode', late.name)
+        self.assertEqual(root.span_id, late.parent_id)
+        self.assertEqual({}, tracer._pending)
+
+    def test_not_traced(self):
+        self.assertIsNone(tracing.get_current_span())
+
+        with tracing.span('decode', tracing.JSON) as s:
+            self.assertIsNone(s)
+
+        self.assertEqual([], self.exporter.spans)
+
+
+class ExporterTest(base.BaseClientTest):
+
+    def setUp(self):
+        super(ExporterTest, self).setUp()
+
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'spans.json')
+
+    def _trace(self, exporter):
+        tracer = tracing.Tracer(exporter)
+
+        with tracer.span('execution-list', tracing.CLI):
+            with tracer.span('ExecutionManager.list', retries=0):
+                pass
+
+    def _read(self):
+        with open(self.path) as f:
+            return [jsonutils.loads(line) for line in f]
+
+    def test_json_file(self):
+        self._trace(tracing.JSONFileExporter(self.path))
+        self._trace(tracing.JSONFileExporter(self.path))
+
+        traces = self._read()
+
+        self.assertEqual(2, len(traces))
+        self.assertEqual(
+            ['ExecutionManager.list', 'execution-list'],
+            [s['name'] for s in traces[0]]
+        )
+        self.assertEqual(traces[0][1]['span_id'], traces[0][0]['parent_id'])
+
+    def test_otlp_file(self):
+        self._trace(tracing.OTLPFileExporter(self.path))
+
+        request, = self._read()
+        resource_spans, = request['resourceSpans']
+        scope_spans, = resource_spans['scopeSpans']
+        child, root = scope_spans['spans']
+
+        self.assertEqual('execution-list', root['name'])
+        self.assertEqual('', root['parentSpanId'])
+        self.assertEqual(root['spanId'], child['parentSpanId'])
+        self.assertEqual(32, len(child['traceId']))
+        self.assertLessEqual(int(root['startTimeUnixNano']),
+                             int(child['startTimeUnixNano']))
+        self.assertIn(
+            {'key': 'retries', 'value': {'intValue': '0'}},
+            child['attributes']
+        )
@@ -0,0 +1,156 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import asyncio
+from http import server
+import os
+
+import fixtures
+from oslo_serialization import jsonutils
+from oslotest import base
+import requests
+import testtools
+
+from mistralclient.api import async_httpclient
+from mistralclient.api import httpclient
+from mistralclient.api import unix_socket
+from mistralclient.api.v2 import async_client
+from mistralclient.api.v2 import client
+from mistralclient.tests.unit import base as test_base
+
+SOCKET_URL = 'http+unix://%2Frun%2Fmistral%2Fapi.sock/v2'
+
+
+class UnixSocketURLTest(base.BaseTestCase):
+
+    def test_get_url(self):
+        self.assertEqual(
+            SOCKET_URL,
+            unix_socket.get_url('/run/mistral/api.sock')
+        )
+
+    def test_split_url(self):
+        self.assertEqual(
+            ('/run/mistral/api.sock', 'http://localhost/v2/executions?x=1'),
+            unix_socket.split_url(SOCKET_URL + '/executions?x=1')
+        )
+
+    def test_is_unix_socket_url(self):
+        self.assertTrue(unix_socket.is_unix_socket_url(SOCKET_URL))
+        self.assertFalse(
+            unix_socket.is_unix_socket_url('http://localhost:8989/v2')
+        )
+
+
+class _ExecutionHandler(server.BaseHTTPRequestHandler):
+    """Returns an execution along with the headers of the request."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = jsonutils.dump_as_bytes({
+            'id': '123',
+            'state': 'SUCCESS',
+            'params': jsonutils.dumps({
+                'path': self.path,
+                'host': self.headers['Host'],
+                'token': self.headers['X-Auth-Token']
+            })
+        })
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UnixSocketTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(UnixSocketTest, self).setUp()
+
+        self.socket_path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path,
+            'api.sock'
+        )
+
+        self.url = self.useFixture(
+            test_base.HTTPServer(_ExecutionHandler, self.socket_path)
+        ).url
+
+    def test_get(self):
+        mistral = client.Client(mistral_url=self.url, auth_token='token')
+
+        for _ in range(3):
+            ex = mistral.executions.get('123')
+
+        self.assertEqual(
+            {'path': '/v2/executions/123', 'host': 'localhost',
+             'token': 'token'},
+            jsonutils.loads(ex.params)
+        )
+        self.assertIsInstance(
+            mistral.http_client.pool_adapter,
+            httpclient.UnixSocketAdapter
+        )
+        self.assertFalse(mistral.http_client.session.trust_env)
+
+        stats = mistral.get_pool_stats()
+
+        self.assertEqual(1, stats['new_connections'])
+        self.assertEqual(2, stats['reused_connections'])
+
+    def test_no_socket(self):
+        http_client = httpclient.HTTPClient(
+            unix_socket.get_url(self.socket_path + '.missing')
+        )
+
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            http_client.get,
+            '/executions/123'
+        )
+
+    @testtools.skipIf(async_httpclient.httpx is None,
+                      'httpx is not installed')
+    def test_async_get(self):
+        mistral = async_client.AsyncClient(
+            mistral_url=self.url,
+            auth_token='token'
+        )
+
+        async def get():
+            try:
+                return await mistral.executions.get('123')
+            finally:
+                await mistral.close()
+
+        ex = asyncio.run(get())
+
+        self.assertEqual(
+            {'path': '/v2/executions/123', 'host': 'localhost',
+             'token': 'token'},
+            jsonutils.loads(ex.params)
+        )
+
+    @testtools.skipIf(async_httpclient.httpx is None,
+                      'httpx is not installed')
+    def test_async_mixed_endpoints(self):
+        self.assertRaises(
+            ValueError,
+            async_httpclient.AsyncHTTPClient,
+            [self.url, 'http://localhost:8989/v2']
+        )
@@ -0,0 +1,411 @@
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import asyncio
+import gzip
+from unittest import mock
+import urllib
+
+from oslo_serialization import jsonutils
+from oslotest import base
+import testtools
+
+from mistralclient.api import async_httpclient
+from mistralclient.api import base as api_base
+from mistralclient.api import hedging
+from mistralclient.api import instrumentation
+from mistralclient.api import retry
+from mistralclient.api import timeouts
+from mistralclient.api import tracing
+from mistralclient.api.v2 import async_client
+from mistralclient.api.v2 import executions
+
+httpx = async_httpclient.httpx
+
+TEST_URL = 'http://mistral.example.com'
+
+EXEC = {
+    'id': '123',
+    'workflow_name': 'my_wf',
+    'state': 'RUNNING'
+}
+
+
+@testtools.skipIf(httpx is None, 'httpx is not installed')
+class TestAsyncClientV2(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestAsyncClientV2, self).setUp()
+
+        self.requests = []
+        self.responses = {}
+
+        self.client = async_client.AsyncClient(
+            mistral_url=TEST_URL,
+            max_concurrency=3
+        )
+        self.client.http_client.async_session = httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle)
+        )
+
+    async def _handle(self, request):
+        self.requests.append(request)
+
+        key = (request.method, request.url.path)
+        handler = self.responses[key]
+
+        if callable(handler):
+            return await handler(request)
+
+        status, body = handler
+
+        return httpx.Response(status, json=body)
+
+    def _run(self, coro):
+        async def run():
+            try:
+                return await coro
+            finally:
+                await self.client.close()
+
+        return asyncio.run(run())
+
+    def test_managers(self):
+        self.assertIsInstance(
+            self.client.executions,
+            executions.ExecutionManager
+        )
+        self.assertEqual(
+            'AsyncExecutionManager',
+            type(self.client.executions).__name__
+        )
+
+    def test_no_requests_session(self):
+        http_client = self.client.http_client
+
+        self.assertIsNone(http_client.session)
+        self.assertIsNone(http_client.pool_adapter)
+        self.assertIsInstance(http_client.transport, httpx.AsyncClient)
+
+    def test_transport_option(self):
+        self.assertRaises(
+            ValueError,
+            async_httpclient.AsyncHTTPClient,
+            TEST_URL,
+            transport='http2'
+        )
+
+    def test_auth_headers(self):
+        client = async_client.AsyncClient(
+            mistral_url=TEST_URL,
+            auth_token='token',
+            project_id='project'
+        )
+        client.http_client.async_session = httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle)
+        )
+        self.responses[('GET', '/executions/123')] = (200, EXEC)
+
+        async def get():
+            async with client:
+                await client.executions.get('123')
+
+        asyncio.run(get())
+
+        self.assertEqual('token', self.requests[0].headers['X-Auth-Token'])
+        self.assertEqual('project', self.requests[0].headers['X-Project-Id'])
+
+    def test_sync_context_manager(self):
+        def use():
+            with self.client:
+                pass
+
+        self.assertRaises(TypeError, use)
+
+    def test_map(self):
+        self.assertRaises(
+            TypeError,
+            self.client.map,
+            self.client.executions.get,
+            ['123']
+        )
+
+    def test_get(self):
+        self.responses[('GET', '/executions/123')] = (200, EXEC)
+
+        ex = self._run(self.client.executions.get('123'))
+
+        self.assertIsInstance(ex, executions.Execution)
+        self.assertEqual(EXEC, ex.to_dict())
+
+    def test_get_not_found(self):
+        self.responses[('GET', '/executions/123')] = (
+            404,
+            {'faultstring': 'Not found'}
+        )
+
+        e = self.assertRaises(
+            api_base.APIException,
+            self._run,
+            self.client.executions.get('123')
+        )
+
+        self.assertEqual(404, e.error_code)
+        self.assertEqual('Not found', e.error_message)
+
+    def test_get_report(self):
+        report = {'root_workflow_execution': {}, 'statistics': {}}
+        self.responses[('GET', '/executions/123/report')] = (200, report)
+
+        self.assertEqual(
+            report,
+            self._run(self.client.executions.get_report('123'))
+        )
+
+    def test_create(self):
+        self.responses[('POST', '/executions')] = (201, EXEC)
+
+        ex = self._run(
+            self.client.executions.create('my_wf', workflow_input={'a': 1})
+        )
+
+        self.assertEqual('123', ex.id)
+
+        body = jsonutils.loads(self.requests[0].content)
+
+        self.assertEqual('my_wf', body['workflow_name'])
+        self.assertEqual(
+            'application/json',
+            self.requests[0].headers['content-type']
+        )
+
+    def test_create_compressed(self):
+        self.responses[('POST', '/executions')] = (201, EXEC)
+        self.client.http_client.compression_threshold = 100
+
+        self._run(
+            self.client.executions.create(
+                'my_wf',
+                workflow_input={'data': 'x' * 1000}
+            )
+        )
+
+        request = self.requests[0]
+        body = jsonutils.loads(gzip.decompress(request.content))
+
+        self.assertEqual('gzip', request.headers['content-encoding'])
+        self.assertEqual('my_wf', body['workflow_name'])
+
+        stats = self.client.http_client.get_transfer_stats()
+
+        self.assertLess(
+            stats['ExecutionManager.create']['request_wire_bytes'],
+            stats['ExecutionManager.create']['request_bytes']
+        )
+
+    def test_delete(self):
+        self.responses[('DELETE', '/executions/123')] = (204, None)
+
+        self.assertIsNone(self._run(self.client.executions.delete('123')))
+        self.assertEqual(1, len(self.requests))
+
+    def test_list_stream(self):
+        all_execs = [dict(EXEC, id=str(i)) for i in range(3)]
+
+        self.responses[('GET', '/tasks')] = (200, {'tasks': all_execs})
+
+        async def collect():
+            tasks = await self.client.tasks.list(stream=True)
+
+            return [t.id async for t in tasks]
+
+        self.assertEqual(['0', '1', '2'], self._run(collect()))
+
+    def test_find(self):
+        self.responses[('GET', '/executions')] = (
+            200,
+            {'executions': [EXEC, dict(EXEC, id='456', state='ERROR')]}
+        )
+
+        found = self._run(self.client.executions.find(state='ERROR'))
+
+        self.assertEqual(['456'], [ex.id for ex in found])
+
+    def test_iter_list(self):
+        all_execs = [dict(EXEC, id=str(i)) for i in range(5)]
+
+        async def list_execs(request):
+            params = urllib.parse.parse_qs(request.url.query.decode())
+            marker = params.get('marker', [None])[0]
+            limit = int(params['limit'][0])
+
+            start = int(marker) + 1 if marker else 0
+
+            return httpx.Response(
+                200,
+                json={'executions': all_execs[start:start + limit]}
+            )
+
+        self.responses[('GET', '/executions')] = list_execs
+
+        async def collect():
+            return [
+                ex.id async for ex in
+                self.client.executions.iter_list(page_size=2, state='ERROR')
+            ]
+
+        self.assertEqual(['0', '1', '2', '3', '4'], self._run(collect()))
+        self.assertEqual(3, len(self.requests))
+        self.assertIn(b'state=ERROR', self.requests[0].url.query)
+
+    def test_iter_list_not_supported(self):
+        self.assertTrue(hasattr(self.client.workflows, 'iter_list'))
+        self.assertFalse(hasattr(self.client.members, 'iter_list'))
+
+    def test_max_concurrency(self):
+        in_flight = []
+        peak = []
+
+        async def slow(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+
+            await asyncio.sleep(0.01)
+
+            in_flight.remove(request)
+
+            return httpx.Response(200, json=EXEC)
+
+        self.responses[('GET', '/executions/123')] = slow
+
+        async def get_many():
+            return await asyncio.gather(
+                *[self.client.executions.get('123') for _ in range(10)]
+            )
+
+        self.assertEqual(10, len(self._run(get_many())))
+        self.assertEqual(3, max(peak))
+
+    @mock.patch('asyncio.sleep')
+    def test_retry(self, sleep_mock):
+        responses = [
+            httpx.Response(503),
+            httpx.Response(200, json=EXEC)
+        ]
+
+        async def flaky(request):
+            return responses.pop(0)
+
+        self.responses[('GET', '/executions/123')] = flaky
+        self.client.http_client.retry_policy = retry.RetryPolicy(
+            jitter=False
+        )
+
+        ex = self._run(self.client.executions.get('123'))
+
+        self.assertEqual('123', ex.id)
+        sleep_mock.assert_called_once_with(0.5)
+        self.assertEqual(
+            {'ExecutionManager.get': {'retries': 1, 'wait_time': 0.5}},
+            self.client.get_retry_stats()
+        )
+
+    def test_request_hooks(self):
+        self.responses[('GET', '/executions/123')] = (200, EXEC)
+
+        histograms = instrumentation.LatencyHistograms()
+        self.client.http_client.add_request_hook(histograms)
+
+        self._run(self.client.executions.get('123'))
+
+        series = histograms.to_dict()
+
+        self.assertEqual(1, len(series))
+        self.assertEqual(
+            ('ExecutionManager.get', 'GET', '/executions/{id}', '200'),
+            (series[0]['operation'], series[0]['method'],
+             series[0]['url_template'], series[0]['status'])
+        )
+        self.assertEqual(1, series[0]['duration']['count'])
+        self.assertEqual(1, series[0]['ttfb']['count'])
+
+    def test_tracing(self):
+        self.responses[('GET', '/executions/123')] = (200, EXEC)
+
+        exporter = tracing.MemoryExporter()
+        tracer = tracing.Tracer(exporter)
+
+        self.client.http_client.tracer = tracer
+        self.client.http_client.add_request_hook(tracer)
+
+        self._run(self.client.executions.get('123'))
+
+        self.assertEqual(
+            [(tracing.HTTP, 'GET /executions/{id}'),
+             (tracing.JSON, 'decode'),
+             (tracing.RESOURCE, 'Execution'),
+             (tracing.OPERATION, 'ExecutionManager.get')],
+            [(s.kind, s.name) for s in exporter.spans]
+        )
+        self.assertEqual(1, len({s.trace_id for s in exporter.spans}))
+
+    def test_hedging(self):
+        self.client.http_client.hedging = hedging.HedgingPolicy(
+            initial_delay=0.01,
+            max_ratio=1
+        )
+
+        async def _handle(request):
+            if len(self.requests) == 1:
+                # The first request hangs until cancelled.
+                await asyncio.sleep(10)
+
+            return httpx.Response(200, json=EXEC)
+
+        self.responses[('GET', '/executions/123')] = _handle
+
+        ex = self._run(self.client.executions.get('123'))
+
+        self.assertEqual('123', ex.id)
+        self.assertEqual(2, len(self.requests))
+        self.assertEqual(
+            {'requests': 1, 'hedged': 1, 'hedge_wins': 1},
+            {
+                k: v for k, v in
+                self.client.get_hedging_stats()['ExecutionManager.get']
+                .items() if k != 'delay'
+            }
+        )
+
+    def test_deadline(self):
+        self.responses[('GET', '/executions/123')] = (200, EXEC)
+
+        async def get():
+            with timeouts.deadline(0):
+                await self.client.executions.get('123')
+
+        self.assertRaises(timeouts.DeadlineExceeded, self._run, get())
+        self.assertEqual([], self.requests)
+
+    def test_timeout(self):
+        self.responses[('GET', '/executions/123')] = (200, EXEC)
+
+        async def get():
+            with timeouts.timeout(read=300):
+                await self.client.executions.get('123')
+
+        self._run(get())
+
+        self.assertEqual(
+            {'connect': 10.0, 'read': 300, 'write': 300, 'pool': None},
+            self.requests[0].extensions['timeout']
+        )
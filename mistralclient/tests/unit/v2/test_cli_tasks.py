@@ -135,6 +135,31 @@ class TestCLITasksV2(base.BaseCommandTest):
             jsonutils.loads(self.app.stdout.write.call_args[0][0])
         )
 
+    def test_get_published_not_json(self):
+        self.client.tasks.get.return_value = tasks.Task(
+            mock,
+            dict(TASK_DICT, published='not JSON',
+                 published_global=jsonutils.dumps(TASK_PUBLISHED))
+        )
+
+        self.call(task_cmd.GetPublished, app_args=['id'])
+
+        self.app.stdout.write.assert_called_once_with('not JSON')
+
+    def test_get_published_global_not_json(self):
+        self.client.tasks.get.return_value = tasks.Task(
+            mock,
+            dict(TASK_DICT, published=jsonutils.dumps(TASK_PUBLISHED),
+                 published_global='not JSON')
+        )
+
+        self.call(task_cmd.GetPublished, app_args=['id'])
+
+        # The published variables are formatted.
+        self.app.stdout.write.assert_called_once_with(
+            jsonutils.dumps(TASK_PUBLISHED, indent=4) + "\n"
+        )
+
     def test_rerun(self):
         self.client.tasks.rerun.return_value = TASK
 
@@ -13,9 +13,15 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from concurrent import futures
+import time
+from unittest import mock
+
 from oslo_serialization import jsonutils
 
 from mistralclient.api import base as api_base
+from mistralclient.api import retry
+from mistralclient.api import single_flight
 from mistralclient.api.v2 import executions
 from mistralclient.tests.unit.v2 import base
 
@@ -152,6 +158,62 @@ class TestExecutionsV2(base.BaseClientV2Test):
                                 status_code=201)
         self.assertRaises(api_base.APIException, self.executions.create, '')
 
+    @mock.patch('time.sleep')
+    def test_get_with_retries(self, sleep_mock):
+        url = self.TEST_URL + URL_TEMPLATE_ID % EXEC['id']
+        self.requests_mock.get(
+            url,
+            [{'status_code': 503}, {'status_code': 200, 'json': EXEC}]
+        )
+
+        self.executions.http_client.retry_policy = retry.RetryPolicy(
+            jitter=False
+        )
+
+        ex = self.executions.get(EXEC['id'])
+
+        self.assertEqual(EXEC['id'], ex.id)
+        self.assertEqual(
+            {'ExecutionManager.get': {'retries': 1, 'wait_time': 0.5}},
+            self._client.get_retry_stats()
+        )
+
+    def test_get_coalesced(self):
+        url = self.TEST_URL + URL_TEMPLATE_ID % EXEC['id']
+        flight = single_flight.SingleFlight()
+
+        self.executions.http_client.single_flight = flight
+
+        def _respond(request, context):
+            # Holds the response until the other calls wait for it.
+            deadline = time.monotonic() + 5
+
+            while (flight.get_stats()['coalesced'] < 4 and
+                   time.monotonic() < deadline):
+                time.sleep(0.001)
+
+            return EXEC
+
+        m = self.requests_mock.get(url, json=_respond)
+
+        with futures.ThreadPoolExecutor(5) as executor:
+            execs = list(executor.map(
+                lambda _: self.executions.get(EXEC['id']),
+                range(5)
+            ))
+
+        self.assertEqual(1, m.call_count)
+        self.assertEqual(
+            {'calls': 1, 'coalesced': 4},
+            self._client.get_coalescing_stats()
+        )
+
+        for ex in execs:
+            self.assertEqual(EXEC, ex.to_dict())
+
+        # Each caller gets its own copy.
+        self.assertEqual(5, len(set(id(ex._data) for ex in execs)))
+
     def test_update(self):
         url = self.TEST_URL + URL_TEMPLATE_ID % EXEC['id']
         self.requests_mock.put(url, json=EXEC)
@@ -195,6 +257,33 @@ class TestExecutionsV2(base.BaseClientV2Test):
 
         self.assertDictEqual(body, self.requests_mock.last_request.json())
 
+    def test_list_stream(self):
+        self.requests_mock.get(self.TEST_URL + URL_TEMPLATE,
+                               json={'executions': [EXEC, SUB_WF_EXEC],
+                                     'next': None})
+
+        execution_list = self.executions.list(stream=True)
+
+        self.assertNotIsInstance(execution_list, list)
+        self.assertEqual(
+            [EXEC, SUB_WF_EXEC],
+            [ex.to_dict() for ex in execution_list]
+        )
+        self.assertNotIn('stream', self.requests_mock.last_request.qs)
+
+    def test_list_stream_error(self):
+        self.requests_mock.get(self.TEST_URL + URL_TEMPLATE,
+                               status_code=500,
+                               json={'faultstring': 'Error'})
+
+        e = self.assertRaises(
+            api_base.APIException,
+            self.executions.list,
+            stream=True
+        )
+
+        self.assertEqual(500, e.error_code)
+
     def test_list(self):
         self.requests_mock.get(self.TEST_URL + URL_TEMPLATE,
                                json={'executions': [EXEC, SUB_WF_EXEC]})
@@ -307,6 +396,18 @@ class TestExecutionsV2(base.BaseClientV2Test):
 
         self.assertDictEqual(expected_json, report)
 
+    def test_report_error(self):
+        url = self.TEST_URL + URL_TEMPLATE_ID % EXEC['id'] + '/report'
+
+        self.requests_mock.get(url, status_code=404,
+                               json={'faultstring': 'Not found'})
+
+        # The body of the response is returned as is.
+        self.assertEqual(
+            {'faultstring': 'Not found'},
+            self.executions.get_report(EXEC['id'])
+        )
+
     def test_get_sub_executions(self):
         url = self.TEST_URL + URL_TEMPLATE_SUB_EXECUTIONS \
               % (EXEC['id'], '?max_depth=-1&errors_only=')
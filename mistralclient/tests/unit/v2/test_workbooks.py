@@ -171,6 +171,49 @@ class TestWorkbooksV2(base.BaseClientV2Test):
             wb.to_dict()
         )
 
+    def test_get_not_modified_since(self):
+        self.requests_mock.get(
+            self.TEST_URL + URL_TEMPLATE_NAME % 'wb',
+            [
+                {
+                    'json': WORKBOOK,
+                    'headers': {
+                        'Last-Modified': 'Thu, 01 Dec 2016 15:00:00 GMT'
+                    }
+                },
+                {'status_code': 304}
+            ]
+        )
+
+        self.workbooks.get('wb')
+        wb = self.workbooks.get('wb')
+
+        self.assertEqual(
+            'Thu, 01 Dec 2016 15:00:00 GMT',
+            self.requests_mock.last_request.headers['If-Modified-Since']
+        )
+        self.assertEqual(WB_DEF, wb.definition)
+
+    def test_get_without_validators(self):
+        # updated_at isn't used as a validator, it has a one second
+        # precision.
+        self.requests_mock.get(
+            self.TEST_URL + URL_TEMPLATE_NAME % 'wb',
+            json=dict(WORKBOOK, updated_at='2016-12-01 15:00:00')
+        )
+
+        self.workbooks.get('wb')
+
+        # Nothing is kept.
+        self.assertEqual(0, len(self.workbooks._validated))
+
+        self.workbooks.get('wb')
+
+        headers = self.requests_mock.last_request.headers
+
+        self.assertNotIn('If-None-Match', headers)
+        self.assertNotIn('If-Modified-Since', headers)
+
     def test_delete(self):
         url = self.TEST_URL + URL_TEMPLATE_NAME % 'wb'
         self.requests_mock.delete(url, status_code=204)
@@ -209,6 +209,63 @@ class TestWorkflowsV2(base.BaseClientV2Test):
             wf.to_dict()
         )
 
+    def test_get_not_modified(self):
+        url = self.TEST_URL + URL_TEMPLATE_NAME % 'wf'
+
+        self.requests_mock.get(
+            url,
+            [
+                {'json': WORKFLOW, 'headers': {'ETag': '"v1"'}},
+                {'status_code': 304}
+            ]
+        )
+
+        wf = self.workflows.get('wf')
+
+        self.assertNotIn(
+            'If-None-Match',
+            self.requests_mock.last_request.headers
+        )
+
+        wf.definition = 'changed by the caller'
+
+        wf = self.workflows.get('wf')
+
+        self.assertEqual(
+            '"v1"',
+            self.requests_mock.last_request.headers['If-None-Match']
+        )
+        self.assertEqual(
+            workflows.Workflow(self.workflows, WORKFLOW).to_dict(),
+            wf.to_dict()
+        )
+
+    def test_get_modified(self):
+        url = self.TEST_URL + URL_TEMPLATE_NAME % 'wf'
+        new_workflow = dict(WORKFLOW, definition='new definition')
+
+        self.requests_mock.get(
+            url,
+            [
+                {'json': WORKFLOW, 'headers': {'ETag': '"v1"'}},
+                {'json': new_workflow, 'headers': {'ETag': '"v2"'}},
+                {'status_code': 304}
+            ]
+        )
+
+        self.workflows.get('wf')
+        wf = self.workflows.get('wf')
+
+        self.assertEqual('new definition', wf.definition)
+
+        wf = self.workflows.get('wf')
+
+        self.assertEqual(
+            '"v2"',
+            self.requests_mock.last_request.headers['If-None-Match']
+        )
+        self.assertEqual('new definition', wf.definition)
+
     def test_delete(self):
         self.requests_mock.delete(
             self.TEST_URL + URL_TEMPLATE_NAME % 'wf',
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Compares concurrent API calls over HTTP/1.1 and HTTP/2.
+
+Many threads share one client and get executions from local stand-in
+servers answering after a fixed delay: an HTTP/1.1 server used with the
+default transport and an HTTP/2 (h2c) server used with the httpx one.
+Both transports are limited to the same number of connections, HTTP/1.1
+sends one request at a time per connection while HTTP/2 multiplexes them.
+
+Requires the "h2" package.
+
+Usage: python tools/benchmarks/http2_transport.py [--threads N ...]
+"""
+
+import argparse
+import asyncio
+from concurrent import futures
+from http import server
+import threading
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+
+from mistralclient.api import transports
+from mistralclient.api.v2 import client
+
+BODY = b'{"id": "123", "workflow_name": "wf", "state": "SUCCESS"}'
+
+
+class _HTTP1Handler(server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class _H2Protocol(asyncio.Protocol):
+    """Minimal HTTP/2 server answering every request with BODY."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.conn.initiate_connection()
+        self.transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                asyncio.ensure_future(self._respond(event.stream_id))
+
+        self.transport.write(self.conn.data_to_send())
+
+    async def _respond(self, stream_id):
+        await asyncio.sleep(self.delay)
+
+        self.conn.send_headers(
+            stream_id,
+            [
+                (':status', '200'),
+                ('content-type', 'application/json'),
+                ('content-length', str(len(BODY)))
+            ]
+        )
+        self.conn.send_data(stream_id, BODY, end_stream=True)
+
+        self.transport.write(self.conn.data_to_send())
+
+
+def _start_http1_server(delay):
+    handler = type('Handler', (_HTTP1Handler,), {'delay': delay})
+
+    srv = server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    srv.daemon_threads = True
+
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+    return srv.server_address[1]
+
+
+def _start_h2_server(delay):
+    loop = asyncio.new_event_loop()
+
+    srv = loop.run_until_complete(
+        loop.create_server(lambda: _H2Protocol(delay), '127.0.0.1', 0)
+    )
+
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    return srv.sockets[0].getsockname()[1]
+
+
+def _run(mistral, threads, calls):
+    start = time.perf_counter()
+
+    with futures.ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda _: mistral.executions.get('123'),
+                          range(calls)))
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=[1, 8, 32, 64])
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--delay', type=float, default=0.01,
+                        help='Server response time in seconds.')
+
+    args = parser.parse_args()
+
+    http1_port = _start_http1_server(args.delay)
+    h2_port = _start_h2_server(args.delay)
+
+    http1 = client.Client(
+        mistral_url='http://127.0.0.1:%s/v2' % http1_port,
+        pool_maxsize=args.connections,
+        pool_block=True
+    )
+    http2 = client.Client(
+        mistral_url='http://127.0.0.1:%s/v2' % h2_port,
+        # Plain HTTP, HTTP/2 is used without negotiation.
+        transport=transports.HTTPXTransport(
+            http1=False,
+            max_connections=args.connections
+        )
+    )
+
+    for threads in args.threads:
+        for name, mistral in (('HTTP/1.1', http1), ('HTTP/2', http2)):
+            elapsed = _run(mistral, threads, args.calls)
+
+            print('%-8s %3d threads: %5d calls in %.2f s (%7.1f calls/s)' %
+                  (name, threads, args.calls, elapsed,
+                   args.calls / elapsed))
+
+
+if __name__ == '__main__':
+    main()
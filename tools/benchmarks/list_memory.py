@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Compares peak memory of regular and streamed execution listing.
+
+Each execution is processed and dropped right away, as a caller
+exporting or filtering executions would do.
+
+Usage: python tools/benchmarks/list_memory.py [--executions N ...]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from oslo_serialization import jsonutils
+from requests_mock.contrib import fixture
+
+from mistralclient.api.v2 import client
+
+MISTRAL_URL = 'http://localhost:8989/v2'
+
+
+def _make_page(count):
+    return jsonutils.dump_as_bytes({
+        'executions': [
+            {
+                'id': '%036d' % i,
+                'workflow_name': 'wf_%s' % i,
+                'state': 'SUCCESS',
+                'input': jsonutils.dumps({'data': 'x' * 512}),
+                'params': '{"env": {}}',
+                'created_at': '2026-01-01 00:00:00',
+            }
+            for i in range(count)
+        ]
+    })
+
+
+def _measure(mistral, stream):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    count = 0
+
+    for _ in mistral.executions.list(stream=stream):
+        count += 1
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--executions',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 50000]
+    )
+
+    args = parser.parse_args()
+
+    requests_mock = fixture.Fixture()
+    requests_mock.setUp()
+
+    mistral = client.Client(mistral_url=MISTRAL_URL)
+
+    for count in args.executions:
+        page = _make_page(count)
+
+        requests_mock.get(MISTRAL_URL + '/executions', content=page)
+
+        for stream in (False, True):
+            n, elapsed, peak = _measure(mistral, stream)
+
+            print('%-8s %6d executions (%5.1f MB): peak %7.1f MB, %.2f s' %
+                  ('stream' if stream else 'list', n, len(page) / 2 ** 20,
+                   peak / 2 ** 20, elapsed))
+
+    requests_mock.cleanUp()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Micro-benchmarks of the client's hot paths.
+
+Every benchmark is timed with timeit, the number of calls per round is
+picked so that a round takes at least 0.2 s and the best round is
+reported. Results can be saved as JSON and compared with the results of
+another run, benchmarks slower than the baseline by more than the
+threshold are flagged as regressions and make the script exit with 1.
+
+Usage:
+
+    python tools/benchmarks/micro.py --save before.json
+    # Change the code.
+    python tools/benchmarks/micro.py --compare before.json
+
+    # Compares two saved runs.
+    python tools/benchmarks/micro.py --compare before.json --load after.json
+
+    # Runs the benchmarks whose names contain "formatter", in any case.
+    python tools/benchmarks/micro.py --filter formatter
+"""
+
+import argparse
+import datetime
+import importlib
+import inspect
+import os
+import pkgutil
+import platform
+import statistics
+import sys
+import timeit
+
+from oslo_serialization import jsonutils
+
+from mistralclient.api import base as api_base
+from mistralclient.api import httpclient
+from mistralclient.api.v2 import client
+from mistralclient.api.v2 import executions
+from mistralclient.commands import v2 as commands_v2
+from mistralclient.commands.v2 import base as commands_base
+from mistralclient.commands.v2 import executions as executions_cmd
+from mistralclient.tests import fake_api
+
+VERSION = 1
+
+# Size of the pages of the listing benchmarks.
+PAGE_SIZE = 1000
+
+# Depth of the execution tree of the report benchmark.
+REPORT_DEPTH = 8
+
+_BENCHMARKS = []
+
+
+def benchmark(name):
+    """Registers a benchmark.
+
+    The decorated function prepares the benchmark and returns the
+    function to time.
+    """
+    def decorator(setup):
+        _BENCHMARKS.append((name, setup))
+
+        return setup
+
+    return decorator
+
+
+def _get_execution():
+    api = fake_api.FakeMistralAPI()
+    api.seed('executions', 1)
+
+    return api.collections['executions'].get(0)
+
+
+@benchmark('resource_init')
+def _resource_init():
+    data = _get_execution()
+
+    # Resources set their defaults in the data they are given.
+    return lambda: executions.Execution(None, dict(data))
+
+
+@benchmark('resource_to_dict')
+def _resource_to_dict():
+    execution = executions.Execution(None, _get_execution())
+
+    return execution.to_dict
+
+
+@benchmark('build_query_params')
+def _build_query_params():
+    return lambda: api_base.ResourceManager._build_query_params(
+        marker=fake_api.make_id(0),
+        limit=100,
+        sort_keys='created_at,id',
+        sort_dirs='desc,asc',
+        fields=['id', 'workflow_name', 'state', 'created_at'],
+        filters={'state': 'in:ERROR,PAUSED', 'workflow_name': 'wf_1'}
+    )
+
+
+@benchmark('extract_json_page')
+def _extract_json_page():
+    api = fake_api.FakeMistralAPI()
+    api.seed('executions', PAGE_SIZE)
+
+    resp = fake_api.WSGITransport(api).get(
+        '%s/executions?limit=%d' % (fake_api.BASE_URL, PAGE_SIZE)
+    )
+
+    return lambda: api_base.extract_json(resp, 'executions')
+
+
+@benchmark('get_request_options')
+def _get_request_options():
+    # osprofiler adds a constant cost, it isn't installed everywhere.
+    httpclient.osprofiler_web = None
+
+    client = httpclient.HTTPClient(
+        'https://localhost:8989/v2',
+        auth_token='token',
+        project_id='project',
+        user_id='user',
+        region_name='region',
+        cert='/etc/ssl/client.pem',
+        key='/etc/ssl/client.key',
+        target_auth_url='http://keystone:5000/v3',
+        target_auth_token='target_token',
+        target_project_id='target_project',
+        target_user_id='target_user',
+        target_region_name='target_region'
+    )
+
+    return lambda: client._get_request_options(
+        'post',
+        {'content-type': 'text/plain'}
+    )
+
+
+@benchmark('get_duration_str')
+def _get_duration_str():
+    return lambda: commands_base.get_duration_str(
+        '2026-01-01 00:00:00',
+        '2026-01-02 03:04:05'
+    )
+
+
+@benchmark('get_duration_str_running')
+def _get_duration_str_running():
+    return lambda: commands_base.get_duration_str('2026-01-01 00:00:00', '')
+
+
+def _get_sample_value(field):
+    if field.endswith('_at'):
+        return '2026-01-01 00:00:00'
+
+    if field == 'tags':
+        return ['tag1', 'tag2', 'tag3']
+
+    if field == 'variables':
+        # JSON string, as returned by the API.
+        return jsonutils.dumps({'key_%d' % i: 'value_%d' % i
+                                for i in range(10)})
+
+    if field in ('accepted', 'processed'):
+        return True
+
+    if field == 'state':
+        return 'SUCCESS'
+
+    # Long enough for the list formatting to cut it.
+    return '%s ' % field * 20
+
+
+def _get_formatters():
+    """Yields the formatters with the resource class of their manager."""
+    for module_info in pkgutil.iter_modules(commands_v2.__path__):
+        module = importlib.import_module(
+            '%s.%s' % (commands_v2.__name__, module_info.name)
+        )
+
+        for name, cls in sorted(inspect.getmembers(module, inspect.isclass)):
+            if (cls.__module__ == module.__name__ and
+                    cls is not commands_base.MistralFormatter and
+                    issubclass(cls, commands_base.MistralFormatter)):
+                # The commands are in modules named after the managers.
+                manager = client.Client.MANAGERS[module_info.name]
+
+                yield name, cls, manager.resource_class
+
+
+def _register_formatter(name, formatter, resource_class, lister):
+    fields = [c[0] for c in formatter.COLUMNS]
+    fields += ['created_at', 'updated_at', 'started_at', 'finished_at']
+
+    resource = resource_class(
+        None,
+        {f: _get_sample_value(f) for f in fields}
+    )
+
+    @benchmark('%s_%s' % (name, 'list' if lister else 'show'))
+    def _format():
+        return lambda: formatter.format(resource, lister)
+
+
+for _name, _formatter, _resource_class in _get_formatters():
+    _register_formatter(_name, _formatter, _resource_class, False)
+    _register_formatter(_name, _formatter, _resource_class, True)
+
+
+def _make_workflow_execution(depth, index=0):
+    tasks = []
+
+    for i in range(3):
+        state = 'ERROR' if i == 2 else 'SUCCESS'
+
+        task = {
+            'id': fake_api.make_id(depth * 10 + i),
+            'name': 'task_%d' % i,
+            'state': state,
+            'state_info': 'Failure caused by error in tasks\n' * 5,
+            'retry_count': i,
+            'action_executions': [
+                {
+                    'id': fake_api.make_id(depth * 100 + i * 10 + j),
+                    'name': 'std.echo',
+                    'state': state,
+                    'state_info': 'Action failed' * 10
+                }
+                for j in range(2)
+            ]
+        }
+
+        if i == 2 and depth > 0:
+            task['workflow_executions'] = [
+                _make_workflow_execution(depth - 1, i)
+            ]
+
+        tasks.append(task)
+
+    return {
+        'id': fake_api.make_id(depth * 1000 + index),
+        'name': 'wf_%d' % depth,
+        'state': 'ERROR',
+        'task_executions': tasks
+    }
+
+
+class _App(object):
+    def __init__(self, stdout):
+        self.stdout = stdout
+
+
+@benchmark('print_report_deep')
+def _print_report_deep():
+    report = {
+        'statistics': {
+            'success_tasks_count': 2 * (REPORT_DEPTH + 1),
+            'error_tasks_count': REPORT_DEPTH + 1,
+            'running_tasks_count': 0,
+            'idle_tasks_count': 0,
+            'paused_tasks_count': 0
+        },
+        'root_workflow_execution': _make_workflow_execution(REPORT_DEPTH)
+    }
+
+    stdout = open(os.devnull, 'w')
+    cmd = executions_cmd.GetReport(_App(stdout), None)
+
+    return lambda: cmd.print_report(report)
+
+
+def run(pattern=None, repeat=5):
+    results = {}
+
+    for name, setup in _BENCHMARKS:
+        if pattern and pattern.lower() not in name.lower():
+            continue
+
+        timer = timeit.Timer(setup())
+        number, _ = timer.autorange()
+
+        # Per call times of the rounds.
+        times = [t / number for t in timer.repeat(repeat, number)]
+
+        results[name] = {
+            'best': min(times),
+            'median': statistics.median(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'number': number,
+            'repeat': repeat
+        }
+
+        print('%-45s %12.3f us' % (name, results[name]['best'] * 1e6))
+
+    return {
+        'version': VERSION,
+        'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'benchmarks': results
+    }
+
+
+def compare(baseline, current, threshold):
+    """Prints the changes of the best times.
+
+    :return: Names of the benchmarks slower than the baseline by more
+        than threshold, e.g. 0.1 for 10%.
+    """
+    regressions = []
+
+    print('\n%-45s %12s %12s %8s' %
+          ('benchmark', 'baseline us', 'current us', 'change'))
+
+    for name, result in sorted(current['benchmarks'].items()):
+        base_result = baseline['benchmarks'].get(name)
+
+        if base_result is None:
+            print('%-45s %12s %12.3f' % (name, '-', result['best'] * 1e6))
+
+            continue
+
+        change = result['best'] / base_result['best'] - 1
+        flag = ''
+
+        if change > threshold:
+            regressions.append(name)
+            flag = ' REGRESSION'
+
+        print('%-45s %12.3f %12.3f %+7.1f%%%s' %
+              (name, base_result['best'] * 1e6, result['best'] * 1e6,
+               change * 100, flag))
+
+    return regressions
+
+
+def _load(path):
+    with open(path, 'rb') as f:
+        results = jsonutils.load(f)
+
+    if results.get('version') != VERSION:
+        raise ValueError('Unsupported results version in %s: %s' %
+                         (path, results.get('version')))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('\n\n', 1)[1]
+    )
+    parser.add_argument('--filter', help='Runs the benchmarks whose name '
+                                         'contains this string, ignoring '
+                                         'the case.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of rounds of every benchmark.')
+    parser.add_argument('--save', metavar='FILE',
+                        help='Saves the results as JSON.')
+    parser.add_argument('--load', metavar='FILE',
+                        help='Compares saved results instead of running '
+                             'the benchmarks.')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='Compares the results with saved results.')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Slowdown flagged as a regression, 0.1 by '
+                             'default for 10%%.')
+
+    args = parser.parse_args()
+
+    if args.load:
+        results = _load(args.load)
+    else:
+        results = run(args.filter, args.repeat)
+
+        if not results['benchmarks']:
+            print('No benchmark matches %s.' % args.filter, file=sys.stderr)
+
+            return 1
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            jsonutils.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        regressions = compare(_load(args.compare), results, args.threshold)
+
+        if regressions:
+            print('\n%d regression(s): %s' %
+                  (len(regressions), ', '.join(regressions)))
+
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
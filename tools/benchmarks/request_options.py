@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Measures the per-request overhead of HTTPClient._get_request_options.
+
+The "before" numbers come from a copy of the implementation that deep
+copied the SSL options and rebuilt every header on each request.
+
+Usage: python tools/benchmarks/request_options.py [--calls N]
+"""
+
+import argparse
+import base64
+import copy
+import timeit
+
+import requests
+
+from mistralclient.api import httpclient
+
+
+def _legacy_get_request_options(client, method, headers):
+    headers = headers or {}
+
+    if isinstance(client.session, requests.Session):
+        if client.auth_token:
+            headers['X-Auth-Token'] = client.auth_token
+
+        if client.project_id:
+            headers['X-Project-Id'] = client.project_id
+
+        if client.user_id:
+            headers['X-User-Id'] = client.user_id
+
+    if client.region_name:
+        headers['X-Region-Name'] = client.region_name
+
+    if client.target_auth_token:
+        headers['X-Target-Auth-Token'] = client.target_auth_token
+
+    if client.target_auth_uri:
+        headers['X-Target-Auth-Uri'] = client.target_auth_uri
+
+    if client.target_project_id:
+        headers['X-Target-Project-Id'] = client.target_project_id
+
+    if client.target_user_id:
+        headers['X-Target-User-Id'] = client.target_user_id
+
+    if client.target_insecure:
+        headers['X-Target-Insecure'] = str(client.target_insecure)
+
+    if client.target_region_name:
+        headers['X-Target-Region-Name'] = client.target_region_name
+
+    if client.target_user_domain_name:
+        headers['X-Target-User-Domain-Name'] = client.target_user_domain_name
+
+    if client.target_project_domain_name:
+        headers['X-Target-Project-Domain-Name'] = (
+            client.target_project_domain_name
+        )
+
+    if client.target_service_catalog:
+        headers['X-Target-Service-Catalog'] = base64.b64encode(
+            client.target_service_catalog.encode('utf-8')
+        )
+
+    if method in ['post', 'put']:
+        headers['content-type'] = headers.get(
+            'content-type',
+            'application/json'
+        )
+
+    options = copy.deepcopy(client.ssl_options)
+    options['headers'] = headers
+
+    return options
+
+
+def _make_client():
+    return httpclient.HTTPClient(
+        'https://localhost:8989/v2',
+        auth_token='token',
+        project_id='project',
+        user_id='user',
+        region_name='region',
+        cert='/etc/ssl/client.pem',
+        key='/etc/ssl/client.key',
+        target_auth_url='http://keystone:5000/v3',
+        target_auth_token='target_token',
+        target_project_id='target_project',
+        target_user_id='target_user',
+        target_region_name='target_region',
+        target_service_catalog='{"catalog": [%s]}' % ', '.join(
+            ['{"type": "compute", "endpoints": []}'] * 50
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+
+    args = parser.parse_args()
+
+    # osprofiler adds the same per-request cost to both variants.
+    httpclient.osprofiler_web = None
+
+    client = _make_client()
+
+    def before():
+        _legacy_get_request_options(
+            client,
+            'post',
+            {'content-type': 'text/plain'}
+        )
+
+    def after():
+        client._get_request_options('post', {'content-type': 'text/plain'})
+
+    for name, func in (('before', before), ('after', after)):
+        best = min(timeit.repeat(func, number=args.calls, repeat=args.repeat))
+
+        print('%-6s %d calls: %.4f s total, %.2f us/call' %
+              (name, args.calls, best, best / args.calls * 1e6))
+
+
+if __name__ == '__main__':
+    main()
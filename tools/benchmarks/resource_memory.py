@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Compares the memory and time costs of resources.
+
+The "before" numbers come from a copy of the implementation that copied
+every field to the instance and deep copied the fields in to_dict().
+The memory reported is the memory of the resources alone, the decoded
+JSON they are created from is allocated beforehand.
+
+Usage: python tools/benchmarks/resource_memory.py [--resources N]
+"""
+
+import argparse
+import copy
+import gc
+import time
+import tracemalloc
+
+from mistralclient.api import base
+from mistralclient.tests import fake_api
+
+
+class _LegacyResource(object):
+    resource_name = 'Execution'
+    defaults = {}
+
+    def __init__(self, manager, data):
+        self.manager = manager
+        self._data = data
+        self._set_defaults()
+        self._set_attributes()
+
+    def _set_defaults(self):
+        for k, v in self.defaults.items():
+            if k not in self._data:
+                self._data[k] = v
+
+    def _set_attributes(self):
+        for k, v in self._data.items():
+            try:
+                setattr(self, k, v)
+            except AttributeError:
+                pass
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+
+class _Resource(base.Resource):
+    resource_name = 'Execution'
+
+
+def _measure(resource_class, data):
+    gc.collect()
+    tracemalloc.start()
+
+    resources = [resource_class(None, d) for d in data]
+
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del resources
+    gc.collect()
+
+    # Timed without tracemalloc, which slows allocations down.
+    start = time.perf_counter()
+    resources = [resource_class(None, d) for d in data]
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for r in resources:
+        r.id, r.workflow_name, r.state, r.created_at, r.updated_at
+
+    access_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for r in resources:
+        r.to_dict()
+
+    to_dict_time = time.perf_counter() - start
+
+    return memory, build_time, access_time, to_dict_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resources', type=int, default=100000)
+
+    args = parser.parse_args()
+
+    api = fake_api.FakeMistralAPI()
+    api.seed('executions', args.resources)
+
+    executions = api.collections['executions']
+    data = [executions.get(i) for i in range(args.resources)]
+
+    print('%d executions of %d fields' % (args.resources, len(data[0])))
+
+    for name, cls in (('before', _LegacyResource), ('after', _Resource)):
+        memory, build_time, access_time, to_dict_time = _measure(cls, data)
+
+        print('%-6s %7.1f MB, build %.3f s, 5 fields read %.3f s, '
+              'to_dict %.3f s' %
+              (name, memory / 2 ** 20, build_time, access_time,
+               to_dict_time))
+
+
+if __name__ == '__main__':
+    main()
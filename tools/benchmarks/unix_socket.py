@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Compares the latency of API calls over TCP loopback and a Unix socket.
+
+The same stand-in server answers on 127.0.0.1 and on a Unix socket in a
+temporary directory. It runs in a separate process so that it doesn't
+compete with the client for the GIL. A client gets an execution from
+each of them in turn, either reusing pooled connections or, with
+--new-connections, opening a connection per call.
+
+Usage: python tools/benchmarks/unix_socket.py [--calls N]
+"""
+
+import argparse
+from http import server
+import multiprocessing
+import os
+import socketserver
+import statistics
+import tempfile
+import threading
+import time
+
+from mistralclient.api import unix_socket
+from mistralclient.api.v2 import client
+
+BODY = b'{"id": "123", "workflow_name": "wf", "state": "SUCCESS"}'
+
+
+class _Handler(server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class _UnixHandler(_Handler):
+    # Socket options of TCP don't apply.
+    disable_nagle_algorithm = False
+
+
+def _serve(srv):
+    srv.daemon_threads = True
+
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+
+def _run_servers(socket_path, conn):
+    tcp_srv = server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    _serve(tcp_srv)
+    _serve(socketserver.ThreadingUnixStreamServer(socket_path, _UnixHandler))
+
+    conn.send(tcp_srv.server_port)
+
+    # Serves until the benchmark is done.
+    conn.recv()
+
+
+def _measure(mistral, calls, new_connections):
+    # Warms up the connection pool.
+    mistral.executions.get('123')
+
+    latencies = []
+
+    for _ in range(calls):
+        start = time.perf_counter()
+
+        mistral.executions.get('123')
+
+        latencies.append(time.perf_counter() - start)
+
+        if new_connections:
+            mistral.http_client.pool_adapter.poolmanager.clear()
+
+    latencies.sort()
+
+    return {
+        'mean': statistics.mean(latencies),
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[int(len(latencies) * 0.99) - 1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--new-connections', action='store_true',
+                        help='Open a new connection for every call.')
+
+    args = parser.parse_args()
+
+    socket_path = os.path.join(tempfile.mkdtemp(), 'api.sock')
+    conn, child_conn = multiprocessing.Pipe()
+
+    servers = multiprocessing.Process(
+        target=_run_servers,
+        args=(socket_path, child_conn),
+        daemon=True
+    )
+    servers.start()
+
+    tcp_port = conn.recv()
+
+    clients = (
+        ('TCP', client.Client(
+            mistral_url='http://127.0.0.1:%s/v2' % tcp_port,
+            auth_token='token'
+        )),
+        ('UDS', client.Client(
+            mistral_url=unix_socket.get_url(socket_path),
+            auth_token='token'
+        ))
+    )
+
+    for name, mistral in clients:
+        stats = _measure(mistral, args.calls, args.new_connections)
+
+        print('%s: %d calls, mean %.1f us, p50 %.1f us, p99 %.1f us' %
+              (name, args.calls, stats['mean'] * 1e6, stats['p50'] * 1e6,
+               stats['p99'] * 1e6))
+
+    conn.send('stop')
+    servers.join()
+
+    os.remove(socket_path)
+    os.rmdir(os.path.dirname(socket_path))
+
+
+if __name__ == '__main__':
+    main()